@@ -0,0 +1,50 @@
+"""
+Benchmark: goodput of a parallel long-series fetch against a throttling stub server,
+with a fixed worker pool versus an AdaptiveConcurrency controller.
+
+The stub serves 8 requests at once and answers 429 + Retry-After beyond that.
+
+Run with:  python benchmarks/bench_adaptive.py [workers] [chunks]
+"""
+import sys
+import time
+
+from pygcapi.concurrency import AdaptiveConcurrency
+from pygcapi.core_v2 import GCapiClientV2
+from pygcapi.long_series import fetch_long_series
+from pygcapi.testing import ThrottlingStubServer
+from pygcapi.transport import Transport
+
+START = 1_700_000_000
+
+
+def run(label, workers, n_chunks, concurrency=None):
+    with ThrottlingStubServer(latency=0.01, capacity=8, retry_after=0.05) as server:
+        GCapiClientV2.BASE_URL_V1 = server.base_url_v1
+        GCapiClientV2.BASE_URL_V2 = server.base_url_v2
+        client = GCapiClientV2("user", "pass", "key", transport=Transport(pool_maxsize=workers), concurrency=concurrency)
+        intervals = [(START + i * 3600, START + (i + 1) * 3600 - 1) for i in range(n_chunks)]
+
+        started = time.perf_counter()
+        result = fetch_long_series(client, "401484347", interval="MINUTE", span=1, n=60,
+                                   time_intervals=intervals, workers=workers)
+        elapsed = time.perf_counter() - started
+
+    ok = n_chunks - len(result.failures)
+    extra = ""
+    if concurrency is not None:
+        stats = concurrency.stats()
+        extra = f" final_limit={stats['limit']} decreases={stats['decreases']}"
+    print(f"{label:<18} workers={workers:<4} ok={ok:<5} failed={len(result.failures):<5} "
+          f"throttled={server.throttled:<5} goodput={ok / elapsed:8.1f} chunks/s{extra}")
+
+
+def main():
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    n_chunks = int(sys.argv[2]) if len(sys.argv) > 2 else 400
+    run("fixed pool", workers, n_chunks)
+    run("adaptive (AIMD)", workers, n_chunks, AdaptiveConcurrency(initial_limit=4, max_limit=workers))
+
+
+if __name__ == "__main__":
+    main()
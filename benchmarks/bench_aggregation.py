@@ -0,0 +1,70 @@
+"""
+Benchmark: tick-to-bar aggregation throughput with BarAggregator, from tick arrays
+(output="records") and tick DataFrames (output="frame"), against pandas resample().ohlc(),
+plus the cost of an incremental update with a handful of new ticks.
+
+Run with:  python benchmarks/bench_aggregation.py [n_ticks] [repeat]
+"""
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from pygcapi.aggregation import BarAggregator, aggregate_ticks
+from pygcapi.records import array_from_dataframe
+
+START_MS = 1_700_000_000_000
+
+
+def best_of(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def make_ticks(n):
+    rng = np.random.default_rng(0)
+    millis = START_MS + np.cumsum(rng.integers(0, 200, n))
+    prices = 1.1 + np.cumsum(rng.normal(0, 1e-5, n))
+    dates = pd.DatetimeIndex(millis.astype("datetime64[ms]")).tz_localize("UTC")
+    return pd.DataFrame({"Date": dates, "Price": prices})
+
+
+def pandas_ohlc(df):
+    return df.set_index("Date")["Price"].resample("1min").ohlc().dropna().reset_index()
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000_000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    df = make_ticks(n)
+    array = array_from_dataframe(df)
+
+    print(f"{'case':<34} {'time':>10} {'ticks/s':>12}")
+    cases = [
+        ("1 minute bars, records", lambda: aggregate_ticks(array, "MINUTE", 1)),
+        ("1 minute bars, frame", lambda: aggregate_ticks(df, "MINUTE", 1)),
+        ("4 hour session bars, records", lambda: aggregate_ticks(array, "HOUR", 4, session_open="22:00")),
+        ("1000 tick bars, records", lambda: aggregate_ticks(array, ticks_per_bar=1000)),
+        ("pandas resample().ohlc()", lambda: pandas_ohlc(df)),
+    ]
+    for label, func in cases:
+        elapsed = best_of(func, repeat)
+        print(f"{label:<34} {elapsed * 1e3:8.1f}ms {n / elapsed / 1e6:9.1f}M/s")
+
+    aggregator = BarAggregator("MINUTE", 1)
+    aggregator.update(array[:-1000])
+    batches = np.array_split(array[-1000:], 100)
+    started = time.perf_counter()
+    for batch in batches:
+        aggregator.update(batch)
+    per_update = (time.perf_counter() - started) / len(batches)
+    print(f"{'incremental update of 10 ticks':<34} {per_update * 1e6:8.1f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Benchmark: cold vs. repeat loads of six months of minute bars through BarStore.
+
+Run with:  python benchmarks/bench_bar_store.py
+"""
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from pygcapi.bar_store import BarStore
+from pygcapi.testing import synthetic_bars
+from pygcapi.utils import convert_to_dataframe
+
+MINUTES = 60 * 24 * 182
+END = 1_700_000_000 // 60 * 60
+START = END - MINUTES * 60
+
+
+def main():
+    calls = []
+
+    def loader(market_id, num_ticks, interval, span, from_ts, to_ts):
+        calls.append((from_ts, to_ts))
+        bars = synthetic_bars(from_ts, to_ts, interval, span, num_ticks)
+        return convert_to_dataframe(bars) if bars else pd.DataFrame()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = BarStore(os.path.join(tmp, "bars.sqlite"), max_bytes=None)
+
+        started = time.perf_counter()
+        df = store.get_bars("401484347", "MINUTE", 1, START, END, 4000, loader)
+        cold = time.perf_counter() - started
+        print(f"cold load:   rows={len(df):<8} api_calls={len(calls):<4} {cold * 1000:9.1f}ms")
+
+        calls.clear()
+        for _ in range(5):
+            started = time.perf_counter()
+            df = store.get_bars("401484347", "MINUTE", 1, START, END, 4000, loader)
+            warm = time.perf_counter() - started
+        print(f"repeat load: rows={len(df):<8} api_calls={len(calls):<4} {warm * 1000:9.1f}ms")
+        print(f"on disk: {store.size() / 1e6:.1f} MB")
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
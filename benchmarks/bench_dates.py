@@ -0,0 +1,34 @@
+"""
+Benchmark: per-row regex vs. vectorized parsing of '/Date(...)/' timestamps.
+
+Run with:  python benchmarks/bench_dates.py [n_rows]
+"""
+import re
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from pygcapi.utils import parse_dotnet_dates
+
+
+def regex_parse(series):
+    millis = series.apply(lambda x: int(re.findall(r'\d+', x)[0]))
+    return pd.to_datetime(millis, unit='ms', utc=True)
+
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    millis = 1_700_000_000_000 + np.arange(n_rows, dtype=np.int64) * 250
+    values = pd.Series([f"/Date({m})/" for m in millis])
+
+    for label, parse in (("regex per row", regex_parse), ("parse_dotnet_dates", lambda s: parse_dotnet_dates(s.to_numpy()))):
+        started = time.perf_counter()
+        parsed = parse(values)
+        elapsed = time.perf_counter() - started
+        print(f"{label:<20} rows={n_rows:<9} {elapsed * 1000:9.1f}ms  {n_rows / elapsed / 1e6:6.2f}M rows/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Benchmark: peak memory and time of response.json() + convert_to_dataframe vs. the
+streaming RecordArrayDecoder on large PriceBars payloads.
+
+The raw payload is built before measuring and fed in 64 KiB chunks, as
+``response.iter_content`` would; the json() path additionally has to hold the
+whole body, which is counted as the payload size below.
+
+Run with:  python benchmarks/bench_decoding.py [n_rows]
+"""
+import gc
+import json
+import sys
+import time
+import tracemalloc
+
+from pygcapi.decoding import JSON_BACKEND, CHUNK_SIZE, decode_records
+from pygcapi.testing import synthetic_bars
+from pygcapi.utils import convert_to_dataframe
+
+
+def json_path(payload):
+    data = json.loads(payload)
+    return convert_to_dataframe(data["PriceBars"])
+
+
+def streaming_path(payload):
+    view = memoryview(payload)
+    chunks = (bytes(view[i:i + CHUNK_SIZE]) for i in range(0, len(payload), CHUNK_SIZE))
+    return decode_records(chunks, "PriceBars", "BarDate")
+
+
+def measure(label, func, payload):
+    # Time without tracing first, since tracemalloc slows allocation-heavy code down
+    gc.collect()
+    started = time.perf_counter()
+    func(payload)
+    elapsed = time.perf_counter() - started
+
+    gc.collect()
+    tracemalloc.start()
+    df = func(payload)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    frame = df.memory_usage(deep=True).sum()
+    print(f"{label:<22} rows={len(df):<8} time={elapsed * 1000:8.1f}ms "
+          f"peak={peak / 1e6:8.1f}MB frame={frame / 1e6:6.1f}MB peak/frame={peak / frame:5.1f}x")
+
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 400_000
+    bars = synthetic_bars(0, n_rows * 60 - 1, "MINUTE", 1, n_rows)
+    payload = json.dumps({"PriceBars": bars}).encode()
+    del bars
+    print(f"payload={len(payload) / 1e6:.1f}MB json backend={JSON_BACKEND}")
+    measure("json + DataFrame", json_path, payload)
+    measure("streaming decoder", streaming_path, payload)
+
+
+if __name__ == "__main__":
+    main()
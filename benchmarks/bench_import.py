@@ -0,0 +1,64 @@
+"""
+Benchmark: cold import time of pygcapi and the modules it loads.
+
+Each run imports the package in a fresh interpreter and resolves
+a client, as a short-lived order script does. The benchmark fails (exit status 1) when
+pandas, NumPy or another heavy dependency is loaded by the import, or when the import
+takes longer than ``max_ratio`` times a bare ``import requests`` (the one dependency
+every client call needs), which keeps the check independent of the machine's speed.
+
+Run with:  python benchmarks/bench_import.py [repeat] [max_ratio]
+"""
+import os
+import subprocess
+import sys
+
+# Dependencies that must only be imported on first use
+HEAVY_MODULES = ("pandas", "numpy", "pyarrow", "polars", "aiohttp", "asyncio")
+
+STATEMENT = "import pygcapi; pygcapi.GCapiClientV2"
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+
+
+def cold_import(statement):
+    """
+    Run ``statement`` in a fresh interpreter and return (seconds taken, imported module names).
+    """
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [SRC, os.environ.get("PYTHONPATH")])))
+    code = (
+        "import sys, time\n"
+        "started = time.perf_counter()\n"
+        f"{statement}\n"
+        "print(time.perf_counter() - started)\n"
+        "print(' '.join(sys.modules))\n"
+    )
+    proc = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+    elapsed, modules = proc.stdout.splitlines()
+    return float(elapsed), set(modules.split())
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    max_ratio = float(sys.argv[2]) if len(sys.argv) > 2 else 1.6
+
+    baseline = min(cold_import("import requests")[0] for _ in range(repeat))
+    runs = [cold_import(STATEMENT) for _ in range(repeat)]
+    best = min(total for total, _ in runs)
+    modules = runs[0][1]
+
+    print(f"{'import requests':<36} {baseline * 1000:8.1f}ms")
+    print(f"{STATEMENT:<36} {best * 1000:8.1f}ms  ({best / baseline:.2f}x, budget {max_ratio:.2f}x)")
+
+    failures = []
+    loaded = [name for name in HEAVY_MODULES if name in modules]
+    if loaded:
+        failures.append(f"heavy modules imported eagerly: {', '.join(loaded)}")
+    if best > max_ratio * baseline:
+        failures.append(f"cold import took {best / baseline:.2f}x `import requests`, over the {max_ratio:.2f}x budget")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmark: cost of building results in frame mode (pandas DataFrame) versus records
+mode (NumPy structured arrays for bars, slotted records for positions) on small and
+large payloads, plus the cost of converting records to a DataFrame afterwards.
+
+Bars are decoded from raw PriceBars bytes, as get_ohlc does; positions start from the
+decoded JSON list, as list_open_positions does after response.json().
+
+Run with:  python benchmarks/bench_records.py [repeat]
+"""
+import json
+import sys
+import time
+
+import pandas as pd
+
+from pygcapi.decoding import decode_records
+from pygcapi.records import Position, to_dataframe
+from pygcapi.testing import synthetic_bars
+
+START = 1_700_000_040
+
+
+def best_of(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def positions_payload(n):
+    return [
+        {"OrderId": 1000 + i, "MarketId": 401484347, "MarketName": "EUR/USD", "Direction": "buy" if i % 2 else "sell",
+         "Quantity": 1000, "Price": 1.1 + i * 1e-5, "Status": 3, "StatusReason": 1, "TradingAccountId": 1,
+         "Currency": "USD", "CreatedDateTimeUTC": "/Date(1700000000000)/", "ExecutedDateTimeUTC": "/Date(1700000000000)/"}
+        for i in range(n)
+    ]
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    print(f"{'payload':<18} {'frame':>10} {'records':>10} {'speedup':>8} {'records->frame':>15}")
+
+    for n in (1, 100, 4000):
+        payload = json.dumps({"PriceBars": synthetic_bars(START, START + 60 * n - 1, "MINUTE", 1, n)}).encode()
+        frame = best_of(lambda: decode_records([payload], "PriceBars", "BarDate"), repeat)
+        records = best_of(lambda: decode_records([payload], "PriceBars", "BarDate", output="records"), repeat)
+        array = decode_records([payload], "PriceBars", "BarDate", output="records")
+        convert = best_of(lambda: to_dataframe(array), repeat)
+        print(f"{f'{n} bars':<18} {frame * 1e6:8.1f}us {records * 1e6:8.1f}us {frame / records:7.1f}x {convert * 1e6:13.1f}us")
+
+    for n in (1, 100, 2000):
+        positions = positions_payload(n)
+        frame = best_of(lambda: pd.DataFrame(positions), repeat)
+        records = best_of(lambda: Position.from_api_list(positions), repeat)
+        items = Position.from_api_list(positions)
+        convert = best_of(lambda: to_dataframe(items), repeat)
+        print(f"{f'{n} positions':<18} {frame * 1e6:8.1f}us {records * 1e6:8.1f}us {frame / records:7.1f}x {convert * 1e6:13.1f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Benchmark: PriceStream throughput (ticks per second) and end-to-end latency
+against the local FakeStreamingServer, which runs on its own thread and event
+loop so that producing ticks does not compete with consuming them.
+
+Run with:  python benchmarks/bench_streaming.py [tick_rate] [seconds]
+"""
+import asyncio
+import statistics
+import sys
+import threading
+import time
+
+from pygcapi.streaming import PriceStream
+from pygcapi.testing import FakeStreamingServer
+
+
+def serve_in_thread(server):
+    loop = asyncio.new_event_loop()
+    ready = threading.Event()
+
+    def run():
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(server.start())
+        ready.set()
+        loop.run_forever()
+
+    threading.Thread(target=run, daemon=True).start()
+    ready.wait()
+    return loop
+
+
+async def consume(server, seconds):
+    latencies = []
+    async with PriceStream(server.host, server.port, ["401484347", "401484348"]) as stream:
+        started = time.perf_counter()
+        async for tick in stream:
+            latencies.append(tick.latency * 1000)
+            if time.perf_counter() - started >= seconds:
+                break
+        elapsed = time.perf_counter() - started
+    return latencies, elapsed
+
+
+def main(tick_rate, seconds):
+    server = FakeStreamingServer(tick_rate=tick_rate)
+    loop = serve_in_thread(server)
+    latencies, elapsed = asyncio.run(consume(server, seconds))
+    asyncio.run_coroutine_threadsafe(server.stop(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+
+    latencies.sort()
+    print(f"target={tick_rate:,.0f}/s received={len(latencies)} throughput={len(latencies) / elapsed:,.0f} ticks/s")
+    print(f"latency p50={statistics.median(latencies):.2f}ms p99={latencies[int(len(latencies) * 0.99) - 1]:.2f}ms "
+          f"max={latencies[-1]:.2f}ms")
+
+
+if __name__ == "__main__":
+    rate = float(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    duration = float(sys.argv[2]) if len(sys.argv) > 2 else 3.0
+    main(rate, duration)
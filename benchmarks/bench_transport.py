@@ -0,0 +1,43 @@
+"""
+Benchmark: per-call latency and connection reuse of the pooled Transport
+against a fresh connection per request (module-level ``requests.get``).
+
+Run with:  python benchmarks/bench_transport.py [n_calls]
+"""
+import sys
+import time
+import statistics
+
+import requests
+
+from pygcapi.testing import StubApiServer
+from pygcapi.transport import Transport
+
+
+def run(label, server, send, n_calls):
+    server.connections = 0
+    server.requests = 0
+    timings = []
+    for _ in range(n_calls):
+        start = time.perf_counter()
+        response = send(f"{server.base_url_v1}/market/1/barhistorybetween",
+                        params={"interval": "MINUTE", "span": 1, "fromTimeStampUTC": 0,
+                                "toTimeStampUTC": 600, "maxResults": 10})
+        response.content
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    print(f"{label:<22} calls={n_calls:<5} connections={server.connections:<5} "
+          f"mean={statistics.mean(timings):.3f}ms p50={timings[len(timings) // 2]:.3f}ms "
+          f"p99={timings[int(len(timings) * 0.99) - 1]:.3f}ms")
+
+
+def main():
+    n_calls = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    with StubApiServer() as server:
+        run("requests.get", server, requests.get, n_calls)
+        with Transport() as transport:
+            run("Transport (pooled)", server, transport.get, n_calls)
+
+
+if __name__ == "__main__":
+    main()
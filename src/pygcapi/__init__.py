@@ -0,0 +1,31 @@
+import importlib
+from typing import TYPE_CHECKING, Any
+
+# Public names and the modules defining them; each module is imported on first access
+# so that `import pygcapi` does not load the clients (and their dependencies) up front
+_LAZY_ATTRIBUTES = {
+    "GCapiClientV1": "core_v1",
+    "GCapiClientV2": "core_v2",
+    "AsyncGCapiClient": "async_client",
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+if TYPE_CHECKING:
+    from pygcapi.core_v1 import GCapiClientV1
+    from pygcapi.core_v2 import GCapiClientV2
+    from pygcapi.async_client import AsyncGCapiClient
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    # Cache on the package so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
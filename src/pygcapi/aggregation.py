@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+from typing import Optional, Tuple, List, Union
+
+from pygcapi.lazy import lazy_import
+from pygcapi.utils import interval_seconds
+from pygcapi.records import OUTPUT_MODES, NAT, check_output, array_from_dataframe, to_dataframe
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+DAY_MS = 86_400_000
+
+# Layout of aggregated bars: the structured array of get_ohlc(output="records")
+BAR_DTYPE = [("Date", "datetime64[ms]"), ("Open", "f8"), ("High", "f8"), ("Low", "f8"), ("Close", "f8")]
+
+Ticks = Union["pd.DataFrame", "np.ndarray"]
+Bars = Union["pd.DataFrame", "np.ndarray"]
+
+
+def session_offset(session_open: Optional[str]) -> Optional[int]:
+    """
+    Parse a UTC session open time ("HH:MM") into milliseconds after midnight.
+
+    :raises ValueError: If the time is not a valid "HH:MM".
+    """
+    if session_open is None:
+        return None
+    try:
+        hours, minutes = (int(part) for part in session_open.split(":"))
+    except ValueError:
+        raise ValueError(f"session_open must be 'HH:MM', got {session_open!r}")
+    if not (0 <= hours < 24 and 0 <= minutes < 60):
+        raise ValueError(f"session_open must be 'HH:MM', got {session_open!r}")
+    return (hours * 60 + minutes) * 60_000
+
+
+def tick_columns(ticks: Ticks) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Extract epoch milliseconds and prices from get_prices ticks, dropping ticks without a date or price.
+
+    :param ticks: A tick DataFrame (output="frame") or structured array (output="records").
+    :return: Contiguous (int64 epoch milliseconds, float64 prices), in time order.
+    """
+    if len(ticks) == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+    if isinstance(ticks, np.ndarray):
+        millis = np.ascontiguousarray(ticks["Date"]).astype("datetime64[ms]", copy=False).view(np.int64)
+        prices = np.ascontiguousarray(ticks["Price"], dtype=np.float64)
+    else:
+        dates = ticks["Date"].dt.tz_convert("UTC").dt.tz_localize(None)
+        millis = dates.to_numpy().astype("datetime64[ms]", copy=False).view(np.int64)
+        prices = ticks["Price"].to_numpy(dtype=np.float64)
+    # Two reductions rule out NaN prices and NaT dates without building masks in the common case
+    if np.isnan(prices.sum()) or millis.min() == NAT:
+        valid = (millis != NAT) & ~np.isnan(prices)
+        millis, prices = millis[valid], prices[valid]
+    if len(millis) > 1 and (millis[1:] < millis[:-1]).any():
+        order = np.argsort(millis, kind="stable")
+        millis, prices = millis[order], prices[order]
+    return millis, prices
+
+
+def _time_keys(millis: np.ndarray, width: int, session: Optional[int]) -> np.ndarray:
+    # Bar number of each tick: counted from the epoch, or per session day when sessions are aligned
+    if session is None:
+        return millis // width
+    shifted = millis - session
+    days = shifted // DAY_MS
+    return days * -(-DAY_MS // width) + (shifted - days * DAY_MS) // width
+
+
+def _key_starts(keys: np.ndarray, width: int, session: Optional[int]) -> np.ndarray:
+    # Inverse of _time_keys: the start in epoch milliseconds of each bar number
+    if session is None:
+        return keys * width
+    days, index = np.divmod(keys, -(-DAY_MS // width))
+    return days * DAY_MS + session + index * width
+
+
+def _run_bounds(keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    # First index and end (exclusive) of every run of equal, non-decreasing keys
+    starts = np.flatnonzero(keys[1:] != keys[:-1]) + 1
+    starts = np.concatenate((np.zeros(1, dtype=starts.dtype), starts))
+    return starts, np.append(starts[1:], len(keys))
+
+
+def _reduce_bars(keys: np.ndarray, prices: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    # One OHLC bar per run of equal keys; returns the bars (Date left to the caller) and their first tick index
+    if len(keys) == 0:
+        return np.empty(0, dtype=BAR_DTYPE), np.empty(0, dtype=np.intp)
+    starts, ends = _run_bounds(keys)
+    bars = np.empty(len(starts), dtype=BAR_DTYPE)
+    bars["Open"] = prices[starts]
+    bars["High"] = np.maximum.reduceat(prices, starts)
+    bars["Low"] = np.minimum.reduceat(prices, starts)
+    bars["Close"] = prices[ends - 1]
+    return bars, starts
+
+
+class BarAggregator:
+    """
+    Aggregates get_prices ticks into OHLC bars locally, without another bar history call.
+
+    Bars cover a fixed time interval (``interval`` x ``span``, stamped with their
+    start time like get_ohlc bars) or a fixed number of ticks (``ticks_per_bar``,
+    stamped with the time of their first tick). Aggregation is a handful of NumPy
+    passes over the tick columns.
+
+    ``update()`` is incremental: the last bar stays open, and newly arrived ticks only
+    extend it or start new bars, so each update costs time proportional to the new
+    ticks rather than to the whole history.
+    """
+
+    def __init__(
+        self,
+        interval: str = "MINUTE",
+        span: int = 1,
+        ticks_per_bar: Optional[int] = None,
+        session_open: Optional[str] = None,
+    ):
+        """
+        Initialize the BarAggregator.
+
+        :param interval: The bar interval (e.g., "MINUTE", "HOUR"), ignored for tick-count bars.
+        :param span: The span size for the given interval.
+        :param ticks_per_bar: Optional number of ticks per bar, for tick-count bars instead of time bars.
+        :param session_open: Optional UTC session open ("HH:MM") at which time bars restart every day.
+        """
+        if ticks_per_bar is not None and ticks_per_bar < 1:
+            raise ValueError("ticks_per_bar must be at least 1")
+        self.ticks_per_bar = ticks_per_bar
+        self.width = None if ticks_per_bar is not None else interval_seconds(interval, span) * 1000
+        self.session = session_offset(session_open)
+        if self.session is not None and (self.width is None or self.width > DAY_MS):
+            raise ValueError("session_open only applies to time bars of at most one day")
+        self._closed: List[np.ndarray] = []
+        self._open: Optional[np.ndarray] = None
+        self._open_key: Optional[int] = None
+        self._n_ticks = 0
+        self._last = None
+
+    def _reduce(self, millis: np.ndarray, prices: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        if self.ticks_per_bar is not None:
+            keys = np.arange(self._n_ticks, self._n_ticks + len(millis), dtype=np.int64) // self.ticks_per_bar
+            bars, starts = _reduce_bars(keys, prices)
+            bars["Date"] = millis[starts].view("datetime64[ms]")
+        else:
+            keys = _time_keys(millis, self.width, self.session)
+            bars, starts = _reduce_bars(keys, prices)
+            bars["Date"] = _key_starts(keys[starts], self.width, self.session).view("datetime64[ms]")
+        return bars, keys
+
+    def update(self, ticks: Ticks) -> Ticks:
+        """
+        Add newly arrived ticks.
+
+        :param ticks: Ticks as returned by get_prices (DataFrame or structured array), not older than earlier ticks.
+        :return: The bars the ticks touched (the previously open bar if it was extended, then any new bars),
+            in the format of ``ticks``.
+        :raises ValueError: If the ticks are older than the ticks already aggregated.
+        """
+        millis, prices = tick_columns(ticks)
+        if len(millis) and self._last is not None and millis[0] < self._last:
+            raise ValueError("Ticks must not be older than the ticks already aggregated")
+        bars, keys = self._reduce(millis, prices)
+        if len(bars):
+            if self._open is not None and keys[0] == self._open_key:
+                # The first new bar continues the open one
+                open_bar = self._open[0]
+                bars["Date"][0] = open_bar["Date"]
+                bars["Open"][0] = open_bar["Open"]
+                bars["High"][0] = max(bars["High"][0], open_bar["High"])
+                bars["Low"][0] = min(bars["Low"][0], open_bar["Low"])
+            elif self._open is not None:
+                self._closed.append(self._open)
+            if len(bars) > 1:
+                self._closed.append(bars[:-1].copy())
+            self._open = bars[-1:].copy()
+            self._open_key = keys[-1]
+            self._n_ticks += len(millis)
+            self._last = millis[-1]
+        return bars if isinstance(ticks, np.ndarray) else to_dataframe(bars)
+
+    def bars(self, include_open: bool = True, output: str = "frame") -> Ticks:
+        """
+        Return all bars aggregated so far.
+
+        :param include_open: Whether to include the still-forming last bar.
+        :param output: "frame" for a DataFrame in get_ohlc format, "records" for a structured array.
+        """
+        check_output(output, OUTPUT_MODES)
+        parts = self._closed + ([self._open] if include_open and self._open is not None else [])
+        bars = np.concatenate(parts) if parts else np.empty(0, dtype=BAR_DTYPE)
+        if len(self._closed) > 1:
+            # Keep later calls cheap by merging the closed chunks once
+            self._closed = [np.concatenate(self._closed)]
+        return bars if output == "records" else to_dataframe(bars)
+
+
+def aggregate_ticks(
+    ticks: Ticks,
+    interval: str = "MINUTE",
+    span: int = 1,
+    ticks_per_bar: Optional[int] = None,
+    session_open: Optional[str] = None,
+) -> Ticks:
+    """
+    Aggregate get_prices ticks into OHLC bars with the columns of get_ohlc.
+
+    :param ticks: Ticks as returned by get_prices (DataFrame or structured array).
+    :param interval: The bar interval (e.g., "MINUTE", "HOUR"), ignored for tick-count bars.
+    :param span: The span size for the given interval.
+    :param ticks_per_bar: Optional number of ticks per bar, for tick-count bars instead of time bars.
+    :param session_open: Optional UTC session open ("HH:MM") at which time bars restart every day.
+    :return: Bars in the format of ``ticks``: a DataFrame (Date, Open, High, Low, Close) or a structured array.
+    """
+    return BarAggregator(interval, span, ticks_per_bar, session_open).update(ticks)
+
+
+def resample_bars(bars: Bars, interval: str = "HOUR", span: int = 1) -> Bars:
+    """
+    Aggregate OHLC bars into coarser epoch-aligned bars (e.g., 1 minute bars into 15 minute bars).
+
+    Each coarse bar is stamped with its start and takes the first Open, highest High,
+    lowest Low and last Close of the bars starting inside it. The coarse length should
+    be a multiple of the input bars' length for complete bars.
+
+    :param bars: Bars as returned by get_ohlc (DataFrame or structured array), in time order.
+    :param interval: The coarse bar interval (e.g., "MINUTE", "HOUR").
+    :param span: The span size for the given interval.
+    :return: Coarse bars in the format of ``bars``.
+    """
+    width = interval_seconds(interval, span) * 1000
+    records = bars if isinstance(bars, np.ndarray) else array_from_dataframe(bars)
+    if len(records) == 0:
+        resampled = np.empty(0, dtype=BAR_DTYPE)
+    else:
+        millis = np.ascontiguousarray(records["Date"]).astype("datetime64[ms]", copy=False).view(np.int64)
+        keys = _time_keys(millis, width, None)
+        starts, ends = _run_bounds(keys)
+        resampled = np.empty(len(starts), dtype=BAR_DTYPE)
+        resampled["Date"] = _key_starts(keys[starts], width, None).view("datetime64[ms]")
+        resampled["Open"] = records["Open"][starts]
+        resampled["High"] = np.maximum.reduceat(np.ascontiguousarray(records["High"], dtype=np.float64), starts)
+        resampled["Low"] = np.minimum.reduceat(np.ascontiguousarray(records["Low"], dtype=np.float64), starts)
+        resampled["Close"] = records["Close"][ends - 1]
+    return resampled if isinstance(bars, np.ndarray) else to_dataframe(resampled)
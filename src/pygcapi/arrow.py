@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import importlib
+from typing import Optional, Dict, Any, List
+
+from pygcapi.lazy import lazy_import
+from pygcapi import records
+
+np = lazy_import("numpy")
+
+
+def require(module: str) -> Any:
+    """
+    Import an optional output backend, raising an ImportError with the install hint when it is missing.
+
+    :param module: "pyarrow" or "polars".
+    :return: The imported module.
+    """
+    try:
+        return importlib.import_module(module)
+    except ImportError as e:
+        raise ImportError(
+            f"output={'arrow' if module == 'pyarrow' else module!r} requires {module}. "
+            f"Install it with `pip install pygcapi[arrow]`."
+        ) from e
+
+
+def record_batch(millis: Optional[np.ndarray], columns: Dict[str, np.ndarray]) -> Any:
+    """
+    Build an Arrow RecordBatch from decoded columns without going through pandas.
+
+    Numeric columns are handed to Arrow without copying; the epoch milliseconds
+    become a 'Date' column of type timestamp[ms, tz=UTC], with nulls for missing dates.
+
+    :param millis: Epoch milliseconds of each record (None when there are no records).
+    :param columns: The other columns by name.
+    :return: A pyarrow.RecordBatch with 'Date' first.
+    """
+    pa = require("pyarrow")
+    if millis is None:
+        millis = np.empty(0, dtype=np.int64)
+    missing = millis == records.NAT
+    dates = pa.array(millis, type=pa.timestamp("ms", tz="UTC"), mask=missing if missing.any() else None)
+    arrays = [dates] + [pa.array(array) for array in columns.values()]
+    return pa.RecordBatch.from_arrays(arrays, names=["Date", *columns])
+
+
+def from_dataframe(df: Any) -> Any:
+    """
+    Convert a pandas DataFrame of bars or ticks into a RecordBatch (used for bars served from a BarStore).
+    """
+    pa = require("pyarrow")
+    return pa.RecordBatch.from_pandas(df, preserve_index=False)
+
+
+def to_polars(data: Any) -> Any:
+    """
+    Wrap an Arrow RecordBatch or Table as a Polars DataFrame, sharing its buffers.
+    """
+    pl = require("polars")
+    return pl.from_arrow(data)
+
+
+def date_bounds(data: Any) -> tuple:
+    """
+    Return the first and last 'Date' of a RecordBatch or Table as epoch milliseconds.
+    """
+    pa = require("pyarrow")
+    import pyarrow.compute as pc
+
+    bounds = pc.min_max(data["Date"].cast(pa.int64()))
+    return bounds["min"].as_py(), bounds["max"].as_py()
+
+
+def concat_batches(parts: List[Any]) -> Any:
+    """
+    Concatenate time-ordered chunks of bars into one Arrow Table.
+
+    Consecutive chunks share their boundary timestamp, so rows not later than the
+    last 'Date' of the previous chunk are dropped, mirroring the pandas path's
+    drop_duplicates().
+
+    :param parts: RecordBatches (or Tables) ordered by their first 'Date'.
+    :return: A pyarrow.Table.
+    """
+    pa = require("pyarrow")
+    import pyarrow.compute as pc
+
+    tables = []
+    last = None
+    for part in parts:
+        table = pa.Table.from_batches([part]) if isinstance(part, pa.RecordBatch) else part
+        if last is not None and table.num_rows:
+            table = table.filter(pc.greater(table["Date"], last))
+        if table.num_rows:
+            last = pc.max(table["Date"])
+            tables.append(table)
+    if not tables:
+        return pa.table({})
+    return pa.concat_tables(tables, promote_options="default")
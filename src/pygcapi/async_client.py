@@ -0,0 +1,416 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from typing import Optional, Dict, Any, List, Iterable
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - exercised only without the optional dependency
+    aiohttp = None
+
+from pygcapi.lazy import lazy_import
+from pygcapi.utils import (
+    convert_orders_to_dataframe,
+    build_order_details
+)
+from pygcapi.decoding import NoDataError, decode_records
+from pygcapi.streaming import PriceStream
+from pygcapi.concurrency import AsyncAdaptiveConcurrency, parse_retry_after
+
+pd = lazy_import("pandas")
+
+
+class AsyncGCapiClient:
+    """
+    An asyncio client for the Gain Capital API V2.
+
+    Mirrors the GCapiClientV2 surface on top of aiohttp with a shared connection pool
+    and a concurrency limit, so dozens of market-data calls can be awaited together
+    with ``asyncio.gather`` in a single event loop.
+
+    Usage::
+
+        async with AsyncGCapiClient(username, password, appkey) as client:
+            frames = await asyncio.gather(*(client.get_ohlc(m, 100) for m in market_ids))
+    """
+
+    BASE_URL_V1 = "https://ciapi.cityindex.com/TradingAPI"
+    BASE_URL_V2 = "https://ciapi.cityindex.com/v2"
+
+    def __init__(
+        self,
+        username: str,
+        password: str,
+        appkey: str,
+        max_concurrency: int = 16,
+        pool_size: int = 64,
+        limit_per_host: int = 32,
+        timeout: Optional[float] = 30.0,
+        concurrency: Optional[AsyncAdaptiveConcurrency] = None,
+    ):
+        """
+        Initialize the AsyncGCapiClient object. The session is created by login() or ``async with``.
+
+        :param username: The username for the Gain Capital API.
+        :param password: The password for the Gain Capital API.
+        :param appkey: The application key for the Gain Capital API.
+        :param max_concurrency: Maximum number of requests in flight at once.
+        :param pool_size: Total number of pooled connections.
+        :param limit_per_host: Maximum number of pooled connections per host.
+        :param timeout: Total timeout in seconds for each request (None disables it).
+        :param concurrency: Optional AsyncAdaptiveConcurrency used instead of the fixed max_concurrency limit.
+        """
+        if aiohttp is None:
+            raise ImportError("AsyncGCapiClient requires aiohttp. Install it with `pip install pygcapi[async]`.")
+
+        self.username = username
+        self.appkey = appkey
+        self._password = password
+        self.max_concurrency = max_concurrency
+        self.pool_size = pool_size
+        self.limit_per_host = limit_per_host
+        self.timeout = timeout
+        self.concurrency = concurrency
+        self.session_id = None
+        self.trading_account_id = None
+        self.client_account_id = None
+        self.headers = {'Content-Type': 'application/json'}
+        self._http: Optional["aiohttp.ClientSession"] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def __aenter__(self) -> "AsyncGCapiClient":
+        await self.login()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    def _ensure_http(self) -> "aiohttp.ClientSession":
+        """
+        Lazily create the pooled aiohttp session inside the running event loop.
+        """
+        if self._http is None or self._http.closed:
+            connector = aiohttp.TCPConnector(limit=self.pool_size, limit_per_host=self.limit_per_host)
+            self._http = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._http
+
+    async def _request(self, method: str, url: str, **kwargs: Any):
+        """
+        Send a request under the concurrency limit (fixed, or adaptive with ``concurrency``).
+
+        :return: A tuple of (status code, response body as text).
+        """
+        http = self._ensure_http()
+        if self.concurrency is None:
+            async with self._semaphore:
+                async with http.request(method, url, **kwargs) as response:
+                    return response.status, await response.text()
+
+        await self.concurrency.acquire()
+        status = retry_after = None
+        started = time.monotonic()
+        try:
+            async with http.request(method, url, **kwargs) as response:
+                status = response.status
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                return status, await response.text()
+        finally:
+            self.concurrency.release(status, time.monotonic() - started, retry_after)
+
+    async def close(self) -> None:
+        """
+        Close the pooled connections.
+        """
+        if self._http is not None and not self._http.closed:
+            await self._http.close()
+
+    async def login(self) -> str:
+        """
+        Create a session with the Gain Capital API.
+
+        :return: The session ID.
+        """
+        data = {
+            "UserName": self.username,
+            "Password": self._password,
+            "AppKey": self.appkey
+        }
+        status, text = await self._request(
+            "POST", f"{self.BASE_URL_V2}/session", headers={'Content-Type': 'application/json'}, data=json.dumps(data)
+        )
+        if status != 200:
+            raise Exception(f"Failed to create session: {text}")
+
+        resp_data = json.loads(text)
+        if 'session' not in resp_data:
+            raise Exception("Login failed, session not created.")
+
+        self.session_id = resp_data['session']
+        self.headers = {
+            'Content-Type': 'application/json',
+            'UserName': self.username,
+            'Session': self.session_id
+        }
+        return self.session_id
+
+    async def get_account_info(self, key: Optional[str] = None) -> Any:
+        """
+        Retrieve account information.
+
+        :param key: Optional key to extract specific information from the account details.
+        :return: Account information as a dictionary or a specific value if a key is provided.
+        """
+        status, text = await self._request(
+            "GET", f"{self.BASE_URL_V2}/UserAccount/ClientAndTradingAccount", headers=self.headers
+        )
+        if status != 200:
+            raise Exception(f"Failed to retrieve account info: {text}")
+
+        account_info = json.loads(text)
+        self.trading_account_id = account_info.get("tradingAccounts", [{}])[0].get("tradingAccountId")
+        self.client_account_id = account_info.get("tradingAccounts", [{}])[0].get("clientAccountId")
+
+        if key:
+            return account_info.get("TradingAccounts", [{}])[0].get(key)
+
+        return account_info
+
+    async def get_market_info(self, market_name: str, key: Optional[str] = None) -> Any:
+        """
+        Retrieve market information.
+
+        :param market_name: The name of the market to retrieve information for.
+        :param key: Optional key to extract specific information from the market details.
+        :return: Market information as a dictionary or a specific value if a key is provided.
+        """
+        params = {"marketName": market_name}
+        status, text = await self._request("GET", f"{self.BASE_URL_V1}/cfd/markets", headers=self.headers, params=params)
+        if status != 200:
+            raise Exception(f"Failed to retrieve market info: {text}")
+
+        markets = json.loads(text).get("Markets", [])
+        if not markets:
+            raise Exception(f"No market information found for: {market_name}")
+
+        if key:
+            return markets[0].get(key)
+
+        return markets[0]
+
+    async def get_prices(self, market_id: str, num_ticks: int, from_ts: int, to_ts: int, price_type: str = "MID") -> pd.DataFrame:
+        """
+        Retrieve tick history (price data) for a specific market.
+
+        :param market_id: The market ID for which price data is retrieved.
+        :param num_ticks: The maximum number of ticks to retrieve.
+        :param from_ts: Start timestamp for the data.
+        :param to_ts: End timestamp for the data.
+        :param price_type: The type of price data to retrieve (e.g., "MID", "BID", "ASK").
+        :return: A DataFrame containing the price data.
+        """
+        params = {
+            "fromTimeStampUTC": from_ts,
+            "toTimeStampUTC": to_ts,
+            "maxResults": num_ticks,
+            "priceType": price_type.upper()
+        }
+
+        url = f"{self.BASE_URL_V1}/market/{market_id}/tickhistorybetween"
+        status, text = await self._request("GET", url, headers=self.headers, params=params)
+        if status != 200:
+            raise Exception(f"Failed to retrieve prices: {text}")
+
+        # Decode 'PriceTicks' straight into columns with a UTC 'Date' column, as the sync clients do
+        ticks = decode_records([text.encode()], "PriceTicks", "TickDate")
+        if len(ticks) == 0:
+            raise NoDataError(f"No price data found for market ID {market_id}")
+        return ticks
+
+    async def get_ohlc(self, market_id: str, num_ticks: int, interval: str = "HOUR", span: int = 1, from_ts: int = None, to_ts: int = None) -> pd.DataFrame:
+        """
+        Retrieve OHLC data for a specific market.
+
+        :param market_id: The market ID for which OHLC data is retrieved.
+        :param num_ticks: The maximum number of OHLC data points to retrieve.
+        :param interval: The time interval of the OHLC data (e.g., "MINUTE", "HOUR", "DAY").
+        :param span: The span size for the given interval.
+        :param from_ts: Start timestamp for the data.
+        :param to_ts: End timestamp for the data.
+        :return: A DataFrame containing the OHLC data.
+        """
+        params = {
+            "interval": interval,
+            "span": span,
+            "maxResults": num_ticks
+        }
+        # aiohttp rejects None query values, so only send the bounds that were given
+        if from_ts is not None:
+            params["fromTimeStampUTC"] = from_ts
+        if to_ts is not None:
+            params["toTimeStampUTC"] = to_ts
+
+        url = f"{self.BASE_URL_V1}/market/{market_id}/barhistorybetween"
+        status, text = await self._request("GET", url, headers=self.headers, params=params)
+        if status != 200:
+            raise Exception(f"Failed to retrieve OHLC data: {text}")
+
+        bars = decode_records([text.encode()], "PriceBars", "BarDate")
+        if len(bars) == 0:
+            raise NoDataError(f"No OHLC data found for market ID {market_id}")
+        return bars
+
+    async def get_ohlc_many(self, market_ids: Iterable[str], num_ticks: int, interval: str = "HOUR", span: int = 1, from_ts: int = None, to_ts: int = None) -> Dict[str, Any]:
+        """
+        Retrieve OHLC data for several markets concurrently.
+
+        :param market_ids: The market IDs for which OHLC data is retrieved.
+        :param num_ticks: The maximum number of OHLC data points to retrieve per market.
+        :param interval: The time interval of the OHLC data (e.g., "MINUTE", "HOUR", "DAY").
+        :param span: The span size for the given interval.
+        :param from_ts: Start timestamp for the data.
+        :param to_ts: End timestamp for the data.
+        :return: A dictionary mapping each market ID to its DataFrame, or to the exception raised for it.
+        """
+        market_ids = list(market_ids)
+        results = await asyncio.gather(
+            *(self.get_ohlc(market_id, num_ticks, interval, span, from_ts, to_ts) for market_id in market_ids),
+            return_exceptions=True,
+        )
+        return dict(zip(market_ids, results))
+
+    async def _session_token(self) -> str:
+        """
+        Return the session ID, logging in first if there is none yet.
+        """
+        if self.session_id is None:
+            await self.login()
+        return self.session_id
+
+    def subscribe_prices(self, market_ids: List[str], host: str, port: int, **kwargs: Any) -> PriceStream:
+        """
+        Create a real-time price subscription for a set of markets through a streaming relay.
+        The Gain Capital API does not serve this protocol: host and port must point at a relay
+        that speaks the PriceStream NDJSON protocol (or at pygcapi.testing.FakeStreamingServer).
+        Await start() on the returned stream (or use ``async with``) inside an event loop; the
+        session is resolved when the stream connects, without blocking the loop.
+
+        :param market_ids: The market IDs to stream prices for.
+        :param host: The relay host.
+        :param port: The relay port.
+        :param kwargs: Extra PriceStream options (heartbeat_timeout, max_queue, overflow, ...).
+        :return: A PriceStream delivering PriceTick objects through callbacks or ``async for``.
+        """
+        return PriceStream(host, port, market_ids, session=self._session_token, username=self.username, **kwargs)
+
+    async def trade_order(
+        self,
+        quantity: float,
+        offer_price: float,
+        bid_price: float,
+        direction: str,
+        market_id: str,
+        market_name: str,
+        stop_loss: float = None,
+        take_profit: float = None,
+        trigger_price: float = None,
+        close: bool = False,
+        order_id: str = None,
+        tolerance: float = None,
+    ) -> dict:
+        """
+        Place a trade order.
+
+        :param quantity: Quantity to trade.
+        :param offer_price: Offer price for the trade.
+        :param bid_price: Bid price for the trade.
+        :param direction: Direction of the trade ("buy" or "sell").
+        :param market_id: Market ID.
+        :param market_name: Market name.
+        :param stop_loss: Stop loss price (optional).
+        :param take_profit: Take profit price (optional).
+        :param trigger_price: Trigger price (optional).
+        :param close: Whether to close the trade (optional).
+        :param order_id: Order ID (optional).
+        :param tolerance: Price tolerance (optional).
+        :return: The submitted order details, including the OrderId when one is returned.
+        """
+        order_details = build_order_details(
+            quantity=quantity,
+            offer_price=offer_price,
+            bid_price=bid_price,
+            direction=direction,
+            market_id=market_id,
+            market_name=market_name,
+            trading_account_id=self.trading_account_id,
+            client_account_id=self.client_account_id,
+            stop_loss=stop_loss,
+            take_profit=take_profit,
+            trigger_price=trigger_price,
+            close=close,
+            order_id=order_id,
+            tolerance=tolerance,
+        )
+
+        status, text = await self._request(
+            "POST", f"{self.BASE_URL_V1}/order/newtradeorder", headers=self.headers, data=json.dumps(order_details)
+        )
+        if status != 200:
+            raise Exception(f"Failed to place trade order: {text}")
+
+        resp = json.loads(text)
+        if resp.get("Orders"):
+            order_details["OrderId"] = resp["Orders"][0].get("OrderId")
+
+        return order_details
+
+    async def list_open_positions(self) -> pd.DataFrame:
+        """
+        List all open positions.
+
+        :return: A Data Frame containing all open positions.
+        """
+        status, text = await self._request("GET", f"{self.BASE_URL_V1}/order/openpositions", headers=self.headers)
+        if status != 200:
+            raise Exception(f"Failed to retrieve open positions: {text}")
+
+        return pd.DataFrame(json.loads(text)["OpenPositions"])
+
+    async def list_active_orders(self) -> pd.DataFrame:
+        """
+        List all active orders.
+
+        :return: A Data Frame containing details of active orders.
+        """
+        request_body = {"TradingAccountId": self.trading_account_id}
+        status, text = await self._request(
+            "POST", f"{self.BASE_URL_V1}/order/activeorders", headers=self.headers, json=request_body
+        )
+        if status != 200:
+            raise Exception(f"Failed to retrieve active orders: {text}")
+
+        return convert_orders_to_dataframe(json.loads(text))
+
+    async def get_trade_history(self, from_ts: Optional[str] = None, max_results: int = 100) -> pd.DataFrame:
+        """
+        Retrieve the trade history for the account.
+
+        :param from_ts: Optional start timestamp for the history.
+        :param max_results: Maximum number of results to retrieve.
+        :return: A DataFrame containing the trade history.
+        """
+        params = {"TradingAccountId": self.trading_account_id, "maxResults": max_results}
+        if from_ts:
+            params["from"] = from_ts
+        params = {k: v for k, v in params.items() if v is not None}
+
+        status, text = await self._request("GET", f"{self.BASE_URL_V1}/order/tradehistory", headers=self.headers, params=params)
+        if status != 200:
+            raise Exception(f"Failed to retrieve trade history: {text}")
+
+        return pd.DataFrame(json.loads(text)['TradeHistory'])
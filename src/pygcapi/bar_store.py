@@ -0,0 +1,308 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from typing import Optional, List, Tuple, Callable
+
+from pygcapi.lazy import lazy_import
+from pygcapi.utils import interval_seconds
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+# Columns persisted for every bar, in addition to the bar timestamp
+BAR_COLUMNS = ["Open", "High", "Low", "Close"]
+
+# loader(market_id, num_ticks, interval, span, from_ts, to_ts) -> DataFrame in get_ohlc format
+Loader = Callable[[str, int, str, int, int, int], "pd.DataFrame"]
+
+
+def merge_ranges(ranges: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """
+    Merge inclusive (start, stop) ranges, joining ranges that overlap or touch.
+    """
+    merged: List[Tuple[int, int]] = []
+    for start, stop in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], stop))
+        else:
+            merged.append((start, stop))
+    return merged
+
+
+def missing_ranges(covered: List[Tuple[int, int]], from_ts: int, to_ts: int) -> List[Tuple[int, int]]:
+    """
+    Return the inclusive sub-ranges of [from_ts, to_ts] not contained in ``covered``.
+    """
+    gaps = []
+    cursor = from_ts
+    for start, stop in merge_ranges(covered):
+        if stop < cursor:
+            continue
+        if start > to_ts:
+            break
+        if start > cursor:
+            gaps.append((cursor, start - 1))
+        cursor = max(cursor, stop + 1)
+    if cursor <= to_ts:
+        gaps.append((cursor, to_ts))
+    return gaps
+
+
+class BarStore:
+    """
+    A persistent, SQLite-backed store of OHLC bars keyed by market, interval and span.
+
+    Each download is stored as one block of columnar NumPy buffers together with the
+    time range it covers, so a request only needs the API for the gaps that no block
+    covers yet and repeat loads are a handful of buffer reads. The still-forming last
+    bar is never persisted. Whole series are evicted least-recently-used first once
+    ``max_bytes`` is exceeded.
+    """
+
+    def __init__(self, path: str = "pygcapi_bars.sqlite", max_bytes: Optional[int] = 512 * 1024 * 1024):
+        """
+        Initialize the BarStore and create its tables if needed.
+
+        :param path: Path of the SQLite database file (":memory:" keeps it in memory).
+        :param max_bytes: Maximum total size of stored bar data in bytes (None disables eviction).
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(
+            """
+            PRAGMA journal_mode=WAL;
+            CREATE TABLE IF NOT EXISTS blocks (
+                market_id TEXT NOT NULL,
+                interval TEXT NOT NULL,
+                span INTEGER NOT NULL,
+                start INTEGER NOT NULL,
+                stop INTEGER NOT NULL,
+                rows INTEGER NOT NULL,
+                bytes INTEGER NOT NULL,
+                ts BLOB NOT NULL,
+                ohlc BLOB NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS blocks_key ON blocks (market_id, interval, span, start);
+            CREATE TABLE IF NOT EXISTS series (
+                market_id TEXT NOT NULL,
+                interval TEXT NOT NULL,
+                span INTEGER NOT NULL,
+                last_access REAL NOT NULL,
+                PRIMARY KEY (market_id, interval, span)
+            );
+            """
+        )
+
+    @staticmethod
+    def _key(market_id: str, interval: str, span: int) -> Tuple[str, str, int]:
+        return str(market_id), interval.upper(), int(span)
+
+    def coverage(self, market_id: str, interval: str, span: int) -> List[Tuple[int, int]]:
+        """
+        Return the merged (start, stop) Unix-second ranges already stored for a series.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT start, stop FROM blocks WHERE market_id=? AND interval=? AND span=?",
+                self._key(market_id, interval, span),
+            ).fetchall()
+        return merge_ranges(rows)
+
+    def missing(self, market_id: str, interval: str, span: int, from_ts: int, to_ts: int) -> List[Tuple[int, int]]:
+        """
+        Return the (start, stop) ranges of [from_ts, to_ts] that still have to be downloaded.
+        """
+        return missing_ranges(self.coverage(market_id, interval, span), int(from_ts), int(to_ts))
+
+    def load(self, market_id: str, interval: str, span: int, from_ts: int, to_ts: int) -> pd.DataFrame:
+        """
+        Load the stored bars in [from_ts, to_ts] as a DataFrame in get_ohlc format.
+        """
+        key = self._key(market_id, interval, span)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT ts, ohlc FROM blocks WHERE market_id=? AND interval=? AND span=? "
+                "AND stop >= ? AND start <= ? ORDER BY start",
+                (*key, int(from_ts), int(to_ts)),
+            ).fetchall()
+            self._touch(key)
+
+        if not rows:
+            return pd.DataFrame(columns=["Date"] + BAR_COLUMNS)
+
+        ts = np.concatenate([np.frombuffer(row[0], dtype=np.int64) for row in rows])
+        ohlc = np.concatenate([np.frombuffer(row[1], dtype=np.float64).reshape(-1, len(BAR_COLUMNS)) for row in rows])
+        in_range = (ts >= int(from_ts) * 1000) & (ts <= int(to_ts) * 1000)
+        ts, ohlc = ts[in_range], ohlc[in_range]
+
+        order = np.argsort(ts, kind="stable")
+        ts, ohlc = ts[order], ohlc[order]
+        unique = np.ones(len(ts), dtype=bool)
+        unique[1:] = ts[1:] != ts[:-1]
+        ts, ohlc = ts[unique], ohlc[unique]
+
+        df = pd.DataFrame(ohlc, columns=BAR_COLUMNS)
+        df.insert(0, "Date", pd.to_datetime(ts, unit="ms", utc=True))
+        return df
+
+    def store(self, market_id: str, interval: str, span: int, df: pd.DataFrame, from_ts: int, to_ts: int) -> None:
+        """
+        Persist the bars of ``df`` as covering [from_ts, to_ts].
+
+        Bars still forming (Date + bar length after now) are dropped and the recorded
+        coverage is clipped before the first of them, so that range is fetched again
+        later. DAY and WEEK bars start at the session open rather than on epoch
+        boundaries, so the bars' own dates are used; without a forming bar in ``df``,
+        coverage stops one bar length before now.
+        """
+        key = self._key(market_id, interval, span)
+        step_ms = interval_seconds(interval, span) * 1000
+        now_ms = int(time.time() * 1000)
+
+        if df is not None and len(df):
+            ts = df["Date"].to_numpy(dtype="datetime64[ms]").astype(np.int64)
+            ohlc = df.reindex(columns=BAR_COLUMNS).to_numpy(dtype=np.float64)
+        else:
+            ts, ohlc = np.empty(0, dtype=np.int64), np.empty((0, len(BAR_COLUMNS)), dtype=np.float64)
+        forming = ts[ts + step_ms > now_ms]
+        last_complete = int(forming.min()) // 1000 - 1 if len(forming) else (now_ms - step_ms) // 1000
+        to_ts = min(int(to_ts), last_complete)
+        if to_ts < int(from_ts):
+            return
+        keep = ts <= to_ts * 1000
+        ts, ohlc = np.ascontiguousarray(ts[keep]), np.ascontiguousarray(ohlc[keep])
+
+        ts_blob, ohlc_blob = ts.tobytes(), ohlc.tobytes()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO blocks VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (*key, int(from_ts), to_ts, len(ts), len(ts_blob) + len(ohlc_blob), ts_blob, ohlc_blob),
+            )
+            self._touch(key)
+        self.evict()
+
+    def get_bars(
+        self,
+        market_id: str,
+        interval: str,
+        span: int,
+        from_ts: int,
+        to_ts: int,
+        num_ticks: int,
+        loader: Loader,
+    ) -> pd.DataFrame:
+        """
+        Return the bars in [from_ts, to_ts], downloading only the ranges not stored yet.
+
+        Each gap is requested in windows of at most ``num_ticks`` bars; when a response
+        comes back full, coverage is recorded only up to its last bar and the rest of
+        the window is requested again.
+
+        :param market_id: The market ID.
+        :param interval: The bar interval (e.g., "MINUTE", "HOUR").
+        :param span: The span size for the given interval.
+        :param from_ts: Start Unix timestamp (seconds).
+        :param to_ts: End Unix timestamp (seconds).
+        :param num_ticks: Maximum number of bars per API request.
+        :param loader: Callable downloading bars, with get_ohlc's positional signature.
+        :return: A DataFrame with the merged bars ordered by Date.
+        """
+        step = interval_seconds(interval, span)
+        gaps = self.missing(market_id, interval, span, from_ts, to_ts)
+        if not gaps:
+            self.hits += 1
+            return self.load(market_id, interval, span, from_ts, to_ts)
+
+        self.misses += 1
+        fetched = []
+        for gap_start, gap_stop in gaps:
+            cursor = gap_start
+            while cursor <= gap_stop:
+                window_stop = min(gap_stop, cursor + num_ticks * step - 1)
+                df = loader(market_id, num_ticks, interval, span, cursor, window_stop)
+                covered_stop = window_stop
+                if len(df) >= num_ticks:
+                    last_bar = int(df["Date"].iloc[-1].timestamp())
+                    if last_bar >= cursor:
+                        covered_stop = min(window_stop, last_bar)
+                self.store(market_id, interval, span, df, cursor, covered_stop)
+                fetched.append(df)
+                cursor = covered_stop + 1
+
+        stored = self.load(market_id, interval, span, from_ts, to_ts)
+        # Bars inside the forming period are not stored, so merge them back from the download
+        recent = [df for df in fetched if len(df)]
+        if recent:
+            merged = pd.concat([stored[["Date"] + BAR_COLUMNS]] + [df.reindex(columns=["Date"] + BAR_COLUMNS) for df in recent])
+            merged = merged.drop_duplicates(subset="Date", keep="last").sort_values("Date")
+            in_range = (merged["Date"] >= pd.Timestamp(int(from_ts), unit="s", tz="UTC")) & \
+                       (merged["Date"] <= pd.Timestamp(int(to_ts), unit="s", tz="UTC"))
+            stored = merged[in_range].reset_index(drop=True)
+        return stored
+
+    def _touch(self, key: Tuple[str, str, int]) -> None:
+        self._conn.execute(
+            "INSERT INTO series VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (market_id, interval, span) DO UPDATE SET last_access=excluded.last_access",
+            (*key, time.time()),
+        )
+
+    def size(self) -> int:
+        """
+        Total bytes of stored bar data.
+        """
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(SUM(bytes), 0) FROM blocks").fetchone()[0]
+
+    def evict(self) -> int:
+        """
+        Drop least-recently-used series until the store fits within max_bytes.
+
+        :return: The number of series evicted.
+        """
+        if self.max_bytes is None:
+            return 0
+        evicted = 0
+        with self._lock, self._conn:
+            total = self._conn.execute("SELECT COALESCE(SUM(bytes), 0) FROM blocks").fetchone()[0]
+            if total <= self.max_bytes:
+                return 0
+            candidates = self._conn.execute(
+                "SELECT s.market_id, s.interval, s.span, COALESCE(SUM(b.bytes), 0) FROM series s "
+                "LEFT JOIN blocks b USING (market_id, interval, span) "
+                "GROUP BY s.market_id, s.interval, s.span ORDER BY s.last_access"
+            ).fetchall()
+            # Never evict the most recently used series, which is the one being written
+            for market_id, interval, span, nbytes in candidates[:-1]:
+                if total <= self.max_bytes:
+                    break
+                self._conn.execute("DELETE FROM blocks WHERE market_id=? AND interval=? AND span=?", (market_id, interval, span))
+                self._conn.execute("DELETE FROM series WHERE market_id=? AND interval=? AND span=?", (market_id, interval, span))
+                total -= nbytes
+                evicted += 1
+        return evicted
+
+    def invalidate(self, market_id: str, interval: Optional[str] = None, span: Optional[int] = None) -> None:
+        """
+        Remove the stored bars of a market, optionally only for one interval and span.
+        """
+        query, args = "market_id=?", [str(market_id)]
+        if interval is not None:
+            query, args = query + " AND interval=?", args + [interval.upper()]
+        if span is not None:
+            query, args = query + " AND span=?", args + [int(span)]
+        with self._lock, self._conn:
+            self._conn.execute(f"DELETE FROM blocks WHERE {query}", args)
+            self._conn.execute(f"DELETE FROM series WHERE {query}", args)
+
+    def close(self) -> None:
+        """
+        Close the database connection.
+        """
+        self._conn.close()
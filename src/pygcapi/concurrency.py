@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional, Iterable, Dict, Any
+
+from pygcapi.lazy import lazy_import
+
+# Only loaded once an asyncio client or price stream is used
+asyncio = lazy_import("asyncio")
+
+# Status codes the server uses to say it is overloaded or rate limiting us
+THROTTLE_STATUSES = (429, 503)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header, given either in seconds or as an HTTP date.
+
+    :return: The number of seconds to wait, or None if the header is missing or invalid.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return None
+
+
+class _AIMD:
+    """
+    The additive-increase/multiplicative-decrease state shared by the thread and asyncio controllers.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        backoff: float = 0.5,
+        latency_tolerance: float = 2.0,
+        smoothing: float = 0.1,
+        throttle_statuses: Iterable[int] = THROTTLE_STATUSES,
+    ):
+        """
+        :param initial_limit: Number of requests allowed in flight at first.
+        :param min_limit: Lower bound of the limit.
+        :param max_limit: Upper bound of the limit.
+        :param backoff: Factor applied to the limit on a throttle signal.
+        :param latency_tolerance: A response slower than this multiple of the average latency counts as congestion.
+        :param smoothing: Weight of a new sample in the exponential moving average of latency.
+        :param throttle_statuses: HTTP status codes treated as throttling.
+        """
+        if not 0 < backoff < 1:
+            raise ValueError("backoff must be between 0 and 1")
+        self.limit = float(min(max(initial_limit, min_limit), max_limit))
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.smoothing = smoothing
+        self.throttle_statuses = frozenset(throttle_statuses)
+
+        self.in_flight = 0
+        self.latency: Optional[float] = None
+        self.blocked_until = 0.0
+        self.requests = 0
+        self.throttled = 0
+        self.slow = 0
+        self.decreases = 0
+        self.peak_limit = self.limit
+        self._last_decrease = float("-inf")
+        self._lock = threading.Lock()
+
+    def is_throttle(self, status: Optional[int]) -> bool:
+        return status in self.throttle_statuses
+
+    def _can_start(self, now: float) -> bool:
+        return now >= self.blocked_until and self.in_flight < int(self.limit)
+
+    def _record(self, status: Optional[int], latency: Optional[float], retry_after: Optional[float]) -> None:
+        # Called with self._lock held
+        now = time.monotonic()
+        self.in_flight -= 1
+        self.requests += 1
+        if retry_after:
+            self.blocked_until = max(self.blocked_until, now + retry_after)
+
+        throttled = self.is_throttle(status)
+        slow = (
+            not throttled and latency is not None and self.latency is not None
+            and latency > self.latency * self.latency_tolerance
+        )
+        if not throttled and latency is not None:
+            self.latency = latency if self.latency is None else self.latency + self.smoothing * (latency - self.latency)
+
+        if throttled or slow:
+            self.throttled += throttled
+            self.slow += slow
+            # Requests already in flight report the same congestion; back off once per round trip
+            if now - self._last_decrease >= (self.latency or 0.0):
+                self.limit = max(float(self.min_limit), self.limit * self.backoff)
+                self._last_decrease = now
+                self.decreases += 1
+        elif status is not None and status < 500:
+            # +1 per limit's worth of healthy responses, i.e. roughly one step per round trip
+            self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+            self.peak_limit = max(self.peak_limit, self.limit)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return the current limit, the requests in flight and the throttle counters.
+        """
+        with self._lock:
+            return {
+                "limit": int(self.limit),
+                "peak_limit": int(self.peak_limit),
+                "in_flight": self.in_flight,
+                "requests": self.requests,
+                "throttled": self.throttled,
+                "slow": self.slow,
+                "decreases": self.decreases,
+                "latency": self.latency,
+                "blocked_for": max(0.0, self.blocked_until - time.monotonic()),
+            }
+
+
+class AdaptiveConcurrency(_AIMD):
+    """
+    An AIMD concurrency limit for requests sent from several threads.
+
+    Callers take a slot with acquire() before a request and hand the outcome back with
+    release(). Healthy responses raise the limit by about one per round trip; a 429/503
+    or a response much slower than the running average cuts it by ``backoff``. A
+    Retry-After value holds back every new request until it has passed. One controller
+    is meant to be shared by every client and worker talking to the same API.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self._cond = threading.Condition(self._lock)
+
+    def acquire(self) -> None:
+        """
+        Wait for a free slot under the current limit.
+        """
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                if self._can_start(now):
+                    break
+                self._cond.wait(max(0.0, self.blocked_until - now) or None)
+            self.in_flight += 1
+
+    def release(self, status: Optional[int] = None, latency: Optional[float] = None, retry_after: Optional[float] = None) -> None:
+        """
+        Give a slot back and adjust the limit from the request's outcome.
+
+        :param status: HTTP status code of the response (None if the request failed without one).
+        :param latency: Seconds the request took.
+        :param retry_after: Seconds from the response's Retry-After header, if any.
+        """
+        with self._cond:
+            self._record(status, latency, retry_after)
+            self._cond.notify_all()
+
+
+class AsyncAdaptiveConcurrency(_AIMD):
+    """
+    The asyncio counterpart of AdaptiveConcurrency, used by AsyncGCapiClient.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self._changed: Optional[asyncio.Event] = None
+
+    async def acquire(self) -> None:
+        """
+        Wait for a free slot under the current limit.
+        """
+        if self._changed is None:
+            self._changed = asyncio.Event()
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if self._can_start(now):
+                    self.in_flight += 1
+                    return
+                blocked_for = self.blocked_until - now
+            self._changed.clear()
+            if blocked_for > 0:
+                await asyncio.sleep(blocked_for)
+            else:
+                await self._changed.wait()
+
+    def release(self, status: Optional[int] = None, latency: Optional[float] = None, retry_after: Optional[float] = None) -> None:
+        """
+        Give a slot back and adjust the limit from the request's outcome.
+
+        :param status: HTTP status code of the response (None if the request failed without one).
+        :param latency: Seconds the request took.
+        :param retry_after: Seconds from the response's Retry-After header, if any.
+        """
+        with self._lock:
+            self._record(status, latency, retry_after)
+        if self._changed is not None:
+            self._changed.set()
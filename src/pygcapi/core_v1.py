@@ -1,17 +1,32 @@
-import requests
+from __future__ import annotations
+
+import functools
 import json
+import time
 from typing import Optional, Dict, Any, List, Union
-import pandas as pd
+from pygcapi.lazy import lazy_import
 from pygcapi.utils import (
-    get_instruction_status_description,
-    get_instruction_status_reason_description,
-    get_order_status_description,
-    get_order_status_reason_description,
-    get_order_action_type_description,
-    convert_to_dataframe,
     convert_orders_to_dataframe,
-    extract_every_nth
+    build_order_details
 )
+from pygcapi.transport import Transport, get_default_transport
+from pygcapi.session import SessionManager
+from pygcapi.session_store import SessionStore
+from pygcapi.rate_limit import RateLimiter
+from pygcapi.concurrency import AdaptiveConcurrency
+from pygcapi.retry import RetryManager
+from pygcapi.metrics import Metrics, NULL_CALL
+from pygcapi.events import EventBus
+from pygcapi.long_series import fetch_long_series
+from pygcapi.bar_store import BarStore
+from pygcapi.decoding import NoDataError, decode_response
+from pygcapi.records import Position, ActiveOrder, Trade, MARKET_DATA_OUTPUTS, check_output, convert_frame
+from pygcapi.streaming import PriceStream
+from pygcapi.market_cache import MarketCache
+from pygcapi.orders import OrderSpec, OrderResult, CloseSummary, TransientOrderError, submit_orders, close_positions
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
 
 class GCapiClientV1:
 
@@ -23,30 +38,104 @@ class GCapiClientV1:
     """
     BASE_URL = "https://ciapi.cityindex.com/TradingAPI"
 
-    def __init__(self, username: str, password: str, appkey: str):
+    def __init__(
+        self,
+        username: str,
+        password: str,
+        appkey: str,
+        transport: Optional[Transport] = None,
+        bar_store: Optional[BarStore] = None,
+        market_cache: Optional[MarketCache] = None,
+        session_max_age: Optional[float] = None,
+        session_refresh_margin: float = 60.0,
+        session_store: Optional[SessionStore] = None,
+        lazy_login: bool = False,
+        rate_limiter: Optional[RateLimiter] = None,
+        concurrency: Optional[AdaptiveConcurrency] = None,
+        retry: Optional[RetryManager] = None,
+        metrics: Optional[Metrics] = None,
+        events: Optional[EventBus] = None,
+    ):
         """
         Initialize the GCapiClient object and create a session.
 
         :param username: The username for the Gain Capital API.
         :param password: The password for the Gain Capital API.
         :param appkey: The application key for the Gain Capital API.
+        :param transport: Optional pooled Transport to send requests through (defaults to the shared one).
+        :param bar_store: Optional BarStore caching OHLC bars on disk between get_ohlc calls.
+        :param market_cache: Optional MarketCache for get_market_info (a private one is created by default).
+        :param session_max_age: Seconds a session stays valid; when set it is refreshed in the background before expiry.
+        :param session_refresh_margin: Seconds before expiry at which the background refresh runs.
+        :param session_store: Optional SessionStore to reuse a stored session and account IDs instead of logging in.
+        :param lazy_login: Whether to defer the login until the first request.
+        :param rate_limiter: Optional RateLimiter budgeting requests per endpoint class (can be shared between clients).
+        :param concurrency: Optional AdaptiveConcurrency adapting the number of requests in flight to server throttling.
+        :param retry: Optional RetryManager retrying failed requests and failing fast through circuit breakers.
+        :param metrics: Optional Metrics recording per-call latency, phase timings, payload sizes and row counts.
+        :param events: Optional EventBus receiving order, position and close events (a private one is created by default).
         """
         self.username = username
+        self.transport = transport or get_default_transport()
+        self.bar_store = bar_store
+        self.market_cache = market_cache if market_cache is not None else MarketCache()
         self.appkey = appkey
         self.session_id = None
         self.trading_account_id = None
+        self.client_account_id = None
+        self.session_store = session_store
+        self.rate_limiter = rate_limiter
+        self.metrics = metrics
+        self.events = events if events is not None else EventBus()
+        self.headers = {
+            'Content-Type': 'application/json',
+            'UserName': username,
+            'Session': None
+        }
 
-        headers = {'Content-Type': 'application/json'}
-        data = {
+        self._credentials = {
             "UserName": username,
             "Password": password,
             "AppKey": appkey
         }
 
-        response = requests.post(
+        self.session_manager = SessionManager(
+            self._login,
+            self.transport,
+            max_age=session_max_age,
+            refresh_margin=session_refresh_margin,
+            on_refresh=self._set_session,
+            rate_limiter=rate_limiter,
+            concurrency=concurrency,
+            retry=retry,
+        )
+
+        stored = session_store.load(username, appkey) if session_store is not None else None
+        if stored is not None and (session_max_age is None or time.time() - stored["issued_at"] < session_max_age):
+            self.trading_account_id = stored.get("trading_account_id")
+            self.client_account_id = stored.get("client_account_id")
+            self.session_manager.adopt(stored["token"], age=time.time() - stored["issued_at"], verify=self._verify_session)
+            self._set_session(stored["token"], save=False)
+        elif not lazy_login:
+            self.session_manager.refresh()
+
+    def _verify_session(self) -> None:
+        """
+        Check a restored session with a cheap GET, which logs in again if the session has expired.
+        """
+        self.session_manager.get(f"{self.BASE_URL}/UserAccount/ClientAndTradingAccount", headers=self.headers).close()
+
+    def _login(self) -> str:
+        """
+        Create a new session and return its token.
+        """
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire("account")
+        headers = {'Content-Type': 'application/json'}
+        response = self.transport.post(
             f"{self.BASE_URL}/session",
             headers=headers,
-            data=json.dumps(data)
+            data=json.dumps(self._credentials)
         )
         if response.status_code != 200:
             raise Exception(f"Failed to create session: {response.text}")
@@ -55,12 +144,41 @@ class GCapiClientV1:
         if 'Session' not in resp_data:
             raise Exception("Login failed, session not created.")
 
-        self.session_id = resp_data['Session']
+        return resp_data['Session']
+
+    def _set_session(self, session_id: str, save: bool = True) -> None:
+        self.session_id = session_id
         self.headers = {
             'Content-Type': 'application/json',
-            'UserName': username,
-            'Session': self.session_id
+            'UserName': self.username,
+            'Session': session_id
         }
+        if save:
+            self._save_session()
+
+    def _save_session(self) -> None:
+        if self.session_store is None or self.session_id is None:
+            return
+        self.session_store.save(
+            self.username,
+            self.appkey,
+            self.session_id,
+            issued_at=time.time() - (self.session_manager.age or 0.0),
+            trading_account_id=self.trading_account_id,
+            client_account_id=self.client_account_id,
+        )
+
+    def close(self) -> None:
+        """
+        Stop the background session refresh.
+        """
+        self.session_manager.close()
+
+    def _instrument(self, call: str) -> Any:
+        """
+        Return the metrics context of one call, a no-op one when metrics are disabled.
+        """
+        return self.metrics.call(call) if self.metrics is not None else NULL_CALL
 
     def get_account_info(self, key: Optional[str] = None) -> Any:
         """
@@ -69,12 +187,15 @@ class GCapiClientV1:
         :param key: Optional key to extract specific information from the account details.
         :return: Account information as a dictionary or a specific value if a key is provided.
         """
-        response = requests.get(f"{self.BASE_URL}/UserAccount/ClientAndTradingAccount", headers=self.headers)
-        if response.status_code != 200:
-            raise Exception(f"Failed to retrieve account info: {response.text}")
+        with self._instrument("get_account_info") as call:
+            response = call.send(self.session_manager.get, f"{self.BASE_URL}/UserAccount/ClientAndTradingAccount", headers=self.headers)
+            if response.status_code != 200:
+                raise Exception(f"Failed to retrieve account info: {response.text}")
 
-        account_info = response.json()
+            account_info = call.json(response)
         self.trading_account_id = account_info.get("TradingAccounts", [{}])[0].get("TradingAccountId")
+        self.client_account_id = account_info.get("TradingAccounts", [{}])[0].get("ClientAccountId")
+        self._save_session()
 
         if key:
             return account_info.get("TradingAccounts", [{}])[0].get(key)
@@ -84,27 +205,53 @@ class GCapiClientV1:
     def get_market_info(self, market_name: str, key: Optional[str] = None) -> Any:
         """
         Retrieve market information based on the market name.
+        Results are served from the market cache while they are fresh.
 
         :param market_name: The name of the market to retrieve information for.
         :param key: Optional key to extract specific information from the market details.
         :return: Market information as a dictionary or a specific value if a key is provided.
         """
-        params = {"marketName": market_name}
-        response = requests.get(f"{self.BASE_URL}/cfd/markets", headers=self.headers, params=params)
+        market = self.market_cache.get(market_name)
+        if market is None:
+            params = {"marketName": market_name}
+            with self._instrument("get_market_info") as call:
+                response = call.send(self.session_manager.get, f"{self.BASE_URL}/cfd/markets", headers=self.headers, params=params)
 
-        if response.status_code != 200:
-            raise Exception(f"Failed to retrieve market info: {response.text}")
+                if response.status_code != 200:
+                    raise Exception(f"Failed to retrieve market info: {response.text}")
+
+                markets = call.json(response).get("Markets", [])
+            if not markets:
+                raise Exception(f"No market information found for: {market_name}")
 
-        markets = response.json().get("Markets", [])
-        if not markets:
-            raise Exception(f"No market information found for: {market_name}")
+            market = markets[0]
+            self.market_cache.put(market, alias=market_name)
 
         if key:
-            return markets[0].get(key)
+            return market.get(key)
 
-        return markets[0]
+        return market
 
-    def get_prices(self, market_id: str, num_ticks: int, from_ts: int, to_ts: int, price_type: str = "MID") -> pd.DataFrame:
+    def warm_market_cache(self, search: str = "", max_results: int = 4000) -> int:
+        """
+        Load the market list in one request and store every market in the market cache.
+
+        :param search: Optional market name prefix to restrict the list.
+        :param max_results: The maximum number of markets to load.
+        :return: The number of markets cached.
+        """
+        params = {"marketName": search, "maxResults": max_results}
+        with self._instrument("warm_market_cache") as call:
+            response = call.send(self.session_manager.get, f"{self.BASE_URL}/cfd/markets", headers=self.headers, params=params)
+            if response.status_code != 200:
+                raise Exception(f"Failed to retrieve market info: {response.text}")
+
+            count = self.market_cache.put_many(call.json(response).get("Markets", []))
+        if self.market_cache.snapshot_path:
+            self.market_cache.save_snapshot()
+        return count
+
+    def get_prices(self, market_id: str, num_ticks: int, from_ts: int, to_ts: int, price_type: str = "MID", output: str = "frame") -> Union[pd.DataFrame, np.ndarray]:
         """
         Retrieve tick history (price data) for a specific market.
 
@@ -113,8 +260,11 @@ class GCapiClientV1:
         :param from_ts: Start timestamp for the data.
         :param to_ts: End timestamp for the data.
         :param price_type: The type of price data to retrieve (e.g., "MID", "BID", "ASK").
+        :param output: "frame" for a DataFrame, "records" for a NumPy structured array, "arrow" for a
+            pyarrow.RecordBatch or "polars" for a polars.DataFrame; all but "frame" skip pandas.
         :return: A DataFrame containing the price data.
         """
+        check_output(output, MARKET_DATA_OUTPUTS)
         params = {
             "fromTimeStampUTC": from_ts,
             "toTimeStampUTC": to_ts,
@@ -123,24 +273,17 @@ class GCapiClientV1:
         }
 
         url = f"{self.BASE_URL}/market/{market_id}/tickhistorybetween"
-        response = requests.get(url, headers=self.headers, params=params)
+        with self._instrument("get_prices") as call:
+            response = call.send(self.session_manager.get, url, headers=self.headers, params=params, stream=True)
 
-        if response.status_code != 200:
-            raise Exception(f"Failed to retrieve prices: {response.text}")
-
-        data = response.json()
-        price_ticks = data.get("PriceTicks", [])
-        if not price_ticks:
-            raise Exception(f"No price data found for market ID {market_id}")
+            if response.status_code != 200:
+                raise Exception(f"Failed to retrieve prices: {response.text}")
 
-        # Rename 'TickDate' to 'BarDate' so convert_to_dataframe can handle it
-        for tick in price_ticks:
-            if 'TickDate' in tick:
-                tick['BarDate'] = tick.pop('TickDate')
-
-        # Convert to DataFrame with nicely formatted date
-        df = convert_to_dataframe(price_ticks)
-        return df
+            # Decode 'PriceTicks' incrementally straight into columns with a UTC 'Date' column
+            ticks = decode_response(response, "PriceTicks", "TickDate", call=call, output=output)
+            if len(ticks) == 0:
+                raise NoDataError(f"No price data found for market ID {market_id}")
+            return ticks
 
     def get_ohlc(self, 
                  market_id: str, 
@@ -148,9 +291,11 @@ class GCapiClientV1:
                  interval: str = "HOUR", 
                  span: int = 1, 
                  from_ts: int = None, 
-                 to_ts: int = None) -> pd.DataFrame:
+                 to_ts: int = None,
+                 output: str = "frame") -> Union[pd.DataFrame, np.ndarray]:
         """
         Retrieve OHLC (Open-High-Low-Close) data for a specific market.
+        With a bar_store configured and both timestamps given, only ranges not stored yet are downloaded.
 
         :param market_id: The market ID for which OHLC data is retrieved.
         :param num_ticks: The maximum number of OHLC data points to retrieve.
@@ -158,8 +303,37 @@ class GCapiClientV1:
         :param span: The span size for the given interval.
         :param from_ts: Start timestamp for the data (optional).
         :param to_ts: End timestamp for the data (optional).
+        :param output: "frame" for a DataFrame, "records" for a NumPy structured array, "arrow" for a
+            pyarrow.RecordBatch or "polars" for a polars.DataFrame; all but "frame" skip pandas.
         :return: A DataFrame containing the OHLC data.
         """
+        check_output(output, MARKET_DATA_OUTPUTS)
+        with self._instrument("get_ohlc") as call:
+            if self.bar_store is not None and from_ts is not None and to_ts is not None:
+                loader = functools.partial(self._request_ohlc, call=call)
+                bars = self.bar_store.get_bars(market_id, interval, span, from_ts, to_ts, num_ticks, loader=loader)
+                bars = convert_frame(bars, output)
+            else:
+                bars = self._request_ohlc(market_id, num_ticks, interval, span, from_ts, to_ts, call=call, output=output)
+
+            if len(bars) == 0:
+                raise NoDataError(f"No OHLC data found for market ID {market_id}")
+            return bars
+
+    def _request_ohlc(
+        self,
+        market_id: str,
+        num_ticks: int,
+        interval: str,
+        span: int,
+        from_ts: Optional[int],
+        to_ts: Optional[int],
+        call: Any = NULL_CALL,
+        output: str = "frame",
+    ) -> Union[pd.DataFrame, np.ndarray]:
+        """
+        Download OHLC bars from the API, returning an empty result when there are none.
+        """
         params = {
             "interval": interval,
             "span": span,
@@ -169,18 +343,12 @@ class GCapiClientV1:
         }
 
         url = f"{self.BASE_URL}/market/{market_id}/barhistorybetween"
-        response = requests.get(url, headers=self.headers, params=params)
+        response = call.send(self.session_manager.get, url, headers=self.headers, params=params, stream=True)
         if response.status_code != 200:
             raise Exception(f"Failed to retrieve OHLC data: {response.text}")
 
-        data = response.json()
-        price_bars = data.get("PriceBars", [])
-        if not price_bars:
-            raise Exception(f"No OHLC data found for market ID {market_id}")
-
-        # Convert to DataFrame with nicely formatted date
-        df = convert_to_dataframe(price_bars)
-        return df
+        # Decode 'PriceBars' incrementally straight into columns with a UTC 'Date' column
+        return decode_response(response, "PriceBars", "BarDate", call=call, output=output)
 
     def trade_order(
         self,
@@ -214,106 +382,99 @@ class GCapiClientV1:
         :param tolerance: Price tolerance (optional).
         :return: API response as a dictionary.
         """
-        endpoint = "/order/newtradeorder"
-
-        # Adjust bid and offer prices based on tolerance
-        if tolerance is not None:
-            bid_price -= tolerance * 0.0001
-            offer_price += tolerance * 0.0001
-
-        order_details = {
-            "MarketId": market_id,
-            "Direction": direction,
-            "Quantity": quantity,
-            "OfferPrice": offer_price,
-            "BidPrice": bid_price,
-            "TradingAccountId": self.trading_account_id,
-            "MarketName": market_name,
-            "AutoRollover": False,
-            "IfDone": [],
-            "OcoOrder": None,
-            "Type": None,
-            "ExpiryDateTimeUTC": None,
-            "Applicability": None,
-            "TriggerPrice": trigger_price,
-            "PositionMethodId": 1,
-            "isTrade": True,
-            "ClientAccountId": self.client_account_id,
-        }
-
-        if close:
-            order_details["Close"] = {"OrderId": order_id}
-
-        if stop_loss or take_profit:
-            ifdone_order = {
-                "StopOrder": {
-                    "Price": stop_loss,
-                    "Type": "stop",
-                    "Applicability": "gtc",
-                    "StopType": "loss",
-                } if stop_loss else None,
-                "LimitOrder": {
-                    "Price": take_profit,
-                    "Type": "limit",
-                    "Applicability": "gtc",
-                } if take_profit else None,
-            }
-            order_details["IfDone"].append(ifdone_order)
-
-        body = json.dumps(order_details)
-
-        response = requests.post(
-            f"{self.BASE_URL_V1}{endpoint}",
-            headers=self.headers,
-            data=body,
+        order_details = build_order_details(
+            quantity=quantity,
+            offer_price=offer_price,
+            bid_price=bid_price,
+            direction=direction,
+            market_id=market_id,
+            market_name=market_name,
+            trading_account_id=self.trading_account_id,
+            client_account_id=self.client_account_id,
+            stop_loss=stop_loss,
+            take_profit=take_profit,
+            trigger_price=trigger_price,
+            close=close,
+            order_id=order_id,
+            tolerance=tolerance,
         )
 
-        if response.status_code != 200:
-            raise Exception(f"Failed to place trade order: {response.text}")
-
-        resp = response.json()
-        print(resp)
-        status_desc = get_instruction_status_description(resp.get("StatusReason"))
-        reason_desc = get_instruction_status_reason_description(resp.get("StatusReason"))
-        print(f"Order Status: {status_desc} - {reason_desc}")
+        resp = self._place_order(order_details)
+        self.events.emit("order_placed", response=resp, order=order_details)
 
         if "Orders" in resp:
-            order_status_desc = get_order_status_description(resp["Orders"][0].get("StatusReason"))
-            order_reason_desc = get_order_status_reason_description(resp["Orders"][0].get("StatusReason"))
-            print(f"Order Status: {order_status_desc} - {order_reason_desc}")
-
-            if "Actions" in resp and len(resp["Actions"]) != 0:
-                order_action_type = get_order_action_type_description(resp["Actions"][0].get("OrderActionTypeId"))
-                print(f"Action: {order_action_type}")
-
             order_details["OrderId"] = resp["Orders"][0].get("OrderId")
 
         return order_details
 
-    def list_open_positions(self) -> pd.DataFrame:
+    def _place_order(self, order_details: dict) -> dict:
         """
-        List all open positions.
+        POST one order body to '/order/newtradeorder' and return the API response.
+        Recorded as the 'trade_order' call, whether sent by trade_order, trade_orders or a close.
+        """
+        with self._instrument("trade_order") as call:
+            response = call.send(
+                self.session_manager.post,
+                f"{self.BASE_URL}/order/newtradeorder",
+                headers=self.headers,
+                data=json.dumps(order_details),
+            )
 
-        :return: A Data Frame containing details of open positions.
+            if response.status_code == 429 or response.status_code >= 500:
+                raise TransientOrderError(f"Failed to place trade order: {response.text}", status=response.status_code)
+            if response.status_code != 200:
+                raise Exception(f"Failed to place trade order: {response.text}")
+
+            return call.json(response)
+
+    def trade_orders(self, orders: List[OrderSpec], max_in_flight: int = 8, preserve_market_order: bool = True) -> List[OrderResult]:
         """
-        response = requests.get(f"{self.BASE_URL}/order/openpositions", headers=self.headers)
-        if response.status_code != 200:
-            raise Exception(f"Failed to retrieve open positions: {response.text}")
+        Place a batch of trade orders concurrently.
 
-        positions = response.json()
-        for position in positions.get("OpenPositions", []):
-            status_desc = get_order_status_description(position.get("Status"))
-            reason_desc = get_order_status_reason_description(position.get("StatusReason"))
-            print(f"Position ID: {position.get('PositionId')} - Status: {status_desc} - Reason: {reason_desc}")
+        :param orders: The orders to place, as OrderSpec objects.
+        :param max_in_flight: Maximum number of order requests in flight at once.
+        :param preserve_market_order: Whether orders for the same market are sent one after the other in list order.
+        :return: One OrderResult per order with timing and decoded status, in the order given.
+        """
+        return submit_orders(self._build_order, self._place_order, orders, max_in_flight, preserve_market_order)
 
-        return pd.DataFrame(positions["OpenPositions"])
+    def _build_order(self, spec: OrderSpec) -> dict:
+        return build_order_details(
+            trading_account_id=self.trading_account_id,
+            client_account_id=self.client_account_id,
+            **spec.to_kwargs(),
+        )
 
-    def list_active_orders(self) -> pd.DataFrame:
+    def list_open_positions(self, output: str = "frame") -> Union[pd.DataFrame, List[Position]]:
+        """
+        List all open positions.
+
+        :param output: "frame" for a DataFrame, "records" for a list of Position records that skips pandas.
+        :return: A Data Frame containing details of open positions.
+        """
+        check_output(output)
+        with self._instrument("list_open_positions") as call:
+            response = call.send(self.session_manager.get, f"{self.BASE_URL}/order/openpositions", headers=self.headers)
+            if response.status_code != 200:
+                raise Exception(f"Failed to retrieve open positions: {response.text}")
+
+            positions = call.json(response)
+            if self.events.wants("open_position"):
+                for position in positions.get("OpenPositions", []):
+                    self.events.emit("open_position", position=position)
+
+            if output == "records":
+                return call.frame(Position.from_api_list, positions["OpenPositions"])
+            return call.frame(pd.DataFrame, positions["OpenPositions"])
+
+    def list_active_orders(self, output: str = "frame") -> Union[pd.DataFrame, List[ActiveOrder]]:
         """
         List all active orders.
 
+        :param output: "frame" for a DataFrame, "records" for a list of ActiveOrder records that skips pandas.
         :return: A Data Frame containing details of active orders.
         """
+        check_output(output)
         url = f"{self.BASE_URL}/order/activeorders"
         
         # Create the request body
@@ -328,162 +489,171 @@ class GCapiClientV1:
             'Session': self.session_id
         }
 
-        # Perform POST request
-        response = requests.post(url, headers=headers, json=request_body)
+        with self._instrument("list_active_orders") as call:
+            # Perform POST request
+            response = call.send(self.session_manager.post, url, headers=headers, json=request_body, idempotent=True)
 
-        # Check for successful response
-        if response.status_code != 200:
-            raise Exception(f"Failed to retrieve active orders: {response.text}")
+            # Check for successful response
+            if response.status_code != 200:
+                raise Exception(f"Failed to retrieve active orders: {response.text}")
 
-        orders = response.json()
-        for order in orders.get("Orders", []):
-            status_desc = get_order_status_description(order.get("Status"))
-            reason_desc = get_order_status_reason_description(order.get("StatusReason"))
-            print(f"Order ID: {order.get('OrderId')} - Status: {status_desc} - Reason: {reason_desc}")
+            orders = call.json(response)
+            if self.events.wants("active_order"):
+                for order in orders.get("ActiveOrders", []):
+                    self.events.emit("active_order", order=order)
 
-        return convert_orders_to_dataframe(orders)
+            if output == "records":
+                return call.frame(ActiveOrder.from_api_list, orders.get("ActiveOrders", []))
+            return call.frame(convert_orders_to_dataframe, orders)
 
-    def close_all_trades(self, tolerance: float) -> List[Dict]:
+    def close_all_trades(self, tolerance: float, max_workers: int = 8, retries: int = 0) -> CloseSummary:
         """
         Close all open trades with a given price tolerance.
 
         :param tolerance: The price tolerance for closing trades.
-        :return: A list of responses from the API for each trade closure.
+        :param max_workers: Maximum number of close requests in flight at once.
+        :param retries: How many times a throttled (429) or never-sent close is sent again.
+        :return: A CloseSummary with the result and latency of each position.
         """
-        # Get all open positions
         open_positions = self.list_open_positions()
 
         if open_positions.empty:
-            print("No open positions to close.")
-            return []
-
-        close_responses = []
-
-        for _, position in open_positions.iterrows():
-            market_id = position["MarketId"]
-            market_name = position["MarketName"]
-            direction = "sell" if position["Direction"] == "buy" else "buy"
-            quantity = position["Quantity"]
-            order_id = position["OrderId"]  # Include OrderId for closing the trade
-            bid_price = position.get("Price", 0.0)  # Assuming `Price` is the current price
-            offer_price = bid_price  # Use the same price as both bid and offer initially
-
-            # Adjust bid and offer prices based on tolerance
-            if tolerance is not None:
-                bid_price -= tolerance * 0.0001
-                offer_price += tolerance * 0.0001
-
-            # Close the trade
-            try:
-                response = self.trade_order(
-                    quantity=quantity,
-                    offer_price=offer_price,
-                    bid_price=bid_price,
-                    direction=direction,
-                    market_id=market_id,
-                    market_name=market_name,
-                    close=True,
-                    order_id=order_id,  # Pass the order_id for closing the trade
-                    tolerance=tolerance,
-                )
-                close_responses.append(response)
-                print(f"Closed trade for MarketId: {market_id}, OrderId: {order_id}, Response: {response}")
-
-            except Exception as e:
-                print(f"Failed to close trade for MarketId: {market_id}, OrderId: {order_id}. Error: {str(e)}")
-
-        return close_responses
-
-
-    def close_all_trades_new(self, open_positions: List[Dict], tolerance: float) -> List[Dict]:
+            self.events.emit("no_open_positions")
+            return CloseSummary()
+
+        return self._close_positions(open_positions, tolerance, max_workers, retries)
+
+    def close_all_trades_new(self, open_positions: List[Dict], tolerance: float, max_workers: int = 8, retries: int = 0) -> CloseSummary:
         """
         Close all trades using a provided list of open positions and a given tolerance.
 
         :param open_positions: A list of open positions to close.
         :param tolerance: The price tolerance for closing trades.
-        :return: A list of responses for each closed trade.
+        :param max_workers: Maximum number of close requests in flight at once.
+        :param retries: How many times a throttled (429) or never-sent close is sent again.
+        :return: A CloseSummary with the result and latency of each position.
         """
         if not open_positions:
-            print("No open positions to close.")
-            return []
-
-        close_responses = []
-        for position in open_positions:
-            market_id = position["MarketId"]
-            direction = "sell" if position["Direction"] == "buy" else "buy"
-            quantity = position["Quantity"]
-            # Add tolerance to the price if needed
-            close_price = position.get("Price", 0.0) + tolerance
-
-            response = self.trade_order(
-                quantity=quantity,
-                direction=direction,
-                market_id=market_id,
-                price=close_price
-            )
-            close_responses.append(response)
+            self.events.emit("no_open_positions")
+            return CloseSummary()
 
-        return close_responses
+        return self._close_positions(open_positions, tolerance, max_workers, retries)
 
-    def get_trade_history(self, from_ts: Optional[str] = None, max_results: int = 100) -> pd.DataFrame:
+    def _close_positions(self, positions: Union[pd.DataFrame, List[Dict]], tolerance: float, max_workers: int, retries: int) -> CloseSummary:
+        summary = close_positions(self._build_order, self._place_order, positions, tolerance, max_workers, retries)
+        if self.events:
+            for result in summary:
+                self.events.emit("position_closed" if result.ok else "close_failed", result=result)
+        return summary
+
+    def get_trade_history(self, from_ts: Optional[str] = None, max_results: int = 100, output: str = "frame") -> Union[pd.DataFrame, List[Trade]]:
         """
         Retrieve the trade history for the account.
 
         :param from_ts: The start timestamp for retrieving trade history (optional).
         :param max_results: The maximum number of results to retrieve.
+        :param output: "frame" for a DataFrame, "records" for a list of Trade records that skips pandas.
         :return: A DataFrame containing the trade history.
         """
+        check_output(output)
  
         params = {"TradingAccountId": self.trading_account_id, "maxResults": max_results}
         if from_ts:
             params["from"] = from_ts
 
-        response = requests.get(f"{self.BASE_URL}/order/tradehistory", headers=self.headers, params=params)
-        if response.status_code != 200:
-            raise Exception(f"Failed to retrieve trade history: {response.text}")
+        with self._instrument("get_trade_history") as call:
+            response = call.send(self.session_manager.get, f"{self.BASE_URL}/order/tradehistory", headers=self.headers, params=params)
+            if response.status_code != 200:
+                raise Exception(f"Failed to retrieve trade history: {response.text}")
 
-        data=pd.DataFrame(response.json()['TradeHistory'])
-        return data
+            trades = call.json(response)['TradeHistory']
+            if output == "records":
+                return call.frame(Trade.from_api_list, trades)
+            data = call.frame(pd.DataFrame, trades)
+            return data
 
-    def get_long_series(self, market_id: str, n_months: int = 6, by_time: str = '15min', n: int = 3900, interval: str = "MINUTE", span: int = 15) -> pd.DataFrame:
-    
+    def subscribe_prices(self, market_ids: List[str], host: str, port: int, **kwargs: Any) -> PriceStream:
+        """
+        Create a real-time price subscription for a set of markets through a streaming relay.
+        The Gain Capital API does not serve this protocol: host and port must point at a relay
+        that speaks the PriceStream NDJSON protocol (or at pygcapi.testing.FakeStreamingServer).
+        Await start() on the returned stream (or use ``async with``) inside an event loop; the
+        session is resolved when the stream connects, without blocking the loop.
+
+        :param market_ids: The market IDs to stream prices for.
+        :param host: The relay host.
+        :param port: The relay port.
+        :param kwargs: Extra PriceStream options (heartbeat_timeout, max_queue, overflow, ...).
+        :return: A PriceStream delivering PriceTick objects through callbacks or ``async for``.
+        """
+        return PriceStream(host, port, market_ids, session=self.session_manager.ensure, username=self.username, **kwargs)
+
+    def get_long_series(
+        self,
+        market_id: str,
+        n_months: int = 6,
+        by_time: Optional[str] = None,
+        n: int = 3900,
+        interval: str = "MINUTE",
+        span: int = 15,
+        workers: int = 1,
+        rate_limit: Optional[float] = None,
+        allow_gaps: bool = False,
+        output: str = "frame",
+        from_ts: Optional[int] = None,
+        to_ts: Optional[int] = None,
+        calendar: Optional[Any] = None,
+        adaptive: bool = False,
+    ) -> Any:
         """
         Retrieve a long time series of OHLC data by bypassing API limitations.
         Internally uses get_ohlc to fetch data in chunks across the specified period.
+        Use pygcapi.long_series.fetch_long_series directly for per-chunk timings and failures.
 
         :param market_id: The market ID for which OHLC data is fetched.
-        :param n_months: Number of months of data to retrieve.
-        :param by_time: The frequency (interval) used to chunk data requests (e.g., '15min', '30min', etc.).
+        :param n_months: Number of months of data to retrieve, back from ``to_ts``, when ``from_ts`` is not given.
+        :param by_time: Optional frequency (e.g., '15min') to chunk requests by n steps of, as extract_every_nth does;
+            by default each request is planned to fill ``n`` bars of the given interval and span.
+            Not combinable with ``from_ts``, ``to_ts``, ``calendar`` or ``adaptive`` (raises ValueError).
         :param n: The maximum number of data points per request.
         :param interval: The interval of OHLC data (e.g., "MINUTE", "HOUR").
         :param span: The span size for the given interval.
+        :param workers: Number of chunks fetched concurrently.
+        :param rate_limit: Optional maximum number of chunk requests per second.
+        :param allow_gaps: Whether to return the data of the successful chunks when some chunks failed.
+        :param output: "frame" (pandas), "records" (NumPy structured array), "arrow" (pyarrow.Table) or "polars".
+        :param from_ts: Optional start Unix timestamp, for an arbitrary historical window.
+        :param to_ts: Optional end Unix timestamp (defaults to now).
+        :param calendar: Optional TradingCalendar or MarketCalendars (e.g., pygcapi.trading_calendar.FX_CALENDAR);
+            requests then skip the market's closed periods.
+        :param adaptive: Whether to size each wave of requests from the bar density of the previous one,
+            growing sparse requests and shrinking ones that hit ``n``.
         :return: A concatenated DataFrame of all the OHLC data retrieved.
         """
-        time_intervals = extract_every_nth(n_months=n_months, by_time=by_time, n=n)
-        long_series = []
-
-        for start_ts, stop_ts in time_intervals:
-            # Use the get_ohlc method to fetch data for each chunk
-            try:
-                ohlc_df = self.get_ohlc(
-                    market_id=market_id,
-                    num_ticks=n,
-                    interval=interval,
-                    span=span,
-                    from_ts=start_ts,
-                    to_ts=stop_ts
-                )
-                long_series.append(ohlc_df)
-            except Exception as e:
-                print(f"Failed to retrieve OHLC data for interval {start_ts} - {stop_ts}: {e}")
-                continue
-
-        # Concatenate all DataFrames if we have data
-        if long_series:
-            df = pd.concat(long_series, ignore_index=True)
-            # Remove duplicates if any and sort by BarDate
-            df = df.drop_duplicates().reset_index(drop=True)
-            return df
-        else:
-            print("No data was retrieved.")
-            return pd.DataFrame()
+        result = fetch_long_series(
+            self,
+            market_id=market_id,
+            n_months=n_months,
+            by_time=by_time,
+            n=n,
+            interval=interval,
+            span=span,
+            workers=workers,
+            rate_limit=rate_limit,
+            output=check_output(output, MARKET_DATA_OUTPUTS),
+            from_ts=from_ts,
+            to_ts=to_ts,
+            calendar=calendar,
+            adaptive=adaptive,
+        )
+        if calendar is not None:
+            self.events.emit("series_planned", market_id=market_id, requests=len(result.chunks), saved=result.requests_saved)
+        for chunk in result.failures:
+            self.events.emit("chunk_failed", market_id=market_id, chunk=chunk)
+        if result.failures and not allow_gaps:
+            first = result.failures[0]
+            raise Exception(
+                f"Failed to retrieve {len(result.failures)} of {len(result.chunks)} chunks, "
+                f"first {first.start}-{first.stop}: {first.error}"
+            )
+        return result.data
@@ -0,0 +1,276 @@
+from __future__ import annotations
+
+import json
+import time
+from typing import Optional, Dict, List, Iterable, Any
+
+from pygcapi.lazy import lazy_import
+from pygcapi.utils import parse_dotnet_millis
+from pygcapi import arrow
+
+try:
+    import orjson
+
+    loads = orjson.loads
+    JSON_BACKEND = "orjson"
+except ImportError:  # pragma: no cover - depends on the optional backend
+    loads = json.loads
+    JSON_BACKEND = "json"
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+# Bytes read from the response per step when streaming
+CHUNK_SIZE = 64 * 1024
+
+
+class NoDataError(Exception):
+    """
+    Raised by get_prices and get_ohlc when the requested range holds no ticks or bars.
+    """
+
+
+class RecordArrayDecoder:
+    """
+    Incrementally decode one array of flat JSON objects (e.g. "PriceBars") into columns.
+
+    Feed raw response bytes with feed(); complete records are parsed in batches with
+    the fastest available JSON backend and appended to per-column NumPy arrays, so
+    neither the raw payload nor a full tree of Python dicts is ever held at once.
+    The '/Date(...)/' field is converted to epoch milliseconds as it arrives.
+
+    The records must be flat objects whose string values contain no braces, which
+    holds for the PriceBars and PriceTicks payloads.
+    """
+
+    def __init__(self, key: str, date_field: str):
+        """
+        Initialize the decoder.
+
+        :param key: The top-level key of the array to decode (e.g., "PriceBars").
+        :param date_field: The '/Date(...)/' field of each record (e.g., "BarDate").
+        """
+        self.key = key
+        self.date_field = date_field
+        self.rows = 0
+        self.done = False
+        self._marker = f'"{key}"'.encode()
+        self._buffer = b""
+        self._in_array = False
+        self._columns: Dict[str, List[np.ndarray]] = {}
+
+    def feed(self, chunk: bytes) -> None:
+        """
+        Consume the next chunk of the response body.
+        """
+        if self.done or not chunk:
+            return
+        self._buffer += chunk
+
+        if not self._in_array:
+            pos = self._buffer.find(self._marker)
+            if pos < 0:
+                # Keep just enough bytes to match a marker split across chunks
+                self._buffer = self._buffer[-len(self._marker):]
+                return
+            after = self._buffer[pos + len(self._marker):].lstrip()
+            if after and not after.startswith(b":"):
+                # The key appeared as a value rather than as an object key
+                self._buffer = after
+                return
+            after = after[1:].lstrip()
+            if not after:
+                # Wait for the bytes following the key
+                self._buffer = self._buffer[pos:]
+                return
+            if not after.startswith(b"["):
+                # null or any non-array value means there are no records
+                self.done = True
+                self._buffer = b""
+                return
+            self._in_array = True
+            self._buffer = after[1:]
+
+        end = self._buffer.rfind(b"}")
+        closing = self._buffer.find(b"]")
+        if closing >= 0 and (end < 0 or closing < end):
+            self._parse_batch(self._buffer[:closing])
+            self.done = True
+            self._buffer = b""
+            return
+        if end < 0:
+            return
+        self._parse_batch(self._buffer[:end + 1])
+        self._buffer = self._buffer[end + 1:]
+
+    def _parse_batch(self, body: bytes) -> None:
+        body = body.strip().strip(b",")
+        if not body:
+            return
+        records = loads(b"[" + body + b"]")
+        if not records:
+            return
+
+        n = len(records)
+        names = list(records[0].keys())
+        for record in records:
+            if len(record) != len(names):
+                names = list(dict.fromkeys(name for record in records for name in record))
+                break
+
+        for name in names:
+            values = [record.get(name) for record in records]
+            if name == self.date_field:
+                array = parse_dotnet_millis(values)
+            else:
+                array = np.array(values)
+                if array.dtype.kind not in "biuf":
+                    # Nulls give an object array: numeric columns then become float64 with NaN, like pandas does
+                    try:
+                        array = np.array(values, dtype=np.float64)
+                    except (TypeError, ValueError):
+                        array = np.array(values, dtype=object)
+            if name not in self._columns:
+                # Back-fill a column that first appears after earlier batches
+                self._columns[name] = [np.full(self.rows, np.nan)] if self.rows else []
+            self._columns[name].append(array)
+
+        for name, parts in self._columns.items():
+            if name not in names:
+                parts.append(np.full(n, np.nan))
+        self.rows += n
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """
+        Return the decoded columns, concatenating the per-batch arrays.
+        """
+        return {
+            name: parts[0] if len(parts) == 1 else np.concatenate(parts)
+            for name, parts in self._columns.items()
+        }
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """
+        Build a DataFrame in convert_to_dataframe's format (UTC 'Date' column first).
+        """
+        columns = self.columns()
+        self._columns = {}
+        if not columns:
+            return pd.DataFrame()
+
+        millis = columns.pop(self.date_field, None)
+        df = pd.DataFrame(columns, copy=False)
+        if millis is not None:
+            df.insert(0, "Date", pd.DatetimeIndex(millis.view("datetime64[ms]")).tz_localize("UTC"))
+        return df
+
+    def to_array(self) -> np.ndarray:
+        """
+        Build a NumPy structured array with a 'Date' field (datetime64[ms], UTC) first.
+
+        Skips pandas entirely; records.to_dataframe() turns the array into the
+        DataFrame to_dataframe() would have returned.
+        """
+        columns = self.columns()
+        self._columns = {}
+        millis = columns.pop(self.date_field, None)
+        if millis is None:
+            millis = np.empty(0, dtype=np.int64)
+        dtype = [("Date", "datetime64[ms]")] + [(name, array.dtype) for name, array in columns.items()]
+        records = np.empty(len(millis), dtype=dtype)
+        records["Date"] = millis.view("datetime64[ms]")
+        for name, array in columns.items():
+            records[name] = array
+        return records
+
+    def to_arrow(self) -> Any:
+        """
+        Build a pyarrow.RecordBatch with a 'Date' column of type timestamp[ms, tz=UTC] first, without pandas.
+        """
+        columns = self.columns()
+        self._columns = {}
+        millis = columns.pop(self.date_field, None)
+        return arrow.record_batch(millis, columns)
+
+    def result(self, output: str = "frame") -> Any:
+        """
+        Return the decoded records in the given output format.
+
+        :param output: "frame" (pandas DataFrame), "records" (NumPy structured array),
+            "arrow" (pyarrow.RecordBatch) or "polars" (polars.DataFrame over the Arrow data).
+        """
+        if output == "frame":
+            return self.to_dataframe()
+        if output == "records":
+            return self.to_array()
+        batch = self.to_arrow()
+        return arrow.to_polars(batch) if output == "polars" else batch
+
+
+def decode_records(chunks: Iterable[bytes], key: str, date_field: str, output: str = "frame") -> Any:
+    """
+    Stream an iterable of byte chunks through a RecordArrayDecoder.
+
+    :param chunks: The response body as an iterable of byte chunks.
+    :param key: The top-level key of the array to decode (e.g., "PriceBars").
+    :param date_field: The '/Date(...)/' field of each record (e.g., "BarDate").
+    :param output: "frame", "records", "arrow" or "polars" (see RecordArrayDecoder.result).
+    :return: The records with a UTC 'Date' column first, empty when there are none.
+    """
+    decoder = RecordArrayDecoder(key, date_field)
+    for chunk in chunks:
+        decoder.feed(chunk)
+    return decoder.result(output)
+
+
+def decode_response(
+    response: Any,
+    key: str,
+    date_field: str,
+    chunk_size: int = CHUNK_SIZE,
+    call: Any = None,
+    output: str = "frame",
+) -> Any:
+    """
+    Decode a streamed requests.Response holding a PriceBars/PriceTicks payload.
+
+    :param response: A response obtained with ``stream=True``.
+    :param key: The top-level key of the array to decode (e.g., "PriceBars").
+    :param date_field: The '/Date(...)/' field of each record (e.g., "BarDate").
+    :param chunk_size: Number of bytes read per step.
+    :param call: Optional CallMetrics receiving the read, decode and DataFrame times, the size and the rows.
+    :param output: "frame", "records", "arrow" or "polars" (see RecordArrayDecoder.result).
+    :return: The records with a UTC 'Date' column first, empty when there are none.
+    """
+    try:
+        if not call:
+            return decode_records(response.iter_content(chunk_size=chunk_size), key, date_field, output)
+        return _decode_timed(response.iter_content(chunk_size=chunk_size), key, date_field, call, output)
+    finally:
+        response.close()
+
+
+def _decode_timed(chunks: Iterable[bytes], key: str, date_field: str, call: Any, output: str) -> Any:
+    # Reading and parsing are interleaved, so time each step to split network from decode time
+    decoder = RecordArrayDecoder(key, date_field)
+    chunks = iter(chunks)
+    read = decode = 0.0
+    size = 0
+    clock = time.perf_counter
+    while True:
+        started = clock()
+        chunk = next(chunks, None)
+        fed = clock()
+        read += fed - started
+        if chunk is None:
+            break
+        size += len(chunk)
+        decoder.feed(chunk)
+        decode += clock() - fed
+
+    call.add("network_seconds", read)
+    call.add("decode_seconds", decode)
+    call.add("response_bytes", size)
+    result = call.timed("frame", decoder.result, output)
+    call.add("rows", len(result))
+    return result
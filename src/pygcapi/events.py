@@ -0,0 +1,193 @@
+import logging
+from typing import Optional, Dict, Any, Callable, Iterable, Tuple, FrozenSet
+
+from pygcapi.utils import get_order_status_description, get_order_status_reason_description
+from pygcapi.orders import decode_order_response
+
+logger = logging.getLogger("pygcapi")
+
+Listener = Callable[["Event"], None]
+
+
+def _format_order_placed(data: Dict[str, Any]) -> str:
+    resp = data["response"]
+    decoded = decode_order_response(resp)
+    lines = [str(resp), f"Order Status: {decoded['status']} - {decoded['reason']}"]
+    if resp.get("Orders"):
+        lines.append(f"Order Status: {decoded['order_status']} - {decoded['order_reason']}")
+        if decoded["action"] is not None:
+            lines.append(f"Action: {decoded['action']}")
+    return "\n".join(lines)
+
+
+def _format_open_position(data: Dict[str, Any]) -> str:
+    position = data["position"]
+    status_desc = get_order_status_description(position.get("Status"))
+    reason_desc = get_order_status_reason_description(position.get("StatusReason"))
+    return f"Position ID: {position.get('PositionId')} - Status: {status_desc} - Reason: {reason_desc}"
+
+
+def _format_active_order(data: Dict[str, Any]) -> str:
+    # Active orders nest their order fields under 'TradeOrder'
+    order = data["order"].get("TradeOrder") or data["order"]
+    status_desc = get_order_status_description(order.get("Status"))
+    reason_desc = get_order_status_reason_description(order.get("StatusReason"))
+    return f"Order ID: {order.get('OrderId')} - Status: {status_desc} - Reason: {reason_desc}"
+
+
+def _format_position_closed(data: Dict[str, Any]) -> str:
+    result = data["result"]
+    return f"Closed trade for MarketId: {result.spec.market_id}, OrderId: {result.spec.order_id}, Response: {result.response}"
+
+
+def _format_close_failed(data: Dict[str, Any]) -> str:
+    result = data["result"]
+    return f"Failed to close trade for MarketId: {result.spec.market_id}, OrderId: {result.spec.order_id}. Error: {result.error}"
+
+
+def _format_chunk_failed(data: Dict[str, Any]) -> str:
+    chunk = data["chunk"]
+    return f"Failed to retrieve chunk {chunk.start}-{chunk.stop} of market ID {data['market_id']}: {chunk.error}"
+
+
+# Message builders per event name, only run when a listener asks for the message
+FORMATTERS: Dict[str, Callable[[Dict[str, Any]], str]] = {
+    "order_placed": _format_order_placed,
+    "open_position": _format_open_position,
+    "active_order": _format_active_order,
+    "no_open_positions": lambda data: "No open positions to close.",
+    "position_closed": _format_position_closed,
+    "close_failed": _format_close_failed,
+    "chunk_failed": _format_chunk_failed,
+    "series_planned": lambda data: (
+        f"Planned {data['requests']} requests for market ID {data['market_id']}, "
+        f"{data['saved']} saved by skipping closed sessions"
+    ),
+}
+
+
+class Event:
+    """
+    A structured client event.
+
+    ``data`` holds the raw objects (API responses, positions, OrderResults, ...); the
+    human-readable ``message``, including any status code lookups, is only built when
+    it is read, e.g. by a LoggingListener whose logger is enabled.
+    """
+
+    __slots__ = ("name", "data")
+
+    def __init__(self, name: str, data: Dict[str, Any]):
+        """
+        :param name: The event name (e.g., "order_placed", "open_position").
+        :param data: The event payload.
+        """
+        self.name = name
+        self.data = data
+
+    @property
+    def message(self) -> str:
+        formatter = FORMATTERS.get(self.name)
+        return formatter(self.data) if formatter is not None else f"{self.name}: {self.data}"
+
+    def __str__(self) -> str:
+        return self.message
+
+    def __repr__(self) -> str:
+        return f"Event({self.name!r}, {self.data!r})"
+
+
+class EventBus:
+    """
+    Delivers client events to subscribed listeners.
+
+    Emitting is free when nobody listens: clients check wants() before building the
+    payload of per-row events, and emit() returns before creating an Event when no
+    listener is subscribed to the name. Listeners are called synchronously in the
+    emitting thread; an exception raised by a listener is logged and never reaches
+    the API call that emitted the event.
+    """
+
+    def __init__(self):
+        self._listeners: Tuple[Tuple[Listener, Optional[FrozenSet[str]]], ...] = ()
+        self._all = False
+        self._names: FrozenSet[str] = frozenset()
+
+    def subscribe(self, listener: Listener, names: Optional[Iterable[str]] = None) -> Listener:
+        """
+        Call ``listener`` with every event, or only with the events in ``names``.
+
+        :param listener: A callable receiving an Event.
+        :param names: Optional event names to restrict the subscription to.
+        :return: The listener, so that subscribe() can be used as a decorator.
+        """
+        self._listeners += ((listener, frozenset(names) if names is not None else None),)
+        self._update()
+        return listener
+
+    def unsubscribe(self, listener: Listener) -> None:
+        """
+        Remove every subscription of ``listener``.
+        """
+        self._listeners = tuple(entry for entry in self._listeners if entry[0] != listener)
+        self._update()
+
+    def _update(self) -> None:
+        self._all = any(names is None for _, names in self._listeners)
+        self._names = frozenset(name for _, names in self._listeners if names is not None for name in names)
+
+    def wants(self, name: str) -> bool:
+        """
+        Whether any listener would receive an event called ``name``.
+        """
+        return self._all or name in self._names
+
+    def __bool__(self) -> bool:
+        return bool(self._listeners)
+
+    def emit(self, name: str, **data: Any) -> None:
+        """
+        Send an event to the listeners subscribed to ``name``.
+
+        :param name: The event name.
+        :param data: The event payload.
+        """
+        if not self._all and name not in self._names:
+            return
+        event = Event(name, data)
+        for listener, names in self._listeners:
+            if names is None or name in names:
+                try:
+                    listener(event)
+                except Exception:
+                    logger.exception("Event listener %r failed on %s", listener, name)
+
+
+class LoggingListener:
+    """
+    An EventBus listener writing events to a logging.Logger.
+
+    Messages are passed to the logger as arguments, so nothing is formatted unless
+    the record is actually emitted. The event name and payload are attached to each
+    record as ``event`` and ``event_data``.
+    """
+
+    # Events logged above the default level
+    LEVELS = {"close_failed": logging.WARNING, "chunk_failed": logging.WARNING}
+
+    def __init__(self, logger: Optional[logging.Logger] = None, level: int = logging.INFO, levels: Optional[Dict[str, int]] = None):
+        """
+        Initialize the LoggingListener.
+
+        :param logger: The logger to write to (defaults to the "pygcapi" logger).
+        :param level: The level of events without an entry in ``levels``.
+        :param levels: Optional level per event name, overriding LEVELS.
+        """
+        self.logger = logger if logger is not None else logging.getLogger("pygcapi")
+        self.level = level
+        self.levels = {**self.LEVELS, **(levels or {})}
+
+    def __call__(self, event: Event) -> None:
+        level = self.levels.get(event.name, self.level)
+        if self.logger.isEnabledFor(level):
+            self.logger.log(level, "%s", event, extra={"event": event.name, "event_data": event.data})
@@ -0,0 +1,57 @@
+import importlib
+import threading
+from types import ModuleType
+from typing import Optional, Any
+
+
+class LazyModule:
+    """
+    A stand-in for a module that is only imported when one of its attributes is first used.
+
+    ``pd = lazy_import("pandas")`` at the top of a module keeps ``pd.DataFrame(...)``
+    working in function bodies while ``import pygcapi.core_v2`` no longer pays for
+    pandas; scripts that only place orders never load it. The first attribute
+    access imports the module (under a lock, so concurrent first uses from worker
+    threads import it once) and later accesses are plain getattr calls on it.
+    """
+
+    __slots__ = ("_name", "_module", "_lock")
+
+    def __init__(self, name: str):
+        """
+        :param name: The absolute module name (e.g., "pandas").
+        """
+        self._name = name
+        self._module: Optional[ModuleType] = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> ModuleType:
+        with self._lock:
+            if self._module is None:
+                self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr: str) -> Any:
+        module = self._module if self._module is not None else self._load()
+        return getattr(module, attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module {self._name!r} ({state})>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    """
+    Return a LazyModule for ``name``, to be bound to the usual alias at module level.
+
+    Modules using it must not touch the alias at import time: annotations are kept
+    unevaluated with ``from __future__ import annotations`` and module constants are
+    written without it.
+
+    :param name: The absolute module name.
+    :return: The lazy stand-in.
+    """
+    return LazyModule(name)
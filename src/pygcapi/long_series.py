@@ -0,0 +1,281 @@
+from __future__ import annotations
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Optional, List, Tuple, Any
+
+from pygcapi.lazy import lazy_import
+from pygcapi.utils import extract_every_nth, plan_intervals, shift_months, interval_seconds
+from pygcapi.rate_limit import TokenBucket
+from pygcapi.records import concat_arrays, date_bounds
+from pygcapi.decoding import NoDataError
+from pygcapi import arrow
+
+pd = lazy_import("pandas")
+
+# Adaptive chunks are sized to fill this share of maxResults, growing by at most MAX_GROWTH per wave
+TARGET_FILL = 0.9
+MAX_GROWTH = 4.0
+
+
+@dataclass
+class ChunkResult:
+    """
+    The outcome of fetching one chunk of a long OHLC series.
+    """
+    start: int
+    stop: int
+    rows: int = 0
+    elapsed: float = 0.0
+    error: Optional[str] = None
+    # Share of the request's maxResults the chunk returned
+    fill: float = 0.0
+    # Whether the chunk came back at maxResults, so bars past the cap may have been cut off
+    capped: bool = False
+    # Whether the chunk was requested to complete a capped chunk
+    follow_up: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class LongSeriesResult:
+    """
+    A long OHLC series together with per-chunk timings and failures.
+    """
+    # A pandas DataFrame, or the structure requested with fetch_long_series' output
+    data: Any
+    chunks: List[ChunkResult] = field(default_factory=list)
+    elapsed: float = 0.0
+    workers: int = 1
+    # Requests avoided compared with a continuous plan of n-bar chunks, by skipping the closed
+    # periods of a trading calendar or, with adaptive chunking, by sizing chunks from their fill
+    # (negative when follow-ups of capped chunks outnumber the savings)
+    requests_saved: int = 0
+
+    @property
+    def failures(self) -> List[ChunkResult]:
+        return [chunk for chunk in self.chunks if not chunk.ok]
+
+    @property
+    def ok(self) -> bool:
+        return not self.failures
+
+    @property
+    def fill_ratios(self) -> List[float]:
+        """
+        The fill ratio (rows / maxResults) of every successful chunk, in time order.
+        """
+        return [chunk.fill for chunk in self.chunks if chunk.ok]
+
+    def summary(self) -> dict:
+        """
+        Summarize the fetch as a dictionary of counts and timings.
+        """
+        timings = [chunk.elapsed for chunk in self.chunks]
+        fills = self.fill_ratios
+        return {
+            "chunks": len(self.chunks),
+            "failed": len(self.failures),
+            "rows": len(self.data),
+            "workers": self.workers,
+            "requests_saved": self.requests_saved,
+            "capped": sum(chunk.capped for chunk in self.chunks),
+            "follow_ups": sum(chunk.follow_up for chunk in self.chunks),
+            "fill_mean": sum(fills) / len(fills) if fills else 0.0,
+            "fill_min": min(fills, default=0.0),
+            "elapsed": self.elapsed,
+            "chunk_mean": sum(timings) / len(timings) if timings else 0.0,
+            "chunk_max": max(timings, default=0.0),
+        }
+
+
+def fetch_long_series(
+    client: Any,
+    market_id: str,
+    n_months: int = 6,
+    by_time: Optional[str] = None,
+    n: int = 3900,
+    interval: str = "MINUTE",
+    span: int = 15,
+    workers: int = 1,
+    rate_limit: Optional[float] = None,
+    time_intervals: Optional[List[Tuple[int, int]]] = None,
+    output: str = "frame",
+    from_ts: Optional[int] = None,
+    to_ts: Optional[int] = None,
+    calendar: Optional[Any] = None,
+    adaptive: bool = False,
+) -> LongSeriesResult:
+    """
+    Fetch a long OHLC series in chunks, optionally in parallel, and report per-chunk outcomes.
+
+    A chunk that comes back with ``n`` rows may have been cut off at maxResults, so
+    the parts of its range outside the bars it returned are fetched as follow-up
+    chunks (themselves completed the same way) until no chunk is capped. Chunks
+    whose range holds no bars (NoDataError) are empty rather than failed.
+
+    With ``adaptive``, chunks are planned in waves of ``workers`` from the bar
+    density of the previous wave: sparse chunks (e.g., over closed periods) make the
+    next ones longer and overflowing ones make them shorter, aiming at TARGET_FILL.
+
+    :param client: A GCapiClientV1 or GCapiClientV2 instance (anything with a get_ohlc method).
+    :param market_id: The market ID for which OHLC data is fetched.
+    :param n_months: Number of months of data to retrieve, back from ``to_ts``, when ``from_ts`` is not given.
+    :param by_time: Optional frequency (e.g., '15min') to chunk requests by n steps of, as extract_every_nth does;
+        by default chunks are planned with plan_intervals so that each one fills ``n`` bars.
+        Not combinable with ``from_ts``, ``to_ts``, ``calendar`` or ``adaptive``.
+    :param n: The maximum number of data points per request.
+    :param interval: The interval of OHLC data (e.g., "MINUTE", "HOUR").
+    :param span: The span size for the given interval.
+    :param workers: Number of chunks fetched concurrently.
+    :param rate_limit: Optional maximum number of chunk requests per second across all workers.
+    :param time_intervals: Optional explicit (start, stop) chunk boundaries, overriding the planned ones.
+    :param output: "frame" (pandas), "records" (NumPy structured array), "arrow" (pyarrow.Table) or "polars".
+    :param from_ts: Optional start Unix timestamp of the series (defaults to ``n_months`` before ``to_ts``).
+    :param to_ts: Optional end Unix timestamp of the series (defaults to now).
+    :param calendar: Optional TradingCalendar or MarketCalendars; planned chunks then skip the market's closed periods.
+    :param adaptive: Whether to size planned chunks from the fill of the previous ones instead of planning them upfront.
+    :return: A LongSeriesResult with the concatenated data ordered by time and one ChunkResult per chunk.
+    :raises ValueError: If ``by_time`` is combined with an explicit window, a calendar or ``adaptive``.
+    """
+    if by_time is not None and (from_ts is not None or to_ts is not None or calendar is not None or adaptive):
+        raise ValueError("by_time chunks the last n_months; it cannot be combined with from_ts, to_ts, calendar or adaptive")
+    requests_saved = 0
+    if time_intervals is None and by_time is not None:
+        time_intervals = extract_every_nth(n_months=n_months, by_time=by_time, n=n)
+    elif time_intervals is None:
+        to_ts = int(time.time()) if to_ts is None else to_ts
+        from_ts = shift_months(to_ts, -n_months) if from_ts is None else from_ts
+    if time_intervals is None and not adaptive:
+        time_intervals = plan_intervals(from_ts, to_ts, interval, span, max_results=n)
+        if calendar is not None:
+            continuous = len(time_intervals)
+            time_intervals = plan_intervals(from_ts, to_ts, interval, span, max_results=n, calendar=calendar.for_market(market_id))
+            requests_saved = continuous - len(time_intervals)
+    limiter = TokenBucket(rate_limit, capacity=1) if rate_limit else None
+    # Only pass output on to clients when it differs from get_ohlc's default
+    extra = {"output": "arrow" if output == "polars" else output} if output != "frame" else {}
+
+    width = interval_seconds(interval, span)
+
+    def fetch(bounds: Tuple[int, int], follow_up: bool = False) -> Tuple[ChunkResult, Any]:
+        start_ts, stop_ts = bounds
+        if limiter is not None:
+            limiter.acquire()
+        started = time.perf_counter()
+        try:
+            ohlc_df = client.get_ohlc(
+                market_id=market_id,
+                num_ticks=n,
+                interval=interval,
+                span=span,
+                from_ts=start_ts,
+                to_ts=stop_ts,
+                **extra
+            )
+        except NoDataError:
+            # A range without bars (e.g., a weekend) is an empty chunk, not a gap
+            return ChunkResult(start_ts, stop_ts, elapsed=time.perf_counter() - started, follow_up=follow_up), None
+        except Exception as e:
+            return ChunkResult(start_ts, stop_ts, elapsed=time.perf_counter() - started, error=str(e), follow_up=follow_up), None
+        rows = len(ohlc_df)
+        return ChunkResult(
+            start_ts, stop_ts, rows=rows, elapsed=time.perf_counter() - started,
+            fill=rows / n, capped=rows >= n, follow_up=follow_up,
+        ), ohlc_df
+
+    def remainders(chunk: ChunkResult, data: Any, lo: int, hi: int) -> List[Tuple[int, int]]:
+        # The parts of a capped chunk's range before and after the bars it returned, within [lo, hi]
+        first, last = (millis // 1000 for millis in date_bounds(data))
+        start_ts, stop_ts = max(chunk.start, lo), min(chunk.stop, hi)
+        return [(a, b) for a, b in ((start_ts, first - 1), (last + 1, stop_ts)) if b - a + 1 >= width]
+
+    def fetch_complete(intervals: List[Tuple[int, int]]) -> List[Tuple[ChunkResult, Any]]:
+        # Fetch the chunks, then the rest of every capped chunk not covered by its neighbours
+        ordered = sorted(intervals)
+        jobs = [
+            (bounds, False, ordered[i - 1][1] + 1 if i else bounds[0], ordered[i + 1][0] - 1 if i + 1 < len(ordered) else bounds[1])
+            for i, bounds in enumerate(ordered)
+        ]
+        outcomes = []
+        while jobs:
+            if pool is not None and len(jobs) > 1:
+                results = list(pool.map(lambda job: fetch(job[0], job[1]), jobs))
+            else:
+                results = [fetch(bounds, follow_up) for bounds, follow_up, _, _ in jobs]
+            next_jobs = []
+            for (_, _, lo, hi), (chunk, data) in zip(jobs, results):
+                outcomes.append((chunk, data))
+                if chunk.capped:
+                    next_jobs += [(rest, True) + rest for rest in remainders(chunk, data, lo, hi)]
+            jobs = next_jobs
+        return outcomes
+
+    def fetch_adaptive() -> List[Tuple[ChunkResult, Any]]:
+        market_calendar = calendar.for_market(market_id) if calendar is not None else None
+        outcomes = []
+        length = n * width
+        cursor = from_ts
+        while cursor <= to_ts:
+            if market_calendar is not None:
+                periods = market_calendar.open_intervals(cursor, to_ts)
+                if not periods:
+                    break
+                # Skip to the first bar that can overlap the next open period
+                cursor = max(cursor, periods[0][0] - width + 1)
+            wave = []
+            while len(wave) < max(workers, 1) and cursor <= to_ts:
+                wave.append((cursor, min(cursor + length - 1, to_ts)))
+                cursor = wave[-1][1] + 1
+            results = fetch_complete(wave)
+            outcomes += results
+            # Bars per second over the wave, follow-ups included, sizes the next chunks
+            rows = sum(chunk.rows for chunk, _ in results)
+            seconds = sum(stop_ts - start_ts + 1 for start_ts, stop_ts in wave)
+            sized = int(TARGET_FILL * n * seconds / rows) if rows else length * MAX_GROWTH
+            length = int(min(max(sized, width), length * MAX_GROWTH))
+        return outcomes
+
+    started = time.perf_counter()
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pygcapi-chunk") if workers > 1 else None
+    try:
+        if time_intervals is not None:
+            outcomes = fetch_complete(time_intervals)
+        else:
+            outcomes = fetch_adaptive()
+            requests_saved = len(plan_intervals(from_ts, to_ts, interval, span, max_results=n)) - len(outcomes)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    outcomes.sort(key=lambda outcome: (outcome[0].start, outcome[0].stop))
+    # Follow-ups may start inside the chunk they complete, so order the data by its first bar
+    parts = sorted(
+        (df for _, df in outcomes if df is not None and len(df)),
+        key=lambda df: date_bounds(df)[0],
+    )
+    frames = parts or [df for _, df in outcomes if df is not None]
+    if output in ("arrow", "polars"):
+        data = arrow.concat_batches(frames)
+        if output == "polars":
+            data = arrow.to_polars(data)
+    elif output == "records":
+        data = concat_arrays(frames)
+    elif frames:
+        data = pd.concat(frames, ignore_index=True)
+        # Chunks share their boundary timestamp, so drop the overlapping rows
+        data = data.drop_duplicates().reset_index(drop=True)
+    else:
+        data = pd.DataFrame()
+
+    return LongSeriesResult(
+        data=data,
+        chunks=[chunk for chunk, _ in outcomes],
+        elapsed=time.perf_counter() - started,
+        workers=workers,
+        requests_saved=requests_saved,
+    )
@@ -0,0 +1,179 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Iterable, Tuple, Set
+
+
+class MarketCache:
+    """
+    An in-process cache of market metadata keyed by market name and MarketId.
+
+    Entries expire after ``ttl`` seconds and the least recently used markets are
+    evicted beyond ``max_size``. The whole market list can be loaded at once with
+    put_many(), and the cache can be saved to and restored from a JSON snapshot on
+    disk for fast cold starts. Hits, misses and evictions are counted.
+    """
+
+    def __init__(self, ttl: float = 300.0, max_size: int = 4096, snapshot_path: Optional[str] = None):
+        """
+        Initialize the MarketCache, loading the snapshot when one exists.
+
+        :param ttl: Seconds an entry stays valid (0 disables caching).
+        :param max_size: Maximum number of markets kept.
+        :param snapshot_path: Optional JSON file used by save_snapshot() and load_snapshot().
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+        self.snapshot_path = snapshot_path
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._markets: "OrderedDict[str, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self._names: Dict[str, str] = {}
+        # Reverse of _names, so evicting a market does not scan every name
+        self._aliases: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+        if snapshot_path and os.path.exists(snapshot_path):
+            self.load_snapshot()
+
+    @staticmethod
+    def _name_key(name: str) -> str:
+        return name.strip().casefold()
+
+    def _lookup(self, market_id: Optional[str]) -> Optional[Dict[str, Any]]:
+        entry = self._markets.get(market_id) if market_id is not None else None
+        if entry is None:
+            self.misses += 1
+            return None
+        market, stored_at = entry
+        if time.time() - stored_at >= self.ttl:
+            self._drop(market_id)
+            self.misses += 1
+            return None
+        self._markets.move_to_end(market_id)
+        self.hits += 1
+        return market
+
+    def get(self, market_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached market for a name, or None on a miss.
+        """
+        with self._lock:
+            return self._lookup(self._names.get(self._name_key(market_name)))
+
+    def get_by_id(self, market_id: Any) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached market for a MarketId, or None on a miss.
+        """
+        with self._lock:
+            return self._lookup(str(market_id))
+
+    def put(self, market: Dict[str, Any], alias: Optional[str] = None, stored_at: Optional[float] = None) -> None:
+        """
+        Cache one market under its MarketId, its Name and an optional lookup alias.
+
+        :param market: The market dictionary as returned by '/cfd/markets'.
+        :param alias: An extra name to find it by, such as the name it was searched with.
+        :param stored_at: Time the entry was fetched (defaults to now).
+        """
+        market_id = str(market.get("MarketId"))
+        with self._lock:
+            self._markets[market_id] = (market, time.time() if stored_at is None else stored_at)
+            self._markets.move_to_end(market_id)
+            for name in (market.get("Name"), alias):
+                if name:
+                    self._bind(self._name_key(name), market_id)
+            while len(self._markets) > self.max_size:
+                oldest = next(iter(self._markets))
+                self._drop(oldest)
+                self.evictions += 1
+
+    def put_many(self, markets: Iterable[Dict[str, Any]]) -> int:
+        """
+        Cache a batch of markets, such as the full market list.
+
+        :return: The number of markets cached.
+        """
+        count = 0
+        for market in markets:
+            self.put(market)
+            count += 1
+        return count
+
+    def _bind(self, name: str, market_id: str) -> None:
+        previous = self._names.get(name)
+        if previous is not None and previous != market_id:
+            self._aliases[previous].discard(name)
+        self._names[name] = market_id
+        self._aliases.setdefault(market_id, set()).add(name)
+
+    def _drop(self, market_id: str) -> None:
+        self._markets.pop(market_id, None)
+        for name in self._aliases.pop(market_id, ()):
+            del self._names[name]
+
+    def clear(self) -> None:
+        """
+        Remove every cached market.
+        """
+        with self._lock:
+            self._markets.clear()
+            self._names.clear()
+            self._aliases.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return hit/miss counters and the current size.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._markets),
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+    def save_snapshot(self, path: Optional[str] = None) -> None:
+        """
+        Write the cached markets and their fetch times to a JSON file.
+        """
+        path = path or self.snapshot_path
+        if not path:
+            raise ValueError("No snapshot path configured")
+        with self._lock:
+            payload = {
+                "markets": [{"market": market, "stored_at": stored_at} for market, stored_at in self._markets.values()],
+                "names": self._names,
+            }
+        # A unique temporary file per call, so concurrent saves never replace each other's file
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(payload, f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    def load_snapshot(self, path: Optional[str] = None) -> int:
+        """
+        Load markets from a JSON snapshot, keeping their original fetch times so TTLs still apply.
+
+        :return: The number of markets loaded.
+        """
+        path = path or self.snapshot_path
+        with open(path) as f:
+            payload = json.load(f)
+        for entry in payload.get("markets", []):
+            self.put(entry["market"], stored_at=entry["stored_at"])
+        with self._lock:
+            for name, market_id in payload.get("names", {}).items():
+                if market_id in self._markets:
+                    self._bind(name, market_id)
+        return len(payload.get("markets", []))
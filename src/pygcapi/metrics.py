@@ -0,0 +1,333 @@
+import threading
+import time
+from typing import Optional, Dict, Any, Callable, Tuple, List
+
+# Quantiles reported by snapshot() and to_prometheus()
+QUANTILES = (0.5, 0.9, 0.99, 0.999)
+
+# Values of metrics ending in '_seconds' are stored as whole microseconds
+SECONDS_SCALE = 1e6
+
+METRIC_HELP = {
+    "latency_seconds": "Wall time of a client call.",
+    "network_seconds": "Time spent sending requests and reading response bodies.",
+    "decode_seconds": "Time spent decoding JSON.",
+    "frame_seconds": "Time spent building DataFrames.",
+    "response_bytes": "Size of the response bodies of a call.",
+    "rows": "Number of rows returned by a call.",
+}
+
+
+class Histogram:
+    """
+    An HDR-style log-linear histogram of non-negative values.
+
+    Values are recorded as integers of ``1 / scale`` units. Below ``2 ** precision_bits``
+    every integer has its own bucket; above, each power of two is split into
+    ``2 ** (precision_bits - 1)`` equal buckets, so any quantile is reported with a
+    relative error below ``2 ** -(precision_bits - 1)`` whatever the range of values.
+    Only non-empty buckets are stored.
+    """
+
+    def __init__(self, scale: float = 1.0, precision_bits: int = 7):
+        """
+        Initialize an empty Histogram.
+
+        :param scale: Factor applied to values before they are rounded to integers.
+        :param precision_bits: Significant bits kept per value (7 bits is within 1.6%).
+        """
+        self.scale = scale
+        self.precision_bits = precision_bits
+        self.count = 0
+        self.sum = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self._buckets: Dict[int, int] = {}
+
+    def record(self, value: float) -> None:
+        """
+        Add one value.
+        """
+        value = max(0.0, value)
+        units = int(value * self.scale)
+        shift = units.bit_length() - self.precision_bits
+        if shift > 0:
+            units = units >> shift << shift
+        self._buckets[units] = self._buckets.get(units, 0) + 1
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def _width(self, units: int) -> int:
+        shift = units.bit_length() - self.precision_bits
+        return 1 << shift if shift > 0 else 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Return the value below which a fraction ``q`` of the recorded values fall.
+
+        :param q: The quantile, between 0 and 1.
+        :return: The middle of the bucket holding the quantile, or None when empty.
+        """
+        if not self.count:
+            return None
+        rank = max(1, int(q * self.count + 0.5))
+        seen = 0
+        for units in sorted(self._buckets):
+            seen += self._buckets[units]
+            if seen >= rank:
+                value = (units + (self._width(units) - 1) / 2) / self.scale
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Return the count, sum, min, max, mean and the QUANTILES as a dictionary.
+        """
+        stats = {
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min,
+            "max": self.max,
+            "mean": self.sum / self.count if self.count else None,
+        }
+        for q in QUANTILES:
+            stats[f"p{q * 100:g}".replace(".", "")] = self.quantile(q)
+        return stats
+
+
+class CallMetrics:
+    """
+    Collects the phases of one client call and records them when the call ends.
+
+    Created by Metrics.call() and used as a context manager around a client method.
+    Phase times and sizes are summed over the call, so a call that sends several
+    requests still records one sample per metric, and the call's wall time is
+    recorded as 'latency_seconds'. A call leaving with an exception counts as an error.
+    """
+
+    __slots__ = ("metrics", "name", "values", "_started")
+
+    def __init__(self, metrics: "Metrics", name: str):
+        self.metrics = metrics
+        self.name = name
+        self.values: Dict[str, float] = {}
+        self._started = 0.0
+
+    def __bool__(self) -> bool:
+        return True
+
+    def __enter__(self) -> "CallMetrics":
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.values["latency_seconds"] = time.perf_counter() - self._started
+        self.metrics.record(self.name, self.values, error=exc_type is not None)
+
+    def add(self, name: str, value: float) -> None:
+        """
+        Add to a metric of this call (e.g., 'network_seconds', 'response_bytes').
+        """
+        self.values[name] = self.values.get(name, 0) + value
+
+    def timed(self, phase: str, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Call ``func`` and add its run time to '<phase>_seconds'.
+        """
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self.add(f"{phase}_seconds", time.perf_counter() - started)
+
+    def send(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Send a request with ``func`` (e.g., session_manager.get), timed as network.
+        """
+        return self.timed("network", func, *args, **kwargs)
+
+    def json(self, response: Any) -> Any:
+        """
+        Decode a response body as JSON, recording its size and the decode time.
+        """
+        self.add("response_bytes", len(response.content))
+        return self.timed("decode", response.json)
+
+    def frame(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Build a DataFrame with ``func``, recording the build time and its number of rows.
+        """
+        df = self.timed("frame", func, *args, **kwargs)
+        self.add("rows", len(df))
+        return df
+
+
+class _NullCallMetrics:
+    """
+    The CallMetrics stand-in used while metrics are disabled: every step calls straight through.
+    """
+
+    __slots__ = ()
+
+    def __bool__(self) -> bool:
+        return False
+
+    def __enter__(self) -> "_NullCallMetrics":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        pass
+
+    def add(self, name: str, value: float) -> None:
+        pass
+
+    def timed(self, phase: str, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        return func(*args, **kwargs)
+
+    def send(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        return func(*args, **kwargs)
+
+    def json(self, response: Any) -> Any:
+        return response.json()
+
+    def frame(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        return func(*args, **kwargs)
+
+
+NULL_CALL = _NullCallMetrics()
+
+
+class Metrics:
+    """
+    Per-call latency, phase, payload and row histograms for the API clients.
+
+    Pass one Metrics to GCapiClientV1/GCapiClientV2 (it can be shared between clients).
+    Every instrumented call (get_ohlc, trade_order, list_active_orders, ...) records
+    its wall time plus the time spent on the network, decoding JSON and building
+    DataFrames, the response size and the number of rows, so network, parse and
+    pandas time can be told apart. Read the results with snapshot() or export them
+    with to_prometheus(). Clients without Metrics, or with ``enabled`` set to False,
+    skip all bookkeeping.
+    """
+
+    def __init__(self, namespace: str = "pygcapi", enabled: bool = True, precision_bits: int = 7):
+        """
+        Initialize an empty Metrics registry.
+
+        :param namespace: Prefix of the exported Prometheus metric names.
+        :param enabled: Whether calls are recorded.
+        :param precision_bits: Significant bits kept per value by the histograms.
+        """
+        self.namespace = namespace
+        self.enabled = enabled
+        self.precision_bits = precision_bits
+        self._histograms: Dict[Tuple[str, str], Histogram] = {}
+        self._calls: Dict[str, int] = {}
+        self._errors: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def call(self, name: str) -> Any:
+        """
+        Return a context manager collecting the metrics of one call named ``name``.
+        """
+        return CallMetrics(self, name) if self.enabled else NULL_CALL
+
+    def record(self, call: str, values: Dict[str, float], error: bool = False) -> None:
+        """
+        Record the metrics of one finished call.
+
+        :param call: The call name (e.g., "get_ohlc").
+        :param values: Metric values by name (e.g., {"network_seconds": 0.02, "rows": 500}).
+        :param error: Whether the call raised.
+        """
+        with self._lock:
+            self._calls[call] = self._calls.get(call, 0) + 1
+            if error:
+                self._errors[call] = self._errors.get(call, 0) + 1
+            for name, value in values.items():
+                self._histogram(call, name).record(value)
+
+    def observe(self, call: str, name: str, value: float) -> None:
+        """
+        Record a single value outside of a call context.
+        """
+        with self._lock:
+            self._histogram(call, name).record(value)
+
+    def _histogram(self, call: str, name: str) -> Histogram:
+        # Called with self._lock held
+        histogram = self._histograms.get((call, name))
+        if histogram is None:
+            scale = SECONDS_SCALE if name.endswith("_seconds") else 1.0
+            histogram = self._histograms[(call, name)] = Histogram(scale, self.precision_bits)
+        return histogram
+
+    def reset(self) -> None:
+        """
+        Drop everything recorded so far.
+        """
+        with self._lock:
+            self._histograms.clear()
+            self._calls.clear()
+            self._errors.clear()
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Return the recorded metrics per call.
+
+        :return: ``{call: {"calls": n, "errors": n, metric: {count, sum, min, max, mean, p50, ...}}}``.
+        """
+        with self._lock:
+            result: Dict[str, Dict[str, Any]] = {
+                call: {"calls": count, "errors": self._errors.get(call, 0)} for call, count in self._calls.items()
+            }
+            for (call, name), histogram in self._histograms.items():
+                result.setdefault(call, {"calls": 0, "errors": 0})[name] = histogram.snapshot()
+            return result
+
+    def to_prometheus(self) -> str:
+        """
+        Export the metrics in the Prometheus text exposition format.
+
+        Histograms are exported as summaries with the QUANTILES, '_sum' and '_count',
+        labelled by call; call and error counts are exported as counters.
+
+        :return: The exposition text, ending with a newline.
+        """
+        with self._lock:
+            by_name: Dict[str, List[Tuple[str, Histogram]]] = {}
+            for (call, name), histogram in sorted(self._histograms.items()):
+                by_name.setdefault(name, []).append((call, histogram))
+            calls = sorted(self._calls.items())
+            errors = sorted(self._errors.items())
+
+            lines = []
+            for name, histograms in by_name.items():
+                metric = f"{self.namespace}_{name}"
+                lines.append(f"# HELP {metric} {METRIC_HELP.get(name, name)}")
+                lines.append(f"# TYPE {metric} summary")
+                for call, histogram in histograms:
+                    label = _escape(call)
+                    for q in QUANTILES:
+                        lines.append(f'{metric}{{call="{label}",quantile="{q:g}"}} {histogram.quantile(q):.9g}')
+                    lines.append(f'{metric}_sum{{call="{label}"}} {histogram.sum:.9g}')
+                    lines.append(f'{metric}_count{{call="{label}"}} {histogram.count}')
+
+            for metric, help_text, counts in (
+                ("calls_total", "Number of client calls.", calls),
+                ("errors_total", "Number of client calls that raised.", errors),
+            ):
+                if not counts:
+                    continue
+                metric = f"{self.namespace}_{metric}"
+                lines.append(f"# HELP {metric} {help_text}")
+                lines.append(f"# TYPE {metric} counter")
+                for call, count in counts:
+                    lines.append(f'{metric}{{call="{_escape(call)}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -0,0 +1,312 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, asdict
+from typing import Optional, Dict, Any, List, Callable, Iterator, Union
+
+from pygcapi.lazy import lazy_import
+from pygcapi.retry import unsafe_retryable
+from pygcapi.utils import (
+    get_instruction_status_description,
+    get_instruction_status_reason_description,
+    get_order_status_description,
+    get_order_status_reason_description,
+    get_order_action_type_description
+)
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+
+class TransientOrderError(Exception):
+    """
+    An order request that failed with HTTP 429 or 5xx.
+
+    Only statuses the orders RetryPolicy lists in ``unsafe_retry_statuses`` (429) are
+    sent again: after a 5xx the order may already have been executed.
+    """
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass
+class OrderSpec:
+    """
+    The arguments of one trade_order call.
+    """
+    quantity: float
+    offer_price: float
+    bid_price: float
+    direction: str
+    market_id: str
+    market_name: str
+    stop_loss: Optional[float] = None
+    take_profit: Optional[float] = None
+    trigger_price: Optional[float] = None
+    close: bool = False
+    order_id: Optional[str] = None
+    tolerance: Optional[float] = None
+
+    def to_kwargs(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class OrderResult:
+    """
+    The outcome of one submitted order, with status codes decoded through the lookup tables.
+    """
+    spec: OrderSpec
+    order_details: Optional[Dict[str, Any]] = None
+    response: Optional[Dict[str, Any]] = None
+    order_id: Optional[Any] = None
+    status: Optional[str] = None
+    reason: Optional[str] = None
+    order_status: Optional[str] = None
+    order_reason: Optional[str] = None
+    action: Optional[str] = None
+    elapsed: float = 0.0
+    attempts: int = 0
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class CloseSummary:
+    """
+    The outcome of closing a set of positions, one OrderResult per position.
+    """
+    results: List[OrderResult] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+    def __iter__(self) -> Iterator[OrderResult]:
+        return iter(self.results)
+
+    @property
+    def closed(self) -> List[OrderResult]:
+        return [result for result in self.results if result.ok]
+
+    @property
+    def failed(self) -> List[OrderResult]:
+        return [result for result in self.results if not result.ok]
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed
+
+    @property
+    def responses(self) -> List[Dict[str, Any]]:
+        return [result.response for result in self.closed]
+
+    def latencies(self) -> Dict[Any, float]:
+        """
+        Return the seconds spent closing each position, keyed by the position's OrderId.
+        """
+        return {result.spec.order_id: result.elapsed for result in self.results}
+
+    def summary(self) -> dict:
+        """
+        Summarize the close-out as a dictionary of counts and timings.
+        """
+        timings = [result.elapsed for result in self.results]
+        return {
+            "positions": len(self.results),
+            "closed": len(self.closed),
+            "failed": len(self.failed),
+            "retried": sum(1 for result in self.results if result.attempts > 1),
+            "elapsed": self.elapsed,
+            "latency_mean": sum(timings) / len(timings) if timings else 0.0,
+            "latency_max": max(timings, default=0.0),
+        }
+
+
+def decode_order_response(resp: Dict[str, Any]) -> Dict[str, Optional[str]]:
+    """
+    Decode the status fields of a '/order/newtradeorder' response.
+
+    :param resp: The API response as a dictionary.
+    :return: A dictionary with status, reason, order_status, order_reason, action and order_id.
+    """
+    decoded = {
+        "status": get_instruction_status_description(resp.get("Status")),
+        "reason": get_instruction_status_reason_description(resp.get("StatusReason")),
+        "order_status": None,
+        "order_reason": None,
+        "action": None,
+        "order_id": resp.get("OrderId"),
+    }
+    orders = resp.get("Orders") or []
+    if orders:
+        decoded["order_status"] = get_order_status_description(orders[0].get("Status"))
+        decoded["order_reason"] = get_order_status_reason_description(orders[0].get("StatusReason"))
+        decoded["order_id"] = orders[0].get("OrderId", decoded["order_id"])
+    actions = resp.get("Actions") or []
+    if actions:
+        decoded["action"] = get_order_action_type_description(actions[0].get("OrderActionTypeId"))
+    return decoded
+
+
+def submit_orders(
+    build: Callable[[OrderSpec], Dict[str, Any]],
+    place: Callable[[Dict[str, Any]], Dict[str, Any]],
+    specs: List[OrderSpec],
+    max_in_flight: int = 8,
+    preserve_market_order: bool = True,
+    retries: int = 0,
+    retry_delay: float = 0.25,
+) -> List[OrderResult]:
+    """
+    Submit a batch of orders concurrently.
+
+    With ``preserve_market_order`` the orders of each market are sent one after the
+    other in list order, while different markets proceed in parallel; otherwise every
+    order is independent.
+
+    :param build: Turns an OrderSpec into the request body (see utils.build_order_details).
+    :param place: Sends one request body and returns the API response, raising on failure.
+    :param specs: The orders to submit.
+    :param max_in_flight: Maximum number of requests in flight at once.
+    :param preserve_market_order: Whether orders for the same market keep their relative order.
+    :param retries: How many times an order is sent again after a throttled (429) or never-sent attempt.
+    :param retry_delay: Initial delay between attempts in seconds, doubled after each retry.
+    :return: One OrderResult per spec, in the order of ``specs``.
+    """
+    results: List[Optional[OrderResult]] = [None] * len(specs)
+
+    def submit(index: int) -> None:
+        spec = specs[index]
+        result = OrderResult(spec=spec)
+        started = time.perf_counter()
+        try:
+            result.order_details = build(spec)
+            result.response = _place_with_retries(place, result, retries, retry_delay)
+            decoded = decode_order_response(result.response)
+            result.order_id = decoded.pop("order_id")
+            for name, value in decoded.items():
+                setattr(result, name, value)
+            if result.order_id is not None:
+                result.order_details["OrderId"] = result.order_id
+        except Exception as e:
+            result.error = str(e)
+        result.elapsed = time.perf_counter() - started
+        results[index] = result
+
+    if preserve_market_order:
+        lanes: "OrderedDict[str, List[int]]" = OrderedDict()
+        for index, spec in enumerate(specs):
+            lanes.setdefault(str(spec.market_id), []).append(index)
+        tasks = [lambda indices=indices: [submit(i) for i in indices] for indices in lanes.values()]
+    else:
+        tasks = [lambda index=index: submit(index) for index in range(len(specs))]
+
+    if max_in_flight > 1 and len(tasks) > 1:
+        with ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix="pygcapi-order") as pool:
+            for future in [pool.submit(task) for task in tasks]:
+                future.result()
+    else:
+        for task in tasks:
+            task()
+
+    return results
+
+
+def _place_with_retries(place: Callable[[Dict[str, Any]], Dict[str, Any]], result: OrderResult, retries: int, retry_delay: float) -> Dict[str, Any]:
+    delay = retry_delay
+    while True:
+        result.attempts += 1
+        try:
+            return place(result.order_details)
+        except Exception as e:
+            if result.attempts > retries or not unsafe_retryable(e):
+                raise
+        time.sleep(delay)
+        delay *= 2
+
+
+def close_position_specs(positions: Union[pd.DataFrame, List[Dict[str, Any]]], tolerance: Optional[float] = None) -> List[OrderSpec]:
+    """
+    Build the closing orders for a set of open positions.
+
+    Works on whole columns rather than row by row: each position is closed in the
+    opposite direction at its current price, and build_order_details() widens that
+    price by ``tolerance`` pips.
+
+    :param positions: Open positions as returned by list_open_positions(), or a list of position dictionaries.
+    :param tolerance: The price tolerance in pips (optional).
+    :return: One closing OrderSpec per position.
+    """
+    df = positions if isinstance(positions, pd.DataFrame) else pd.DataFrame(list(positions))
+    if df.empty:
+        return []
+
+    n = len(df)
+    price = pd.to_numeric(df["Price"], errors="coerce").fillna(0.0).to_numpy(dtype=np.float64) if "Price" in df else np.zeros(n)
+    direction = np.where(df["Direction"].astype(str).str.lower().to_numpy() == "buy", "sell", "buy")
+    market_ids = df["MarketId"].tolist()
+    market_names = df["MarketName"].tolist() if "MarketName" in df else [str(m) for m in market_ids]
+    order_ids = df["OrderId"].tolist() if "OrderId" in df else [None] * n
+
+    return [
+        OrderSpec(
+            quantity=quantity,
+            offer_price=offer_price,
+            bid_price=bid_price,
+            direction=side,
+            market_id=market_id,
+            market_name=market_name,
+            close=True,
+            order_id=order_id,
+            tolerance=tolerance,
+        )
+        for quantity, offer_price, bid_price, side, market_id, market_name, order_id in zip(
+            df["Quantity"].tolist(), price.tolist(), price.tolist(),
+            direction.tolist(), market_ids, market_names, order_ids,
+        )
+    ]
+
+
+def close_positions(
+    build: Callable[[OrderSpec], Dict[str, Any]],
+    place: Callable[[Dict[str, Any]], Dict[str, Any]],
+    positions: Union[pd.DataFrame, List[Dict[str, Any]]],
+    tolerance: Optional[float] = None,
+    max_workers: int = 8,
+    retries: int = 0,
+    retry_delay: float = 0.25,
+) -> CloseSummary:
+    """
+    Close a set of positions concurrently.
+
+    Closes are not retried by default: a close sent twice can reverse the position.
+    With ``retries``, only throttled (429) closes and closes that never left the
+    client are sent again.
+
+    :param build: Turns an OrderSpec into the request body (see utils.build_order_details).
+    :param place: Sends one request body and returns the API response, raising on failure.
+    :param positions: Open positions as returned by list_open_positions(), or a list of position dictionaries.
+    :param tolerance: The price tolerance in pips (optional).
+    :param max_workers: Maximum number of close requests in flight at once.
+    :param retries: How many times a throttled (429) or never-sent close is sent again.
+    :param retry_delay: Initial delay between attempts in seconds.
+    :return: A CloseSummary with one result per position.
+    """
+    started = time.perf_counter()
+    specs = close_position_specs(positions, tolerance)
+    results = submit_orders(
+        build, place, specs,
+        max_in_flight=max_workers,
+        preserve_market_order=False,
+        retries=retries,
+        retry_delay=retry_delay,
+    )
+    return CloseSummary(results=results, elapsed=time.perf_counter() - started)
@@ -0,0 +1,212 @@
+import os
+import struct
+import threading
+import time
+from typing import Optional, Dict, Tuple, Union
+from urllib.parse import urlparse
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+# Requests per second and burst size of each endpoint class; conservative, tune them per account
+DEFAULT_BUDGETS: Dict[str, Tuple[float, float]] = {
+    "market_data": (10.0, 20.0),
+    "orders": (5.0, 10.0),
+    "account": (2.0, 5.0),
+}
+
+# Order endpoints that place, change or cancel orders; reads under /order/ (openpositions,
+# activeorders, tradehistory) are account queries
+ORDER_ENDPOINTS = frozenset({
+    "newtradeorder",
+    "updatetradeorder",
+    "newstoplimitorder",
+    "updatestoplimitorder",
+    "cancel",
+})
+
+_STATE = struct.Struct("dd")
+
+
+def classify_endpoint(url: str) -> str:
+    """
+    Map a request URL to its endpoint class: "orders", "market_data" or "account".
+    """
+    path = urlparse(url).path.rstrip("/").lower()
+    if "/order/" in path and path.rsplit("/", 1)[-1] in ORDER_ENDPOINTS:
+        return "orders"
+    if "/market/" in url or "/cfd/markets" in url:
+        return "market_data"
+    return "account"
+
+
+class TokenBucket:
+    """
+    A thread-safe token bucket refilled at ``rate`` tokens per second up to ``capacity``.
+
+    A caller that finds the bucket empty reserves its token anyway and sleeps until the
+    token would have been refilled, so waiting callers are served in arrival order.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Initialize a full TokenBucket.
+
+        :param rate: Tokens added per second.
+        :param capacity: Maximum number of tokens, i.e. the burst size (defaults to max(1, rate)).
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self, tokens: float) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate) - tokens
+            self._updated = now
+            return max(0.0, -self._tokens / self.rate)
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Take tokens from the bucket, sleeping until they are available.
+
+        :return: The number of seconds waited.
+        """
+        wait = self._reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class FileTokenBucket(TokenBucket):
+    """
+    A token bucket whose state lives in a small file, shared by every process on the host.
+
+    Each reservation locks the file with ``flock``, so worker processes using the same
+    path draw from a single budget. Wall-clock time is used so all processes agree on
+    the refill. Requires a POSIX system.
+    """
+
+    def __init__(self, path: str, rate: float, capacity: Optional[float] = None):
+        """
+        Initialize the FileTokenBucket, creating the state file (full) if it does not exist.
+
+        :param path: Path of the state file; buckets with the same path share their tokens.
+        :param rate: Tokens added per second.
+        :param capacity: Maximum number of tokens, i.e. the burst size (defaults to max(1, rate)).
+        """
+        if fcntl is None:
+            raise RuntimeError("FileTokenBucket requires fcntl, which is not available on this platform")
+        super().__init__(rate, capacity)
+        self.path = path
+        self._fd: Optional[int] = None
+        self._pid: Optional[int] = None
+
+    def _open(self) -> int:
+        # flock locks belong to the open file, so a forked child must open its own
+        if self._fd is None or self._pid != os.getpid():
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+            self._pid = os.getpid()
+        return self._fd
+
+    def _reserve(self, tokens: float) -> float:
+        with self._lock:
+            fd = self._open()
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                now = time.time()
+                raw = os.pread(fd, _STATE.size, 0)
+                available, updated = _STATE.unpack(raw) if len(raw) == _STATE.size else (self.capacity, now)
+                available = min(self.capacity, available + max(0.0, now - updated) * self.rate) - tokens
+                os.pwrite(fd, _STATE.pack(available, now), 0)
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+        return max(0.0, -available / self.rate)
+
+    def close(self) -> None:
+        """
+        Close the state file.
+        """
+        if self._fd is not None and self._pid == os.getpid():
+            os.close(self._fd)
+        self._fd = None
+
+
+class RateLimiter:
+    """
+    Client-side request budgets per endpoint class, with wait-time metrics.
+
+    Requests are classified as market data, orders or account calls and each class
+    draws from its own token bucket. One RateLimiter can be shared by several clients
+    and threads; with ``path`` set, the buckets live in files under that directory and
+    are shared by every process that uses the same path. The metrics show how often and
+    for how long callers waited, i.e. whether a workload is limiter-bound.
+    """
+
+    def __init__(self, budgets: Optional[Dict[str, Tuple[float, float]]] = None, path: Optional[str] = None):
+        """
+        Initialize the RateLimiter.
+
+        :param budgets: (requests per second, burst size) per endpoint class, overriding DEFAULT_BUDGETS.
+        :param path: Optional directory for process-shared bucket files (None keeps the buckets in memory).
+        """
+        self.budgets = {**DEFAULT_BUDGETS, **(budgets or {})}
+        self.path = path
+        if path is not None:
+            os.makedirs(path, mode=0o700, exist_ok=True)
+        self.buckets: Dict[str, TokenBucket] = {
+            name: FileTokenBucket(os.path.join(path, f"{name}.bucket"), rate, capacity) if path else TokenBucket(rate, capacity)
+            for name, (rate, capacity) in self.budgets.items()
+        }
+        self._metrics = {name: {"acquired": 0, "waited": 0, "wait_time": 0.0, "max_wait": 0.0} for name in self.buckets}
+        self._lock = threading.Lock()
+
+    def acquire(self, endpoint_class: str) -> float:
+        """
+        Wait for a request slot of an endpoint class.
+
+        :param endpoint_class: "market_data", "orders", "account" or any class given in ``budgets``.
+        :return: The number of seconds waited.
+        """
+        wait = self.buckets[endpoint_class].acquire()
+        with self._lock:
+            metrics = self._metrics[endpoint_class]
+            metrics["acquired"] += 1
+            if wait > 0:
+                metrics["waited"] += 1
+                metrics["wait_time"] += wait
+                metrics["max_wait"] = max(metrics["max_wait"], wait)
+        return wait
+
+    def acquire_url(self, url: str) -> float:
+        """
+        Wait for a request slot of the endpoint class of ``url``.
+        """
+        return self.acquire(classify_endpoint(url))
+
+    def stats(self) -> Dict[str, Dict[str, Union[int, float]]]:
+        """
+        Return per-class counts of requests and waits, total, mean and maximum wait in seconds.
+        """
+        with self._lock:
+            return {
+                name: {
+                    **metrics,
+                    "mean_wait": metrics["wait_time"] / metrics["acquired"] if metrics["acquired"] else 0.0,
+                }
+                for name, metrics in self._metrics.items()
+            }
+
+    def close(self) -> None:
+        """
+        Close the bucket files of a process-shared limiter.
+        """
+        for bucket in self.buckets.values():
+            if isinstance(bucket, FileTokenBucket):
+                bucket.close()
@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, fields
+from typing import Optional, Dict, Any, List, Union, ClassVar, Tuple, Sequence
+
+from pygcapi.lazy import lazy_import
+# Module imports: utils and arrow import NAT back from here
+from pygcapi import utils, arrow
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+# NumPy's NaT sentinel (np.iinfo(np.int64).min), marking missing dates in int64 epoch milliseconds
+NAT = -(2 ** 63)
+
+# Result types of the read methods: pandas DataFrames, or compact records without pandas
+OUTPUT_MODES = ("frame", "records")
+# Bars and ticks can also be decoded straight into Arrow record batches or Polars frames
+MARKET_DATA_OUTPUTS = OUTPUT_MODES + ("arrow", "polars")
+
+
+def check_output(output: str, modes: Tuple[str, ...] = OUTPUT_MODES) -> str:
+    """
+    Validate an ``output`` argument.
+
+    :param output: The requested output mode.
+    :param modes: The modes the method supports.
+    :raises ValueError: If ``output`` is not one of ``modes``.
+    """
+    if output not in modes:
+        raise ValueError(f"output must be one of {modes}, got {output!r}")
+    return output
+
+
+class _ApiRecord:
+    """
+    Mixin building slotted records from API dictionaries, one field per key of API_KEYS.
+    """
+
+    __slots__ = ()
+
+    API_KEYS: ClassVar[Tuple[str, ...]] = ()
+    # API date fields converted to (naive UTC) datetimes by to_dataframe()
+    DATE_KEYS: ClassVar[Tuple[str, ...]] = ()
+
+    @classmethod
+    def from_api_list(cls, items: Sequence[Dict[str, Any]]) -> list:
+        keys = cls.API_KEYS
+        return [cls(*[item.get(key) for key in keys]) for item in items]
+
+
+@dataclass(slots=True)
+class Position(_ApiRecord):
+    """
+    An open position, as listed by list_open_positions(output="records").
+    """
+    order_id: Optional[int]
+    market_id: Optional[int]
+    market_name: Optional[str]
+    direction: Optional[str]
+    quantity: Optional[float]
+    price: Optional[float]
+    status: Optional[int]
+    status_reason: Optional[int]
+    trading_account_id: Optional[int]
+    currency: Optional[str]
+    created_utc: Optional[str]
+    executed_utc: Optional[str]
+
+    API_KEYS: ClassVar[Tuple[str, ...]] = (
+        "OrderId", "MarketId", "MarketName", "Direction", "Quantity", "Price", "Status", "StatusReason",
+        "TradingAccountId", "Currency", "CreatedDateTimeUTC", "ExecutedDateTimeUTC",
+    )
+
+
+@dataclass(slots=True)
+class ActiveOrder(_ApiRecord):
+    """
+    An active order, as listed by list_active_orders(output="records").
+    """
+    order_id: Optional[int]
+    market_id: Optional[int]
+    market_name: Optional[str]
+    direction: Optional[str]
+    quantity: Optional[float]
+    price: Optional[float]
+    status: Optional[int]
+    status_reason: Optional[int]
+    type_id: Optional[int]
+    trading_account_id: Optional[int]
+    currency: Optional[str]
+    created_utc: Optional[str]
+    last_changed_utc: Optional[str]
+    stop_limit_order: Optional[Dict[str, Any]] = None
+    outer_type_id: Optional[int] = None
+
+    API_KEYS: ClassVar[Tuple[str, ...]] = (
+        "OrderId", "MarketId", "MarketName", "Direction", "Quantity", "Price", "Status", "StatusReason",
+        "TypeId", "TradingAccountId", "Currency", "CreatedDateTimeUTC", "LastChangedDateTimeUTC",
+        "StopLimitOrder", "OuterTypeId",
+    )
+    DATE_KEYS: ClassVar[Tuple[str, ...]] = ("CreatedDateTimeUTC", "LastChangedDateTimeUTC")
+
+    @classmethod
+    def from_api_list(cls, items: Sequence[Dict[str, Any]]) -> list:
+        # Active orders nest the trade order, like convert_orders_to_dataframe() flattens them
+        keys = cls.API_KEYS[:-2]
+        return [
+            cls(*[item["TradeOrder"].get(key) for key in keys], item.get("StopLimitOrder"), item.get("TypeId"))
+            for item in items
+        ]
+
+
+@dataclass(slots=True)
+class Trade(_ApiRecord):
+    """
+    A past trade, as listed by get_trade_history(output="records").
+    """
+    order_id: Optional[int]
+    market_id: Optional[int]
+    market_name: Optional[str]
+    direction: Optional[str]
+    quantity: Optional[float]
+    price: Optional[float]
+    realised_pnl: Optional[float]
+    trading_account_id: Optional[int]
+    currency: Optional[str]
+    executed_utc: Optional[str]
+    last_changed_utc: Optional[str]
+
+    API_KEYS: ClassVar[Tuple[str, ...]] = (
+        "OrderId", "MarketId", "MarketName", "Direction", "Quantity", "Price", "RealisedPnl",
+        "TradingAccountId", "Currency", "ExecutedDateTimeUtc", "LastChangedDateTimeUtc",
+    )
+
+
+def to_dataframe(records: Union[np.ndarray, List[_ApiRecord]], record_type: Optional[type] = None) -> pd.DataFrame:
+    """
+    Convert records returned with ``output="records"`` into a DataFrame.
+
+    Bar and tick arrays give the same DataFrame as ``output="frame"``, built from
+    column views of the array. Lists of Position/ActiveOrder/Trade records give one
+    column per record field, named after the API keys.
+
+    :param records: A structured array of bars or ticks, or a list of records.
+    :param record_type: The record class, needed to name the columns of an empty list.
+    :return: A DataFrame.
+    """
+    if isinstance(records, np.ndarray):
+        columns = {name: records[name] for name in records.dtype.names if name != "Date"}
+        df = pd.DataFrame(columns, copy=False)
+        if len(records) or columns:
+            df.insert(0, "Date", pd.DatetimeIndex(records["Date"]).tz_localize("UTC"))
+        return df
+
+    record_type = record_type or (type(records[0]) if records else None)
+    if record_type is None:
+        return pd.DataFrame()
+    names = [field.name for field in fields(record_type)]
+    df = pd.DataFrame({
+        key: [getattr(record, name) for record in records]
+        for key, name in zip(record_type.API_KEYS, names)
+    })
+    for key in record_type.DATE_KEYS:
+        df[key] = utils.parse_dotnet_dates(df[key].to_numpy()).tz_localize(None)
+    return df
+
+
+def array_from_dataframe(df: pd.DataFrame) -> np.ndarray:
+    """
+    Convert a bar or tick DataFrame (UTC 'Date' column first) into the structured array of ``output="records"``.
+    """
+    columns = [name for name in df.columns if name != "Date"]
+    dtype = [("Date", "datetime64[ms]")] + [(name, df[name].to_numpy().dtype) for name in columns]
+    records = np.empty(len(df), dtype=dtype)
+    if "Date" in df:
+        records["Date"] = df["Date"].dt.tz_convert("UTC").dt.tz_localize(None).to_numpy().astype("datetime64[ms]")
+    for name in columns:
+        records[name] = df[name].to_numpy()
+    return records
+
+
+def convert_frame(df: pd.DataFrame, output: str) -> Any:
+    """
+    Convert a bar or tick DataFrame into the structure of another output mode.
+    """
+    if output == "records":
+        return array_from_dataframe(df)
+    if output == "arrow":
+        return arrow.from_dataframe(df)
+    if output == "polars":
+        return arrow.to_polars(arrow.from_dataframe(df))
+    return df
+
+
+def date_bounds(data: Any) -> Tuple[int, int]:
+    """
+    Return the first and last 'Date' of non-empty bars (DataFrame, structured array or Arrow) as epoch milliseconds.
+    """
+    if isinstance(data, np.ndarray):
+        millis = data["Date"].astype("datetime64[ms]").view(np.int64)
+        return int(millis.min()), int(millis.max())
+    if hasattr(data, "schema"):
+        return arrow.date_bounds(data)
+    dates = pd.to_datetime(data["Date"], utc=True)
+    return int(dates.min().timestamp() * 1000), int(dates.max().timestamp() * 1000)
+
+
+def concat_arrays(parts: List[np.ndarray]) -> np.ndarray:
+    """
+    Concatenate time-ordered structured arrays of bars, dropping rows not later than the previous chunk's last 'Date'.
+    """
+    kept = []
+    last = None
+    for part in parts:
+        if last is not None and len(part):
+            part = part[part["Date"] > last]
+        if len(part):
+            last = part["Date"].max()
+            kept.append(part)
+    if not kept:
+        return np.empty(0, dtype=[("Date", "datetime64[ms]")])
+    return np.concatenate(kept)
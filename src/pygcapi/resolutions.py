@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List, Tuple, Iterable
+
+from pygcapi.lazy import lazy_import
+from pygcapi.utils import interval_seconds
+from pygcapi.records import OUTPUT_MODES, check_output
+from pygcapi.long_series import fetch_long_series
+from pygcapi.aggregation import resample_bars
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+# Intervals whose bars the API aligns on midnight UTC; DAY and WEEK bars follow the
+# market's trading sessions, so they are always downloaded rather than derived
+DERIVABLE_INTERVALS = ("MINUTE", "HOUR")
+DAY_SECONDS = 86400
+
+Resolution = Tuple[str, int]
+
+
+def bar_window(width: int, from_ts: int, to_ts: int) -> Tuple[int, int]:
+    """
+    Return the starts of the first and last bars of length ``width`` that get_ohlc returns for [from_ts, to_ts].
+    """
+    return -(-from_ts // width) * width, to_ts // width * width
+
+
+def _between(bars: Any, first: int, last: int) -> Any:
+    # Bars starting within [first, last] (Unix seconds), in the format of ``bars``
+    if isinstance(bars, np.ndarray):
+        millis = bars["Date"].astype("datetime64[ms]").view(np.int64)
+        return bars[(millis >= first * 1000) & (millis <= last * 1000)]
+    if len(bars) == 0:
+        return bars
+    dates = bars["Date"]
+    keep = (dates >= pd.Timestamp(first, unit="s", tz="UTC")) & (dates <= pd.Timestamp(last, unit="s", tz="UTC"))
+    return bars[keep].reset_index(drop=True)
+
+
+class MultiResolutionBars:
+    """
+    Serves OHLC bars at several resolutions from a single download of the finest one.
+
+    Intraday resolutions whose length divides a day and is a multiple of the finest
+    requested one are resampled locally from that download with resample_bars(),
+    which stamps bars on the same boundaries as the API (e.g., 15 minute bars at
+    :00, :15, :30 and :45). The download is widened to whole coarse bars, so the
+    derived bars aggregate the same base bars as the API's. Other resolutions (DAY,
+    WEEK, or lengths that do not line up) are downloaded on their own.
+
+    Results are cached per market, resolution and time range, least recently used
+    first beyond ``max_entries``. Ranges whose last bar is still forming are not
+    cached. Downloads go through client.get_ohlc, so a client with a BarStore also
+    keeps the base bars across processes. Downloads are split into requests with
+    plan_intervals(), skipping the market's closed periods when a calendar is given.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        max_bars: int = 4000,
+        workers: int = 1,
+        max_entries: int = 256,
+        calendar: Optional[Any] = None,
+    ):
+        """
+        Initialize the MultiResolutionBars service.
+
+        :param client: A GCapiClientV1 or GCapiClientV2 instance.
+        :param max_bars: The maximum number of bars per get_ohlc request; longer ranges are fetched in chunks.
+        :param workers: Number of chunks fetched concurrently.
+        :param max_entries: Maximum number of cached (market, resolution, range) results.
+        :param calendar: Optional TradingCalendar or MarketCalendars; download chunks then skip closed periods.
+        """
+        self.client = client
+        self.max_bars = max_bars
+        self.workers = workers
+        self.max_entries = max_entries
+        self.calendar = calendar
+        self.hits = 0
+        self.misses = 0
+        self.downloads = 0
+        self._cache: "OrderedDict[Tuple, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def plan(resolutions: Iterable[Resolution]) -> Tuple[Optional[Resolution], List[Resolution], List[Resolution]]:
+        """
+        Split resolutions into a base resolution, those derived from it and those downloaded directly.
+
+        :param resolutions: (interval, span) pairs such as ("MINUTE", 5).
+        :return: (base or None, derived resolutions including the base, directly downloaded resolutions).
+        """
+        resolutions = list(dict.fromkeys((interval.upper(), int(span)) for interval, span in resolutions))
+        intraday = [
+            res for res in resolutions
+            if res[0] in DERIVABLE_INTERVALS and DAY_SECONDS % interval_seconds(*res) == 0
+        ]
+        if not intraday:
+            return None, [], resolutions
+        base = min(intraday, key=lambda res: interval_seconds(*res))
+        width = interval_seconds(*base)
+        derived = [res for res in intraday if interval_seconds(*res) % width == 0]
+        return base, derived, [res for res in resolutions if res not in derived]
+
+    def get_bars(
+        self,
+        market_id: str,
+        resolutions: Iterable[Resolution],
+        from_ts: int,
+        to_ts: int,
+        output: str = "frame",
+        allow_gaps: bool = False,
+    ) -> Dict[Resolution, Any]:
+        """
+        Retrieve OHLC bars of a market at several resolutions over one time range.
+
+        :param market_id: The market ID for which OHLC data is retrieved.
+        :param resolutions: (interval, span) pairs, e.g. [("MINUTE", 1), ("MINUTE", 15), ("HOUR", 1)].
+        :param from_ts: Start Unix timestamp (seconds).
+        :param to_ts: End Unix timestamp (seconds).
+        :param output: "frame" for DataFrames, "records" for NumPy structured arrays.
+        :param allow_gaps: Whether to return bars when some download chunks failed.
+        :return: Bars in get_ohlc format keyed by (interval, span), with intervals upper-cased.
+        """
+        check_output(output, OUTPUT_MODES)
+        results: Dict[Resolution, Any] = {}
+        missing = []
+        with self._lock:
+            for res in dict.fromkeys((interval.upper(), int(span)) for interval, span in resolutions):
+                key = (str(market_id), res, from_ts, to_ts, output)
+                if key in self._cache:
+                    self._cache.move_to_end(key)
+                    self.hits += 1
+                    results[res] = self._cache[key]
+                else:
+                    self.misses += 1
+                    missing.append(res)
+        if not missing:
+            return results
+
+        base, derived, direct = self.plan(missing)
+        fetched: Dict[Resolution, Any] = {}
+        if base is not None:
+            width = interval_seconds(*base)
+            windows = {res: bar_window(interval_seconds(*res), from_ts, to_ts) for res in derived}
+            # Widen the download to the base bars inside the last coarse bar of every resolution
+            stop = max(last + interval_seconds(*res) - width for res, (_, last) in windows.items())
+            bars = self._download(market_id, base, windows[base][0], stop, output, allow_gaps)
+            for res in derived:
+                first, last = windows[res]
+                resampled = bars if res == base else resample_bars(bars, *res)
+                fetched[res] = _between(resampled, first, last)
+        for res in direct:
+            first, last = bar_window(interval_seconds(*res), from_ts, to_ts)
+            fetched[res] = self._download(market_id, res, first, last, output, allow_gaps)
+
+        now = time.time()
+        with self._lock:
+            for res, bars in fetched.items():
+                if bar_window(interval_seconds(*res), from_ts, to_ts)[1] + interval_seconds(*res) <= now:
+                    self._cache[(str(market_id), res, from_ts, to_ts, output)] = bars
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        results.update(fetched)
+        return results
+
+    def _download(self, market_id: str, res: Resolution, first: int, last: int, output: str, allow_gaps: bool) -> Any:
+        # fetch_long_series plans the chunks with plan_intervals, around closed periods with a calendar
+        result = fetch_long_series(
+            self.client,
+            market_id=market_id,
+            n=self.max_bars,
+            interval=res[0],
+            span=res[1],
+            workers=self.workers,
+            output=output,
+            from_ts=first,
+            to_ts=last,
+            calendar=self.calendar,
+        )
+        self.downloads += 1
+        for chunk in result.failures:
+            self.client.events.emit("chunk_failed", market_id=market_id, chunk=chunk)
+        if result.failures and not allow_gaps:
+            failed = result.failures[0]
+            raise Exception(
+                f"Failed to retrieve {len(result.failures)} of {len(result.chunks)} chunks, "
+                f"first {failed.start}-{failed.stop}: {failed.error}"
+            )
+        return result.data
+
+    def clear(self) -> None:
+        """
+        Drop every cached result.
+        """
+        with self._lock:
+            self._cache.clear()
@@ -0,0 +1,259 @@
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional, Dict, Any, Tuple
+
+import requests
+from urllib3.exceptions import NewConnectionError, ConnectTimeoutError
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised instead of sending a request while the circuit breaker of its endpoint class is open.
+    """
+
+
+@dataclass
+class RetryPolicy:
+    """
+    How often and how patiently requests of one endpoint class are retried.
+
+    Delays grow exponentially from ``base_delay`` up to ``max_delay`` and are drawn
+    uniformly below that bound ("full jitter") so that clients do not retry in step.
+    Non-idempotent requests, such as orders, are only retried when the failure shows
+    the server never processed them: the connection could not be opened, or the
+    status is in ``unsafe_retry_statuses``.
+    """
+    max_attempts: int = 3
+    base_delay: float = 0.2
+    max_delay: float = 5.0
+    jitter: bool = True
+    retry_statuses: Tuple[int, ...] = (429, 500, 502, 503, 504)
+    unsafe_retry_statuses: Tuple[int, ...] = (429,)
+
+    def delay(self, attempt: int) -> float:
+        """
+        Return the seconds to wait after the given (1-based) failed attempt.
+        """
+        bound = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return random.uniform(0, bound) if self.jitter else bound
+
+
+# Order placement is non-idempotent, so RetryPolicy only retries it when it provably never ran
+DEFAULT_POLICIES: Dict[str, RetryPolicy] = {
+    "market_data": RetryPolicy(max_attempts=4),
+    "account": RetryPolicy(max_attempts=3),
+    "orders": RetryPolicy(max_attempts=3, max_delay=2.0),
+}
+
+
+def _never_sent(error: Exception) -> bool:
+    """
+    Whether a request failed before any byte could reach the server.
+    """
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return isinstance(reason, (NewConnectionError, ConnectTimeoutError))
+
+
+def unsafe_retryable(error: Exception, policy: Optional[RetryPolicy] = None) -> bool:
+    """
+    Whether a failed non-idempotent request, such as an order, may be sent again.
+
+    Only a status in the policy's ``unsafe_retry_statuses`` (the server refused the
+    request) or a transport error raised before the request left the client qualify;
+    after a 5xx or a read timeout the server may already have executed it.
+
+    :param error: The exception of the failed attempt; a ``status`` attribute carries its HTTP status.
+    :param policy: The RetryPolicy to apply (defaults to the "orders" policy).
+    """
+    status = getattr(error, "status", None)
+    if status is not None:
+        return status in (policy or DEFAULT_POLICIES["orders"]).unsafe_retry_statuses
+    return _never_sent(error)
+
+
+class CircuitBreaker:
+    """
+    A consecutive-failure circuit breaker.
+
+    After ``failure_threshold`` failures in a row the circuit opens and requests fail
+    fast with CircuitOpenError. Once ``reset_timeout`` seconds have passed a single
+    trial request is let through (half-open): its success closes the circuit, its
+    failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """
+        Initialize a closed CircuitBreaker.
+
+        :param failure_threshold: Consecutive failures that open the circuit.
+        :param reset_timeout: Seconds the circuit stays open before a trial request.
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened = 0
+        self.rejected = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> None:
+        """
+        Let a request through, or raise CircuitOpenError while the circuit is open.
+        """
+        with self._lock:
+            if self.state == "closed":
+                return
+            if self.state == "open" and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = "half_open"
+                self._trial_in_flight = False
+            if self.state == "half_open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return
+            self.rejected += 1
+            raise CircuitOpenError(f"Circuit open after {self.failures} consecutive failures; retrying in "
+                                   f"{max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at)):.1f}s")
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                if self.state != "open":
+                    self.opened += 1
+                self.state = "open"
+                self._opened_at = time.monotonic()
+                self._trial_in_flight = False
+
+
+class RetryManager:
+    """
+    Retry policies and circuit breakers per endpoint class, with metrics.
+
+    Used by the SessionManager around every request: the breaker of the request's
+    endpoint class (market data, orders or account) is checked first, transport
+    errors and retryable statuses are retried according to the class's RetryPolicy,
+    and connection errors and 5xx responses count towards opening the breaker.
+    """
+
+    def __init__(
+        self,
+        policies: Optional[Dict[str, RetryPolicy]] = None,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+    ):
+        """
+        Initialize the RetryManager.
+
+        :param policies: RetryPolicy per endpoint class, overriding DEFAULT_POLICIES.
+        :param failure_threshold: Consecutive failures that open an endpoint class's circuit.
+        :param reset_timeout: Seconds an open circuit waits before a trial request.
+        """
+        self.policies = {**DEFAULT_POLICIES, **(policies or {})}
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self._metrics: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def _policy(self, endpoint: str) -> RetryPolicy:
+        return self.policies.get(endpoint) or RetryPolicy()
+
+    def _breaker(self, endpoint: str) -> CircuitBreaker:
+        with self._lock:
+            if endpoint not in self.breakers:
+                self.breakers[endpoint] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+                self._metrics[endpoint] = {"requests": 0, "retries": 0, "failures": 0, "gave_up": 0}
+            return self.breakers[endpoint]
+
+    def _count(self, endpoint: str, name: str) -> None:
+        with self._lock:
+            self._metrics[endpoint][name] += 1
+
+    def before_request(self, endpoint: str) -> None:
+        """
+        Check the endpoint class's circuit breaker, raising CircuitOpenError when it is open.
+        """
+        breaker = self._breaker(endpoint)
+        breaker.allow()
+        self._count(endpoint, "requests")
+
+    def retry_response(self, endpoint: str, attempt: int, status: int, idempotent: bool) -> bool:
+        """
+        Record a response and decide whether to send the request again.
+
+        :param endpoint: The endpoint class.
+        :param attempt: The 1-based number of the attempt that got this response.
+        :param status: The HTTP status code.
+        :param idempotent: Whether the request can be sent twice safely.
+        :return: True if the request should be retried.
+        """
+        breaker = self._breaker(endpoint)
+        if status >= 500:
+            breaker.record_failure()
+            self._count(endpoint, "failures")
+        else:
+            breaker.record_success()
+
+        policy = self._policy(endpoint)
+        allowed = policy.retry_statuses if idempotent else tuple(set(policy.retry_statuses) & set(policy.unsafe_retry_statuses))
+        return self._decide(endpoint, attempt, status in allowed)
+
+    def retry_error(self, endpoint: str, attempt: int, error: Exception, idempotent: bool) -> bool:
+        """
+        Record a transport error and decide whether to send the request again.
+
+        :param endpoint: The endpoint class.
+        :param attempt: The 1-based number of the failed attempt.
+        :param error: The exception raised by the transport.
+        :param idempotent: Whether the request can be sent twice safely.
+        :return: True if the request should be retried.
+        """
+        self._breaker(endpoint).record_failure()
+        self._count(endpoint, "failures")
+        return self._decide(endpoint, attempt, idempotent or _never_sent(error))
+
+    def _decide(self, endpoint: str, attempt: int, retryable: bool) -> bool:
+        if not retryable:
+            return False
+        if attempt >= self._policy(endpoint).max_attempts:
+            self._count(endpoint, "gave_up")
+            return False
+        self._count(endpoint, "retries")
+        return True
+
+    def backoff(self, endpoint: str, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Sleep before the next attempt, at least as long as a Retry-After value.
+
+        :return: The number of seconds slept.
+        """
+        delay = max(self._policy(endpoint).delay(attempt), retry_after or 0.0)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Return per-class request, retry and failure counts with the breaker state.
+        """
+        with self._lock:
+            return {
+                endpoint: {
+                    **metrics,
+                    "breaker": self.breakers[endpoint].state,
+                    "breaker_opened": self.breakers[endpoint].opened,
+                    "rejected": self.breakers[endpoint].rejected,
+                }
+                for endpoint, metrics in self._metrics.items()
+            }
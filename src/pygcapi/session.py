@@ -0,0 +1,269 @@
+import threading
+import time
+from typing import Optional, Any, Callable, Iterable
+
+import requests
+
+from pygcapi.transport import Transport
+from pygcapi.rate_limit import RateLimiter, classify_endpoint
+from pygcapi.concurrency import AdaptiveConcurrency, parse_retry_after
+from pygcapi.retry import RetryManager
+
+# Methods that can be sent again after a re-login without side effects
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+# Delay before the background thread retries a failed refresh, in seconds
+REFRESH_RETRY_DELAY = 5.0
+
+
+class SessionManager:
+    """
+    Owns the session token of a client and keeps it valid.
+
+    Every authenticated request goes through request()/get()/post(), which send it
+    with the current token. When the API answers with an auth failure the session is
+    re-created exactly once: concurrent callers that hit the same expired token wait
+    on that single login instead of starting their own, and idempotent requests are
+    then replayed with the new token. With ``max_age`` set, a daemon thread also
+    refreshes the token ``refresh_margin`` seconds before it would expire.
+    """
+
+    def __init__(
+        self,
+        login: Callable[[], str],
+        transport: Transport,
+        max_age: Optional[float] = None,
+        refresh_margin: float = 60.0,
+        auth_statuses: Iterable[int] = (401,),
+        on_refresh: Optional[Callable[[str], None]] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        concurrency: Optional[AdaptiveConcurrency] = None,
+        throttle_retries: int = 2,
+        retry: Optional[RetryManager] = None,
+    ):
+        """
+        Initialize the SessionManager (no login happens until refresh() is called).
+
+        :param login: Callable creating a new session and returning its token, raising on failure.
+        :param transport: The Transport authenticated requests are sent through.
+        :param max_age: Seconds a session stays valid; enables background refresh (None disables it).
+        :param refresh_margin: Seconds before expiry at which the background refresh runs.
+        :param auth_statuses: HTTP status codes that mean the session is no longer valid.
+        :param on_refresh: Optional callback invoked with every new token.
+        :param rate_limiter: Optional RateLimiter every request waits on, replays included.
+        :param concurrency: Optional AdaptiveConcurrency controlling how many requests are in flight.
+        :param throttle_retries: How many times a throttled idempotent request is sent again (with ``concurrency`` and no ``retry``).
+        :param retry: Optional RetryManager with retry policies and circuit breakers per endpoint class.
+        """
+        if max_age is not None and refresh_margin >= max_age:
+            raise ValueError("refresh_margin must be smaller than max_age")
+        self.login = login
+        self.transport = transport
+        self.max_age = max_age
+        self.refresh_margin = refresh_margin
+        self.auth_statuses = frozenset(auth_statuses)
+        self.on_refresh = on_refresh
+        self.rate_limiter = rate_limiter
+        self.concurrency = concurrency
+        self.throttle_retries = throttle_retries
+        self.retry = retry
+
+        self.token: Optional[str] = None
+        self.issued_at: Optional[float] = None
+        self.logins = 0
+        self.auth_failures = 0
+        self.replays = 0
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        # Check of an adopted token, run before the first request that cannot be replayed
+        self._verify: Optional[Callable[[], Any]] = None
+
+    @property
+    def age(self) -> Optional[float]:
+        """
+        Seconds since the current session was created, or None before the first login.
+        """
+        return None if self.issued_at is None else time.monotonic() - self.issued_at
+
+    def refresh(self, stale_token: Optional[str] = None) -> str:
+        """
+        Create a new session, unless another caller already replaced ``stale_token``.
+
+        :param stale_token: The token the caller found to be invalid (None forces a login).
+        :return: The current token.
+        """
+        return self._login_unless(lambda token: stale_token is not None and token != stale_token)
+
+    def _login_unless(self, still_valid: Callable[[Optional[str]], bool]) -> str:
+        # The check runs under the lock, so callers that waited on it reuse the login that just finished
+        with self._lock:
+            if still_valid(self.token):
+                return self.token
+            self.token = self.login()
+            self._verify = None
+            self.issued_at = time.monotonic()
+            self.logins += 1
+            token = self.token
+        if self.on_refresh is not None:
+            self.on_refresh(token)
+        if self.max_age is not None:
+            self._start_keep_alive()
+        return token
+
+    def adopt(self, token: str, age: float = 0.0, verify: Optional[Callable[[], Any]] = None) -> None:
+        """
+        Use an existing session token, such as one restored from a SessionStore, without logging in.
+
+        An invalid token is replaced by the usual single re-login on its first auth failure.
+        A non-idempotent request is not replayed after that re-login, so ``verify`` (a cheap
+        idempotent request) is sent first when the first such request comes before any other.
+
+        :param token: The session token.
+        :param age: Seconds since the session was created.
+        :param verify: Optional callable sending an idempotent request through this manager.
+        """
+        with self._lock:
+            self.token = token
+            self.issued_at = time.monotonic() - max(0.0, age)
+            self._verify = verify
+        if self.max_age is not None:
+            self._start_keep_alive()
+
+    def ensure(self) -> str:
+        """
+        Return the current token, logging in first if there is none.
+        """
+        token = self.token
+        return token if token is not None else self._login_unless(lambda current: current is not None)
+
+    def request(self, method: str, url: str, idempotent: Optional[bool] = None, **kwargs: Any) -> requests.Response:
+        """
+        Send an authenticated request, re-logging in once on an auth failure.
+
+        The 'Session' header is set to the current token. After a re-login the request is
+        sent again only when it is idempotent; otherwise the failed response is returned.
+
+        :param method: HTTP method (e.g., "GET", "POST").
+        :param url: The full URL of the request.
+        :param idempotent: Whether the request may be replayed (defaults to True for GET, PUT, DELETE, ...).
+        :param kwargs: Extra keyword arguments forwarded to Transport.request.
+        :return: The HTTP response.
+        """
+        if idempotent is None:
+            idempotent = method.upper() in IDEMPOTENT_METHODS
+        headers = dict(kwargs.pop("headers", None) or {})
+
+        if not idempotent and self._verify is not None:
+            with self._lock:
+                verify, self._verify = self._verify, None
+            if verify is not None:
+                verify()
+
+        token = self.ensure()
+        headers["Session"] = token
+        response = self._send(method, url, headers, kwargs, idempotent)
+        if idempotent:
+            # Any answer to a replayable request settles whether an adopted token is valid
+            self._verify = None
+        if response.status_code not in self.auth_statuses:
+            return response
+
+        self.auth_failures += 1
+        new_token = self.refresh(token)
+        if not idempotent:
+            return response
+
+        response.close()
+        self.replays += 1
+        headers["Session"] = new_token
+        return self._send(method, url, headers, kwargs, idempotent)
+
+    def _send(self, method: str, url: str, headers: dict, kwargs: dict, idempotent: bool) -> requests.Response:
+        endpoint = classify_endpoint(url)
+        attempt = 0
+        while True:
+            attempt += 1
+            if self.retry is not None:
+                self.retry.before_request(endpoint)
+            try:
+                response = self._send_once(method, url, headers, kwargs)
+            except requests.RequestException as e:
+                if self.retry is None or not self.retry.retry_error(endpoint, attempt, e, idempotent):
+                    raise
+                self.retry.backoff(endpoint, attempt)
+                continue
+
+            if self.retry is not None:
+                retry = self.retry.retry_response(endpoint, attempt, response.status_code, idempotent)
+            else:
+                # The next acquire() waits out any Retry-After before the request is sent again
+                retry = (
+                    self.concurrency is not None and idempotent
+                    and self.concurrency.is_throttle(response.status_code) and attempt <= self.throttle_retries
+                )
+            if not retry:
+                return response
+            response.close()
+            if self.retry is not None:
+                self.retry.backoff(endpoint, attempt, parse_retry_after(response.headers.get("Retry-After")))
+
+    def _send_once(self, method: str, url: str, headers: dict, kwargs: dict) -> requests.Response:
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire_url(url)
+        if self.concurrency is None:
+            return self.transport.request(method, url, headers=headers, **kwargs)
+
+        self.concurrency.acquire()
+        status = retry_after = None
+        started = time.monotonic()
+        try:
+            response = self.transport.request(method, url, headers=headers, **kwargs)
+            status = response.status_code
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        finally:
+            self.concurrency.release(status, time.monotonic() - started, retry_after)
+        return response
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        """
+        Send an authenticated GET request.
+        """
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> requests.Response:
+        """
+        Send an authenticated POST request (replayed after a re-login only with ``idempotent=True``).
+        """
+        return self.request("POST", url, **kwargs)
+
+    def _start_keep_alive(self) -> None:
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._keep_alive, name="pygcapi-session", daemon=True)
+            self._thread.start()
+
+    def _keep_alive(self) -> None:
+        delay = max(0.0, self.max_age - self.refresh_margin - (self.age or 0.0))
+        while not self._stop.wait(delay):
+            token = self.token
+            if (self.age or 0.0) >= self.max_age - self.refresh_margin:
+                try:
+                    self.refresh(token)
+                except Exception:
+                    # Keep the old token; a caller hitting an auth failure will log in again
+                    self._stop.wait(REFRESH_RETRY_DELAY)
+            delay = max(0.0, self.max_age - self.refresh_margin - (self.age or 0.0))
+
+    def close(self) -> None:
+        """
+        Stop the background refresh thread.
+        """
+        self._stop.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+        self._thread = None
@@ -0,0 +1,96 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+from typing import Optional, Dict, Any
+
+# Default directory holding one token file per username and appkey
+DEFAULT_SESSION_DIR = os.path.join(os.path.expanduser("~"), ".pygcapi", "sessions")
+
+
+class SessionStore:
+    """
+    An on-disk store of session tokens shared by the processes of one user.
+
+    Each username/appkey pair is kept in its own JSON file named after a hash of the
+    pair, so neither appears in the file name and processes never rewrite each other's
+    entries. The directory is created with mode 0700 and the files with mode 0600,
+    and files are replaced atomically. Next to the token the store keeps the time the
+    session was created and the cached trading and client account IDs.
+    """
+
+    def __init__(self, path: str = DEFAULT_SESSION_DIR, max_age: Optional[float] = None):
+        """
+        Initialize the SessionStore, creating its directory if needed.
+
+        :param path: Directory holding the token files.
+        :param max_age: Seconds after which a stored session is no longer offered (None keeps it until it fails).
+        """
+        self.path = path
+        self.max_age = max_age
+        os.makedirs(path, mode=0o700, exist_ok=True)
+
+    def _file(self, username: str, appkey: str) -> str:
+        digest = hashlib.sha256(f"{username}\0{appkey}".encode()).hexdigest()
+        return os.path.join(self.path, f"{digest[:32]}.json")
+
+    def load(self, username: str, appkey: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the stored session of a user, or None if there is none or it is too old.
+
+        :return: A dictionary with token, issued_at, trading_account_id and client_account_id.
+        """
+        try:
+            with open(self._file(username, appkey)) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not entry.get("token"):
+            return None
+        if self.max_age is not None and time.time() - entry.get("issued_at", 0) >= self.max_age:
+            return None
+        return entry
+
+    def save(
+        self,
+        username: str,
+        appkey: str,
+        token: str,
+        issued_at: Optional[float] = None,
+        trading_account_id: Optional[Any] = None,
+        client_account_id: Optional[Any] = None,
+    ) -> None:
+        """
+        Store the session of a user.
+
+        :param token: The session token.
+        :param issued_at: Unix time the session was created (defaults to now).
+        :param trading_account_id: The cached trading account ID (optional).
+        :param client_account_id: The cached client account ID (optional).
+        """
+        path = self._file(username, appkey)
+        entry = {
+            "token": token,
+            "issued_at": time.time() if issued_at is None else issued_at,
+            "trading_account_id": trading_account_id,
+            "client_account_id": client_account_id,
+        }
+        # A unique temporary file per call, so concurrent saves never replace each other's file
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    def discard(self, username: str, appkey: str) -> None:
+        """
+        Remove the stored session of a user.
+        """
+        try:
+            os.remove(self._file(username, appkey))
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,303 @@
+from __future__ import annotations
+
+import inspect
+import json
+import logging
+import random
+import re
+import time
+from dataclasses import dataclass
+from typing import Optional, List, Callable, Iterable, Any, AsyncIterator, Union
+
+from pygcapi.lazy import lazy_import
+
+# Only loaded once an asyncio client or price stream is used
+asyncio = lazy_import("asyncio")
+
+logger = logging.getLogger("pygcapi")
+
+# Reconnect backoff bounds in seconds
+RECONNECT_DELAY = 0.25
+MAX_RECONNECT_DELAY = 30.0
+
+# Per-tick scalar parse of '/Date(ms[+-HHMM])/'; the vectorized parser only pays off on arrays
+_DOTNET_DATE = re.compile(r"/Date\((-?\d+)")
+
+
+@dataclass(frozen=True, slots=True)
+class PriceTick:
+    """
+    One streamed price update.
+    """
+    market_id: str
+    price: float
+    bid: Optional[float]
+    offer: Optional[float]
+    timestamp: int  # epoch milliseconds of the tick
+    received: float  # time.time() when the tick was read from the socket
+
+    @property
+    def latency(self) -> float:
+        """
+        Seconds between the tick's timestamp and its arrival.
+        """
+        return self.received - self.timestamp / 1000.0
+
+
+class PriceStream:
+    """
+    A lightweight real-time price subscriber for a set of market IDs.
+
+    This is not a client for the production Lightstreamer price feed of the Gain
+    Capital API. It speaks a custom newline-delimited JSON protocol, served by
+    pygcapi.testing.FakeStreamingServer or a relay of your own: after connecting the
+    client sends ``{"op": "subscribe", "markets": [...], "session": ..., "username": ...}``
+    and the server answers with ``{"type": "tick", ...}`` and ``{"type": "heartbeat"}`` lines.
+
+    Ticks are delivered to registered callbacks and through ``async for``. The stream
+    reconnects with exponential backoff and jitter when the connection drops or no
+    heartbeat arrives in time. Ticks are buffered for the async iterator in a bounded
+    queue while one is running, or when no callback is registered: with
+    ``overflow="block"`` the reader stops pulling from the socket while the queue is
+    full (pushing back on the server), with ``overflow="drop_oldest"`` the oldest
+    buffered ticks are discarded instead. Callback-only consumers skip the queue, so
+    their callbacks keep firing. A callback that raises is logged and counted in
+    ``callback_errors`` without stopping the stream; if the stream itself stops on an
+    error (e.g. after ``max_reconnects``), ``async for`` re-raises it.
+
+    Usage::
+
+        stream = client.subscribe_prices(["401484347"], relay_host, relay_port)
+        async with stream:
+            async for tick in stream:
+                ...
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        market_ids: Iterable[str],
+        session: Union[str, Callable[[], Any], None] = None,
+        username: Optional[str] = None,
+        heartbeat_timeout: float = 5.0,
+        max_queue: int = 10_000,
+        overflow: str = "block",
+        reconnect_delay: float = RECONNECT_DELAY,
+        max_reconnect_delay: float = MAX_RECONNECT_DELAY,
+        max_reconnects: Optional[int] = None,
+    ):
+        """
+        Initialize the PriceStream (call start() or use ``async with``).
+
+        :param host: Streaming server host.
+        :param port: Streaming server port.
+        :param market_ids: Market IDs to subscribe to.
+        :param session: Session token sent with the subscription, or a callable returning it (a
+            coroutine function, or a blocking function run in a worker thread), called on every connect.
+        :param username: Username sent with the subscription.
+        :param heartbeat_timeout: Seconds without any message before the connection is considered dead.
+        :param max_queue: Maximum number of ticks buffered for the async iterator.
+        :param overflow: "block" to stop reading while the buffer is full, or "drop_oldest".
+        :param reconnect_delay: Initial reconnect delay in seconds.
+        :param max_reconnect_delay: Upper bound of the reconnect delay in seconds.
+        :param max_reconnects: Give up after this many consecutive failed attempts (None retries forever).
+        """
+        if overflow not in ("block", "drop_oldest"):
+            raise ValueError("overflow must be 'block' or 'drop_oldest'")
+        self.host = host
+        self.port = port
+        self.market_ids = [str(m) for m in market_ids]
+        self.session = session
+        self.username = username
+        self.heartbeat_timeout = heartbeat_timeout
+        self.overflow = overflow
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.max_reconnects = max_reconnects
+        self.max_queue = max_queue
+
+        self.ticks = 0
+        self.dropped = 0
+        self.heartbeats = 0
+        self.reconnects = 0
+        self.callback_errors = 0
+        self.connected = False
+        # Exception that stopped the reader task; re-raised to iterators
+        self.error: Optional[BaseException] = None
+
+        self._callbacks: List[Callable[[PriceTick], Any]] = []
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._closed = False
+        self._iterators = 0
+
+    def on_tick(self, callback: Callable[[PriceTick], Any]) -> Callable[[PriceTick], Any]:
+        """
+        Register a callback (plain function or coroutine function) invoked for every tick.
+
+        :return: The callback, so this can be used as a decorator.
+        """
+        self._callbacks.append(callback)
+        return callback
+
+    async def start(self) -> "PriceStream":
+        """
+        Start the background connection task.
+        """
+        self._queue = asyncio.Queue(self.max_queue)
+        self._closed = False
+        self.error = None
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        return self
+
+    async def close(self) -> None:
+        """
+        Stop the stream and wake up any pending iterator.
+        """
+        self._closed = True
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            except Exception as e:
+                # Already surfaced to iterators through self.error
+                if e is not self.error:
+                    raise
+        if self._queue is not None:
+            self._put_nowait(None)
+
+    async def __aenter__(self) -> "PriceStream":
+        return await self.start()
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    def __aiter__(self) -> AsyncIterator[PriceTick]:
+        return self._iterate()
+
+    async def _iterate(self) -> AsyncIterator[PriceTick]:
+        if self._queue is None:
+            raise RuntimeError("PriceStream.start() must be awaited before iterating")
+        # Counted while running, so ticks are only queued when someone drains the queue
+        self._iterators += 1
+        try:
+            while not (self._closed and self._queue.empty()):
+                tick = await self._queue.get()
+                if tick is None:
+                    if self.error is not None:
+                        raise self.error
+                    return
+                yield tick
+        finally:
+            self._iterators -= 1
+
+    async def _run(self) -> None:
+        try:
+            await self._read_forever()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.error = e
+            raise
+        finally:
+            # Whatever stopped the reader, pending iterators must wake up
+            self._closed = True
+            self._put_nowait(None)
+
+    async def _read_forever(self) -> None:
+        failures = 0
+        while not self._closed:
+            try:
+                await self._connect_and_read()
+            except (OSError, asyncio.TimeoutError, ConnectionError, ValueError):
+                # A connection that got as far as subscribing restarts the backoff
+                failures = 1 if self.connected else failures + 1
+            finally:
+                self.connected = False
+            if self._closed:
+                break
+            if self.max_reconnects is not None and failures > self.max_reconnects:
+                raise ConnectionError(f"Price stream gave up after {failures} failed connection attempts")
+            delay = min(self.max_reconnect_delay, self.reconnect_delay * 2 ** max(failures - 1, 0))
+            await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+            self.reconnects += 1
+
+    async def _connect_and_read(self) -> None:
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port), timeout=self.heartbeat_timeout
+        )
+        try:
+            subscribe = {"op": "subscribe", "markets": self.market_ids, "session": await self._session(), "username": self.username}
+            writer.write(json.dumps(subscribe).encode() + b"\n")
+            await writer.drain()
+            self.connected = True
+
+            while not self._closed:
+                line = await asyncio.wait_for(reader.readline(), timeout=self.heartbeat_timeout)
+                if not line:
+                    raise ConnectionError("Price stream closed by server")
+                message = json.loads(line)
+                kind = message.get("type")
+                if kind == "tick":
+                    await self._dispatch(self._to_tick(message))
+                elif kind == "heartbeat":
+                    self.heartbeats += 1
+                elif kind == "error":
+                    raise ConnectionError(message.get("message", "Price stream error"))
+        finally:
+            writer.close()
+
+    async def _session(self) -> Optional[str]:
+        if not callable(self.session):
+            return self.session
+        if inspect.iscoroutinefunction(self.session):
+            return await self.session()
+        # A blocking login must not stall the event loop
+        return await asyncio.to_thread(self.session)
+
+    @staticmethod
+    def _to_tick(message: dict) -> PriceTick:
+        timestamp = message.get("TickDate")
+        if isinstance(timestamp, str):
+            match = _DOTNET_DATE.match(timestamp)
+            timestamp = int(match.group(1)) if match else 0
+        return PriceTick(
+            market_id=str(message.get("MarketId")),
+            price=message.get("Price"),
+            bid=message.get("Bid"),
+            offer=message.get("Offer"),
+            timestamp=int(timestamp or 0),
+            received=time.time(),
+        )
+
+    async def _dispatch(self, tick: PriceTick) -> None:
+        self.ticks += 1
+        for callback in self._callbacks:
+            # A failing callback must not take the reader task, and every other consumer, down with it
+            try:
+                result = callback(tick)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception:
+                self.callback_errors += 1
+                logger.exception("Price stream callback %r failed", callback)
+
+        if self._callbacks and not self._iterators:
+            return
+        if self.overflow == "block":
+            # Waiting here stops reads from the socket, so TCP flow control slows the server
+            await self._queue.put(tick)
+        else:
+            self._put_nowait(tick)
+
+    def _put_nowait(self, item: Optional[PriceTick]) -> None:
+        while True:
+            try:
+                self._queue.put_nowait(item)
+                return
+            except asyncio.QueueFull:
+                self._queue.get_nowait()
+                self.dropped += 1
@@ -0,0 +1,454 @@
+import asyncio
+import json
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Dict, Any, List, Tuple, Callable
+from urllib.parse import urlparse, parse_qs
+
+from pygcapi.utils import INTERVAL_SECONDS
+
+# A route handler receives (match, query, body) and returns (status, payload, extra headers)
+Handler = Callable[[re.Match, Dict[str, str], Any], Tuple[int, Any, Dict[str, str]]]
+
+
+def synthetic_bars(from_ts: int, to_ts: int, interval: str = "MINUTE", span: int = 1, max_results: int = 4000) -> List[Dict]:
+    """
+    Build a deterministic list of '/Date(...)'-stamped OHLC bars covering [from_ts, to_ts].
+
+    :param from_ts: Start Unix timestamp (seconds).
+    :param to_ts: End Unix timestamp (seconds).
+    :param interval: The bar interval (e.g., "MINUTE", "HOUR").
+    :param span: The span size for the given interval.
+    :param max_results: The maximum number of bars to return.
+    :return: A list of bar dictionaries in the API's PriceBars format.
+    """
+    step = INTERVAL_SECONDS.get(interval.upper(), 60) * int(span)
+    start = -(-int(from_ts) // step) * step
+    bars = []
+    for ts in range(start, int(to_ts) + 1, step):
+        if len(bars) >= max_results:
+            break
+        base = 1.0 + (ts // step % 1000) * 1e-4
+        bars.append({
+            "BarDate": f"/Date({ts * 1000})/",
+            "Open": base,
+            "High": base + 5e-4,
+            "Low": base - 5e-4,
+            "Close": base + 1e-4,
+        })
+    return bars
+
+
+def synthetic_ticks(from_ts: int, to_ts: int, max_results: int = 4000, step: int = 1) -> List[Dict]:
+    """
+    Build a deterministic list of '/Date(...)'-stamped price ticks covering [from_ts, to_ts].
+
+    :param from_ts: Start Unix timestamp (seconds).
+    :param to_ts: End Unix timestamp (seconds).
+    :param max_results: The maximum number of ticks to return.
+    :param step: Seconds between consecutive ticks.
+    :return: A list of tick dictionaries in the API's PriceTicks format.
+    """
+    ticks = []
+    for ts in range(int(from_ts), int(to_ts) + 1, step):
+        if len(ticks) >= max_results:
+            break
+        ticks.append({"TickDate": f"/Date({ts * 1000})/", "Price": 1.0 + (ts % 1000) * 1e-4})
+    return ticks
+
+
+class StubApiServer:
+    """
+    A local, threaded HTTP/1.1 stand-in for the Gain Capital REST API.
+
+    Serves canned or synthetic responses for the endpoints used by the clients so
+    that tests and benchmarks can run offline. The server keeps connections alive
+    and counts how many TCP connections and requests it has seen, which makes
+    connection reuse directly observable. With ``require_session`` every request must
+    carry a session token issued by the stub, and expire_sessions() invalidates them.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0, require_session: bool = False):
+        """
+        Initialize the stub server (call start() or use it as a context manager).
+
+        :param host: Interface to bind to.
+        :param port: Port to bind to (0 picks a free port).
+        :param latency: Artificial per-request delay in seconds.
+        :param require_session: Whether requests without a valid 'Session' header get HTTP 401.
+        """
+        self.latency = latency
+        self.require_session = require_session
+        self.connections = 0
+        self.requests = 0
+        self.logins = 0
+        self.sessions: set = set()
+        self.calls: List[Tuple[str, str]] = []
+        self._routes: List[Tuple[str, re.Pattern, Handler]] = []
+        self._lock = threading.Lock()
+        self._install_default_routes()
+
+        stub = self
+
+        class _RequestHandler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                with stub._lock:
+                    stub.connections += 1
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                stub._dispatch(self, "GET")
+
+            def do_POST(self):
+                stub._dispatch(self, "POST")
+
+        class _Server(ThreadingHTTPServer):
+            daemon_threads = True
+
+            def handle_error(self, request, client_address):
+                # Clients dropping pooled connections are expected; report anything else
+                if not isinstance(sys.exc_info()[1], ConnectionError):
+                    super().handle_error(request, client_address)
+
+        self._server = _Server((host, port), _RequestHandler)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """
+        The root URL of the running server.
+        """
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def base_url_v1(self) -> str:
+        """
+        Stand-in for GCapiClientV1.BASE_URL / GCapiClientV2.BASE_URL_V1.
+        """
+        return f"{self.url}/TradingAPI"
+
+    @property
+    def base_url_v2(self) -> str:
+        """
+        Stand-in for GCapiClientV2.BASE_URL_V2.
+        """
+        return f"{self.url}/v2"
+
+    def route(self, method: str, pattern: str, handler: Handler) -> None:
+        """
+        Register a handler, taking precedence over previously registered routes.
+
+        :param method: HTTP method to match.
+        :param pattern: Regular expression matched against the request path.
+        :param handler: Callable returning (status, payload, headers).
+        """
+        self._routes.insert(0, (method.upper(), re.compile(pattern), handler))
+
+    def respond(self, method: str, pattern: str, payload: Any, status: int = 200, headers: Optional[Dict[str, str]] = None) -> None:
+        """
+        Register a fixed response for a method and path pattern.
+        """
+        self.route(method, pattern, lambda match, query, body: (status, payload, headers or {}))
+
+    def _install_default_routes(self) -> None:
+        def session(match, query, body):
+            with self._lock:
+                self.logins += 1
+                token = f"stub-session-{self.logins}"
+                self.sessions.add(token)
+            return 200, {"Session": token, "session": token}, {}
+
+        def bars(match, query, body):
+            return 200, {"PriceBars": synthetic_bars(
+                int(query.get("fromTimeStampUTC", 0)),
+                int(query.get("toTimeStampUTC", 0)),
+                query.get("interval", "MINUTE"),
+                int(query.get("span", 1)),
+                int(query.get("maxResults", 4000)),
+            )}, {}
+
+        def ticks(match, query, body):
+            return 200, {"PriceTicks": synthetic_ticks(
+                int(query.get("fromTimeStampUTC", 0)),
+                int(query.get("toTimeStampUTC", 0)),
+                int(query.get("maxResults", 4000)),
+            )}, {}
+
+        def markets(match, query, body):
+            name = query.get("marketName", "EUR/USD")
+            return 200, {"Markets": [{"MarketId": 401484347, "Name": name}]}, {}
+
+        def account(match, query, body):
+            return 200, {
+                "TradingAccounts": [{"TradingAccountId": 1, "ClientAccountId": 2}],
+                "tradingAccounts": [{"tradingAccountId": 1, "clientAccountId": 2}],
+            }, {}
+
+        def order(match, query, body):
+            return 200, {"StatusReason": 1, "Status": 1, "OrderId": 1000 + self.requests, "Orders": [
+                {"OrderId": 1000 + self.requests, "StatusReason": 1}
+            ], "Actions": []}, {}
+
+        self.route("POST", r"/(TradingAPI|v2)/session$", session)
+        self.route("GET", r"/market/[^/]+/barhistorybetween$", bars)
+        self.route("GET", r"/market/[^/]+/tickhistorybetween$", ticks)
+        self.route("GET", r"/cfd/markets$", markets)
+        self.route("GET", r"/UserAccount/ClientAndTradingAccount$", account)
+        self.route("POST", r"/order/newtradeorder$", order)
+        self.respond("GET", r"/order/openpositions$", {"OpenPositions": []})
+        self.respond("POST", r"/order/activeorders$", {"ActiveOrders": []})
+        self.respond("GET", r"/order/tradehistory$", {"TradeHistory": []})
+
+    def _dispatch(self, handler: BaseHTTPRequestHandler, method: str) -> None:
+        parsed = urlparse(handler.path)
+        query = {k: v[-1] for k, v in parse_qs(parsed.query).items()}
+        length = int(handler.headers.get("Content-Length") or 0)
+        raw = handler.rfile.read(length) if length else b""
+        try:
+            body = json.loads(raw) if raw else None
+        except ValueError:
+            body = raw
+
+        with self._lock:
+            self.requests += 1
+            self.calls.append((method, parsed.path))
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        status, payload, headers = 404, {"ErrorMessage": f"No stub route for {method} {parsed.path}"}, {}
+        if self.require_session and not parsed.path.endswith("/session") and handler.headers.get("Session") not in self.sessions:
+            status, payload = 401, {"ErrorMessage": "Session is not valid", "ErrorCode": 4011}
+        else:
+            for route_method, pattern, route_handler in self._routes:
+                match = pattern.search(parsed.path)
+                if route_method == method and match:
+                    status, payload, headers = route_handler(match, query, body)
+                    break
+
+        self._write(handler, status, payload, headers)
+
+    @staticmethod
+    def _write(handler: BaseHTTPRequestHandler, status: int, payload: Any, headers: Dict[str, str]) -> None:
+        data = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(data)))
+        for name, value in headers.items():
+            handler.send_header(name, value)
+        handler.end_headers()
+        handler.wfile.write(data)
+
+    def expire_sessions(self) -> None:
+        """
+        Invalidate every session token issued so far.
+        """
+        with self._lock:
+            self.sessions.clear()
+
+    def start(self) -> "StubApiServer":
+        """
+        Start serving on a background thread.
+        """
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """
+        Stop serving and close the listening socket.
+        """
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "StubApiServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+class ThrottlingStubServer(StubApiServer):
+    """
+    A StubApiServer that behaves like an API under load.
+
+    At most ``capacity`` requests are served at once and each one takes longer the
+    more requests are in flight (``latency * (1 + in_flight / capacity)``). Requests
+    beyond the capacity are rejected straight away with ``status`` (429 by default)
+    and a Retry-After header. Used to test and benchmark adaptive concurrency.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.01,
+        capacity: int = 8,
+        retry_after: Optional[float] = 0.05,
+        status: int = 429,
+        **kwargs: Any,
+    ):
+        """
+        Initialize the throttling stub server.
+
+        :param host: Interface to bind to.
+        :param port: Port to bind to (0 picks a free port).
+        :param latency: Service time in seconds of a request on an idle server.
+        :param capacity: Number of requests served concurrently before throttling.
+        :param retry_after: Seconds sent in the Retry-After header of rejected requests (None omits it).
+        :param status: Status code of rejected requests (429 or 503).
+        :param kwargs: Extra StubApiServer options.
+        """
+        super().__init__(host, port, **kwargs)
+        self.service_time = latency
+        self.capacity = capacity
+        self.retry_after = retry_after
+        self.throttle_status = status
+        self.throttled = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    def _dispatch(self, handler: BaseHTTPRequestHandler, method: str) -> None:
+        with self._lock:
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            load = self.in_flight
+        try:
+            if load > self.capacity:
+                length = int(handler.headers.get("Content-Length") or 0)
+                if length:
+                    handler.rfile.read(length)
+                with self._lock:
+                    self.throttled += 1
+                headers = {"Retry-After": f"{self.retry_after:g}"} if self.retry_after is not None else {}
+                self._write(handler, self.throttle_status, {"ErrorMessage": "Too many requests"}, headers)
+                return
+            time.sleep(self.service_time * (1 + load / self.capacity))
+            super()._dispatch(handler, method)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+class FakeStreamingServer:
+    """
+    A local stand-in for the price streaming server used by PriceStream.
+
+    Accepts newline-delimited JSON subscriptions and pushes synthetic ticks for the
+    subscribed markets at ``tick_rate`` ticks per second per connection, plus
+    heartbeats. Writes wait for the socket to drain, so a slow consumer applies
+    backpressure. Connections can be dropped or silenced to exercise reconnects and
+    heartbeat timeouts.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, tick_rate: float = 1000.0,
+                 heartbeat_interval: float = 0.5, max_ticks: Optional[int] = None):
+        """
+        Initialize the fake streaming server (await start() or use ``async with``).
+
+        :param host: Interface to bind to.
+        :param port: Port to bind to (0 picks a free port).
+        :param tick_rate: Ticks pushed per second on each connection.
+        :param heartbeat_interval: Seconds between heartbeats.
+        :param max_ticks: Stop pushing ticks on a connection after this many (None is unlimited).
+        """
+        self.host = host
+        self.port = port
+        self.tick_rate = tick_rate
+        self.heartbeat_interval = heartbeat_interval
+        self.max_ticks = max_ticks
+        self.silent = False
+        self.connections = 0
+        self.subscriptions: List[Dict] = []
+        self.ticks_sent = 0
+        self._server = None
+        self._writers: List[Any] = []
+        self._handlers: List[Any] = []
+
+    async def start(self) -> "FakeStreamingServer":
+        """
+        Start listening.
+        """
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self) -> None:
+        """
+        Close every connection and stop listening.
+        """
+        self.drop_connections()
+        self._server.close()
+        await asyncio.gather(*self._handlers, return_exceptions=True)
+        await self._server.wait_closed()
+
+    def drop_connections(self) -> None:
+        """
+        Abruptly close all client connections.
+        """
+        for writer in self._writers:
+            writer.close()
+        self._writers = []
+
+    async def __aenter__(self) -> "FakeStreamingServer":
+        return await self.start()
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.stop()
+
+    async def _handle(self, reader, writer) -> None:
+        self._handlers.append(asyncio.current_task())
+        self.connections += 1
+        self._writers.append(writer)
+        try:
+            request = json.loads(await reader.readline() or b"{}")
+            if request.get("op") != "subscribe":
+                writer.write(b'{"type": "error", "message": "expected subscribe"}\n')
+                return
+            self.subscriptions.append(request)
+            markets = request.get("markets") or []
+
+            # Send ticks in small bursts so high rates do not depend on sleep granularity
+            burst_interval = 0.005
+            per_burst = max(1, int(self.tick_rate * burst_interval))
+            last_heartbeat = time.monotonic()
+            sent = 0
+            while not writer.is_closing():
+                if self.silent:
+                    await asyncio.sleep(burst_interval)
+                    continue
+                lines = []
+                if self.max_ticks is None or sent < self.max_ticks:
+                    now_ms = int(time.time() * 1000)
+                    for i in range(per_burst):
+                        market = markets[(sent + i) % len(markets)] if markets else "0"
+                        price = 1.0 + ((sent + i) % 1000) * 1e-4
+                        lines.append(json.dumps({
+                            "type": "tick", "MarketId": market, "Price": price,
+                            "Bid": price - 1e-4, "Offer": price + 1e-4, "TickDate": f"/Date({now_ms})/",
+                        }))
+                    sent += per_burst
+                    self.ticks_sent += per_burst
+                if time.monotonic() - last_heartbeat >= self.heartbeat_interval:
+                    lines.append('{"type": "heartbeat"}')
+                    last_heartbeat = time.monotonic()
+                if lines:
+                    writer.write(("\n".join(lines) + "\n").encode())
+                    await writer.drain()
+                await asyncio.sleep(burst_interval)
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            if writer in self._writers:
+                self._writers.remove(writer)
+            writer.close()
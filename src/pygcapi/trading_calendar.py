@@ -0,0 +1,151 @@
+from typing import Optional, Dict, List, Tuple, Iterable
+
+DAY_SECONDS = 86400
+WEEK_SECONDS = 7 * DAY_SECONDS
+# Unix time of Monday 1970-01-05 00:00 UTC, the origin of weekly session offsets
+_FIRST_MONDAY = 4 * DAY_SECONDS
+
+
+def weekly_offset(weekday: int, hhmm: str) -> int:
+    """
+    Return the offset in seconds of a UTC weekday and time from Monday 00:00 UTC.
+
+    :param weekday: 0 for Monday through 6 for Sunday.
+    :param hhmm: The time of day as "HH:MM".
+    """
+    hours, minutes = (int(part) for part in hhmm.split(":"))
+    return weekday * DAY_SECONDS + hours * 3600 + minutes * 60
+
+
+def merge_intervals(intervals: Iterable[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """
+    Merge half-open [start, end) intervals that overlap or touch.
+    """
+    merged: List[Tuple[int, int]] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        elif start < end:
+            merged.append((start, end))
+    return merged
+
+
+class TradingCalendar:
+    """
+    A market that is always open; the base class of trading calendars.
+
+    Calendars tell the interval planner (utils.plan_intervals) when bars can exist,
+    so that requests are laid out over trading time only. Subclasses override
+    open_intervals().
+    """
+
+    def open_intervals(self, from_ts: int, to_ts: int) -> List[Tuple[int, int]]:
+        """
+        Return the half-open [start, end) periods within [from_ts, to_ts] during which the market is open.
+
+        :param from_ts: Start Unix timestamp (seconds).
+        :param to_ts: End Unix timestamp (seconds), inclusive.
+        :return: Non-overlapping periods in time order.
+        """
+        return [(int(from_ts), int(to_ts) + 1)] if from_ts <= to_ts else []
+
+    def is_open(self, ts: int) -> bool:
+        """
+        Whether the market is open at a Unix timestamp.
+        """
+        return bool(self.open_intervals(ts, ts))
+
+    def for_market(self, market_id: str) -> "TradingCalendar":
+        """
+        Return the calendar of a market; a single calendar applies to every market.
+        """
+        return self
+
+
+class WeeklyCalendar(TradingCalendar):
+    """
+    A market open during the same weekly sessions every week, minus closed periods such as holidays.
+    """
+
+    def __init__(self, sessions: Iterable[Tuple[int, int]], closed: Iterable[Tuple[int, int]] = ()):
+        """
+        Initialize the WeeklyCalendar.
+
+        :param sessions: (open, close) offsets in seconds from Monday 00:00 UTC (see weekly_offset);
+            a close before its open wraps over the end of the week.
+        :param closed: Extra closed periods as half-open [start, end) Unix timestamps (e.g., holidays).
+        """
+        windows = []
+        for open_at, close_at in sessions:
+            if close_at <= open_at:
+                windows += [(open_at, WEEK_SECONDS), (0, close_at)]
+            else:
+                windows.append((open_at, close_at))
+        self.sessions = merge_intervals(windows)
+        self.closed = merge_intervals(closed)
+
+    @classmethod
+    def fx(cls, closed: Iterable[Tuple[int, int]] = ()) -> "WeeklyCalendar":
+        """
+        The FX week: open from Sunday 21:00 to Friday 22:00 UTC.
+
+        The open is taken at the earlier of the summer and winter times (21:00/22:00 UTC), so no
+        trading time is lost around daylight saving changes.
+
+        :param closed: Extra closed periods (e.g., Christmas Day, New Year's Day).
+        """
+        return cls([(weekly_offset(6, "21:00"), weekly_offset(4, "22:00"))], closed=closed)
+
+    def open_intervals(self, from_ts: int, to_ts: int) -> List[Tuple[int, int]]:
+        from_ts, stop = int(from_ts), int(to_ts) + 1
+        if from_ts >= stop:
+            return []
+        week = (from_ts - _FIRST_MONDAY) // WEEK_SECONDS * WEEK_SECONDS + _FIRST_MONDAY
+        periods = []
+        while week < stop:
+            for open_at, close_at in self.sessions:
+                start, end = max(week + open_at, from_ts), min(week + close_at, stop)
+                if start < end:
+                    periods.append((start, end))
+            week += WEEK_SECONDS
+        periods = merge_intervals(periods)
+        for closed_start, closed_end in self.closed:
+            periods = [
+                piece
+                for start, end in periods
+                for piece in ((start, min(end, closed_start)), (max(start, closed_end), end))
+                if piece[0] < piece[1]
+            ]
+        return periods
+
+
+class MarketCalendars:
+    """
+    Per-market trading calendars with a fallback for markets without their own.
+    """
+
+    def __init__(self, default: Optional[TradingCalendar] = None, calendars: Optional[Dict[str, TradingCalendar]] = None):
+        """
+        Initialize the MarketCalendars.
+
+        :param default: The calendar of unregistered markets (defaults to always open).
+        :param calendars: Optional calendars keyed by market ID.
+        """
+        self.default = default if default is not None else ALWAYS_OPEN
+        self._calendars = {str(market_id): calendar for market_id, calendar in (calendars or {}).items()}
+
+    def register(self, market_id: str, calendar: TradingCalendar) -> None:
+        """
+        Set the calendar of a market.
+        """
+        self._calendars[str(market_id)] = calendar
+
+    def for_market(self, market_id: str) -> TradingCalendar:
+        """
+        Return the calendar registered for a market, or the default.
+        """
+        return self._calendars.get(str(market_id), self.default)
+
+
+ALWAYS_OPEN = TradingCalendar()
+FX_CALENDAR = WeeklyCalendar.fx()
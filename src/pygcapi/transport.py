@@ -0,0 +1,120 @@
+import threading
+from typing import Optional, Any
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class Transport:
+    """
+    A pooled, keep-alive HTTP transport shared by the Gain Capital API clients.
+
+    Wraps a persistent ``requests.Session`` so that consecutive calls to the API
+    reuse the same TCP+TLS connections instead of opening a new one per request.
+    A single Transport can be injected into several GCapiClientV1/GCapiClientV2
+    instances to share one connection pool between them.
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = 4,
+        pool_maxsize: int = 16,
+        pool_block: bool = False,
+        keep_alive: bool = True,
+        timeout: Optional[float] = 30.0,
+    ):
+        """
+        Initialize the Transport and mount pooled adapters for HTTP and HTTPS.
+
+        :param pool_connections: Number of per-host connection pools to cache.
+        :param pool_maxsize: Maximum number of connections kept alive per host.
+        :param pool_block: Whether to block when a host's pool is exhausted instead of opening extra connections.
+        :param keep_alive: Whether to keep connections open between requests.
+        :param timeout: Default timeout in seconds applied to every request (None disables it).
+        """
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.keep_alive = keep_alive
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self.session = self._build_session()
+
+    def _build_session(self) -> requests.Session:
+        """
+        Create a requests.Session with pooled adapters mounted.
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block,
+            max_retries=0,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        if not self.keep_alive:
+            session.headers["Connection"] = "close"
+        return session
+
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        """
+        Send an HTTP request through the pooled session.
+
+        :param method: HTTP method (e.g., "GET", "POST").
+        :param url: The full URL of the request.
+        :param kwargs: Extra keyword arguments forwarded to ``requests.Session.request``.
+        :return: The HTTP response.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session.request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        """
+        Send a GET request through the pooled session.
+        """
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> requests.Response:
+        """
+        Send a POST request through the pooled session.
+        """
+        return self.request("POST", url, **kwargs)
+
+    def reset(self) -> None:
+        """
+        Drop every pooled connection and start from a fresh session.
+        """
+        with self._lock:
+            old_session = self.session
+            self.session = self._build_session()
+        old_session.close()
+
+    def close(self) -> None:
+        """
+        Close the underlying session and release its pooled connections.
+        """
+        self.session.close()
+
+    def __enter__(self) -> "Transport":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+_default_transport: Optional[Transport] = None
+_default_lock = threading.Lock()
+
+
+def get_default_transport() -> Transport:
+    """
+    Return the process-wide Transport shared by clients created without one.
+
+    :return: The shared Transport instance.
+    """
+    global _default_transport
+    with _default_lock:
+        if _default_transport is None:
+            _default_transport = Transport()
+        return _default_transport
@@ -1,8 +1,14 @@
-from datetime import datetime
+from __future__ import annotations
+
+from datetime import datetime, timezone
 import calendar
 from typing import List, Dict, Tuple
-import pandas as pd
-import re
+
+from pygcapi.lazy import lazy_import
+from pygcapi import records
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
 
 # Lookup Tables
 order_status_descriptions = {
@@ -572,31 +578,273 @@ def get_order_action_type_description(action_type_code: int) -> str:
     """
     return order_action_type_descriptions.get(action_type_code, "Unknown action type code")
 
+# Length in seconds of one unit of each bar interval accepted by barhistorybetween
+INTERVAL_SECONDS = {
+    "MINUTE": 60,
+    "HOUR": 3600,
+    "DAY": 86400,
+    "WEEK": 604800,
+}
+
+def interval_seconds(interval: str, span: int = 1) -> int:
+    """
+    Return the length in seconds of a bar with the given interval and span.
+    """
+    try:
+        return INTERVAL_SECONDS[interval.upper()] * int(span)
+    except KeyError:
+        raise ValueError(f"Unsupported bar interval: {interval}")
+
+def shift_months(ts: int, months: int) -> int:
+    """
+    Move a Unix UTC timestamp by a number of calendar months, clamping the day to the target month's length
+    (like pd.DateOffset(months=...)).
+    """
+    dt = datetime.fromtimestamp(int(ts), tz=timezone.utc)
+    index = dt.year * 12 + dt.month - 1 + months
+    year, month = divmod(index, 12)
+    day = min(dt.day, calendar.monthrange(year, month + 1)[1])
+    return int(dt.replace(year=year, month=month + 1, day=day).timestamp())
+
+
+def plan_intervals(
+    from_ts: int,
+    to_ts: int,
+    interval: str = "MINUTE",
+    span: int = 1,
+    max_results: int = 4000,
+    calendar=None,
+) -> List[Tuple[int, int]]:
+    """
+    Compute (start, stop) Unix UTC timestamps of get_ohlc requests covering [from_ts, to_ts].
+
+    Each chunk spans exactly ``max_results`` bar lengths, so it holds at most
+    ``max_results`` bars and only the last chunk is partly filled. Chunks are
+    inclusive and do not overlap. The boundaries are computed arithmetically,
+    without building a time index.
+
+    With a trading calendar, chunks are packed with ``max_results`` bars of trading
+    time instead: closed periods (e.g., FX weekends) cost no request capacity and
+    chunks start and end around them. Every open period is budgeted for one extra
+    bar, the bar straddling its open, so no chunk can exceed ``max_results`` bars;
+    when that makes the calendar layout no shorter, the continuous one is used.
+
+    :param from_ts: Start Unix timestamp (seconds).
+    :param to_ts: End Unix timestamp (seconds).
+    :param interval: The interval of OHLC data (e.g., "MINUTE", "HOUR").
+    :param span: The span size for the given interval.
+    :param max_results: The maximum number of bars per request.
+    :param calendar: Optional TradingCalendar (see pygcapi.trading_calendar) of the market.
+    :return: A list of (start, stop) tuples in time order.
+    """
+    if max_results < 1:
+        raise ValueError("max_results must be at least 1")
+    from_ts, to_ts = int(from_ts), int(to_ts)
+    width = interval_seconds(interval, span)
+    step = width * max_results
+    continuous = [(start, min(start + step - 1, to_ts)) for start in range(from_ts, to_ts + 1, step)]
+    if calendar is None:
+        return continuous
+    if max_results < 2:
+        raise ValueError("max_results must be at least 2 with a calendar")
+
+    chunks: List[Tuple[int, int]] = []
+    start = None
+    budget = max_results
+    last_close = from_ts
+    for open_at, close_at in calendar.open_intervals(from_ts, to_ts):
+        # A bar stamped up to one bar length before the open can hold its first trades
+        lead = max(open_at - width + 1, from_ts, chunks[-1][1] + 1 if chunks else from_ts)
+        if start is None:
+            start = lead
+        while True:
+            # At most ceil(length / width) + 1 bars of any alignment overlap [open_at, close_at)
+            needed = -(-(close_at - open_at) // width) + 1
+            if needed <= budget:
+                budget -= needed
+                break
+            cut = open_at + (budget - 1) * width if budget >= 2 else max(lead, start + 1)
+            chunks.append((start, cut - 1))
+            start, open_at, budget = cut, max(open_at, cut), max_results
+        last_close = close_at
+    if start is not None:
+        chunks.append((start, min(last_close - 1, to_ts)))
+    # For bars as long as the closed periods (e.g., daily or weekly bars) the per-period margin outweighs the savings
+    return chunks if len(chunks) < len(continuous) else continuous
+
+
 def extract_every_nth(n_months: int = 6, by_time: str = '15min', n: int = 3900):
     """
     Generate start and stop Unix UTC timestamps for API requests.
+    Consecutive intervals share their boundary; see plan_intervals for chunks sized by bar length.
+    """
+    end_utc = int(datetime.now(timezone.utc).timestamp())
+    start_utc = shift_months(end_utc, -n_months)
+
+    try:
+        step = int(pd.Timedelta(by_time).total_seconds())
+    except ValueError:
+        step = 0
+    if step <= 0:
+        # Calendar frequencies (e.g., month ends) have no fixed length, so walk their date range
+        time_seq = pd.date_range(start=pd.Timestamp(start_utc, unit="s"), end=pd.Timestamp(end_utc, unit="s"), freq=by_time, tz="UTC")
+        stamps = [int(ts.timestamp()) for ts in time_seq]
+        return [(stamps[i], stamps[min(i + n, len(stamps) - 1)]) for i in range(0, len(stamps), n)]
+
+    # The points of the fixed-frequency range are start_utc + k * step; only every n-th is needed
+    count = (end_utc - start_utc) // step + 1
+    return [
+        (start_utc + i * step, start_utc + min(i + n, count - 1) * step)
+        for i in range(0, count, n)
+    ]
+
+
+def build_order_details(
+    quantity: float,
+    offer_price: float,
+    bid_price: float,
+    direction: str,
+    market_id: str,
+    market_name: str,
+    trading_account_id=None,
+    client_account_id=None,
+    stop_loss: float = None,
+    take_profit: float = None,
+    trigger_price: float = None,
+    close: bool = False,
+    order_id: str = None,
+    tolerance: float = None,
+) -> dict:
+    """
+    Build the request body for a '/order/newtradeorder' call.
+
+    :param quantity: Quantity to trade.
+    :param offer_price: Offer price for the trade.
+    :param bid_price: Bid price for the trade.
+    :param direction: Direction of the trade ("buy" or "sell").
+    :param market_id: Market ID.
+    :param market_name: Market name.
+    :param trading_account_id: The trading account placing the order.
+    :param client_account_id: The client account placing the order.
+    :param stop_loss: Stop loss price (optional).
+    :param take_profit: Take profit price (optional).
+    :param trigger_price: Trigger price (optional).
+    :param close: Whether to close the trade (optional).
+    :param order_id: Order ID (optional).
+    :param tolerance: Price tolerance (optional).
+    :return: The order details as a dictionary.
+    """
+    # Adjust bid and offer prices based on tolerance
+    if tolerance is not None:
+        bid_price -= tolerance * 0.0001
+        offer_price += tolerance * 0.0001
+
+    order_details = {
+        "MarketId": market_id,
+        "Direction": direction,
+        "Quantity": quantity,
+        "OfferPrice": offer_price,
+        "BidPrice": bid_price,
+        "TradingAccountId": trading_account_id,
+        "MarketName": market_name,
+        "AutoRollover": False,
+        "IfDone": [],
+        "OcoOrder": None,
+        "Type": None,
+        "ExpiryDateTimeUTC": None,
+        "Applicability": None,
+        "TriggerPrice": trigger_price,
+        "PositionMethodId": 1,
+        "isTrade": True,
+        "ClientAccountId": client_account_id,
+    }
+
+    if close:
+        order_details["Close"] = {"OrderId": order_id}
+
+    if stop_loss or take_profit:
+        ifdone_order = {
+            "StopOrder": {
+                "Price": stop_loss,
+                "Type": "stop",
+                "Applicability": "gtc",
+                "StopType": "loss",
+            } if stop_loss else None,
+            "LimitOrder": {
+                "Price": take_profit,
+                "Type": "limit",
+                "Applicability": "gtc",
+            } if take_profit else None,
+        }
+        order_details["IfDone"].append(ifdone_order)
+
+    return order_details
+
+
+
+_DOTNET_PREFIX = b"/Date("
+
+
+def parse_dotnet_millis(values) -> np.ndarray:
+    """
+    Vectorized parse of .NET '/Date(ms[+-HHMM])/' strings into epoch milliseconds.
+
+    The millisecond value of the .NET JSON date format is always UTC; the optional
+    offset suffix only records the sender's local zone, so it is skipped rather than
+    applied. Missing or malformed entries become NaT.
+
+    :param values: A sequence, array or Series of '/Date(...)/' strings.
+    :return: An int64 array of epoch milliseconds using NaT's sentinel for invalid entries.
     """
-    end_time = datetime.utcnow()
-    start_time = end_time - pd.DateOffset(months=n_months)
+    raw = np.asarray(values, dtype=object)
+    if raw.size == 0:
+        return np.empty(0, dtype=np.int64)
+    raw = np.where(pd.isna(raw), "", raw)
+    try:
+        encoded = raw.astype("S")
+    except UnicodeEncodeError:
+        digits = pd.Series(raw).str.extract(r"^/Date\((-?\d+)", expand=False)
+        return digits.fillna(records.NAT).astype(np.int64).to_numpy()
 
-    # Generate date range in UTC
-    time_seq = pd.date_range(start=start_time, end=end_time, freq=by_time, tz="UTC")
+    width = encoded.dtype.itemsize
+    n_prefix = len(_DOTNET_PREFIX)
+    if width <= n_prefix:
+        return np.full(len(raw), records.NAT, dtype=np.int64)
 
-    intervals = []
-    for i in range(0, len(time_seq), n):
-        start_dt = time_seq[i]
-        if i + n < len(time_seq):
-            end_dt = time_seq[i + n]
-        else:
-            end_dt = time_seq[-1]
+    chars = encoded.view(np.uint8).reshape(len(encoded), width)
+    valid = (chars[:, :n_prefix] == np.frombuffer(_DOTNET_PREFIX, dtype=np.uint8)).all(axis=1)
+    negative = chars[:, n_prefix] == ord("-")
 
-        # Use .timestamp() to get POSIX timestamp in UTC
-        start_utc = int(start_dt.timestamp())
-        end_utc = int(end_dt.timestamp())
+    millis = np.zeros(len(raw), dtype=np.int64)
+    in_digits = np.ones(len(raw), dtype=bool)
+    n_digits = np.zeros(len(raw), dtype=np.int64)
+    # Horner's scheme column by column: each step is one vector operation over all rows
+    for col in range(n_prefix, width):
+        digit = chars[:, col].astype(np.int64) - ord("0")
+        is_digit = (digit >= 0) & (digit <= 9)
+        if col == n_prefix:
+            is_digit |= negative
+            digit = np.where(negative, 0, digit)
+        in_digits &= is_digit
+        if not in_digits.any():
+            break
+        millis = np.where(in_digits, millis * 10 + digit, millis)
+        n_digits += in_digits
 
-        intervals.append((start_utc, end_utc))
+    millis = np.where(negative, -millis, millis)
+    valid &= n_digits > negative.astype(np.int64)
+    return np.where(valid, millis, records.NAT)
 
-    return intervals
+
+def parse_dotnet_dates(values) -> pd.DatetimeIndex:
+    """
+    Vectorized parse of .NET '/Date(ms[+-HHMM])/' strings into UTC datetimes.
+
+    :param values: A sequence, array or Series of '/Date(...)/' strings.
+    :return: A timezone-aware (UTC) DatetimeIndex, with NaT for missing or malformed entries.
+    """
+    millis = parse_dotnet_millis(values)
+    return pd.DatetimeIndex(millis.view("datetime64[ms]")).tz_localize("UTC")
 
 
 
@@ -611,12 +859,9 @@ def convert_to_dataframe(data: list) -> pd.DataFrame:
     # Create DataFrame from the list of dictionaries
     df = pd.DataFrame(data)
     
-    # Extract the timestamp in milliseconds from the '/Date(...)' format.
-    # For example: '/Date(1732075200000)/' -> '1732075200000'
-    df['BarDate'] = df['BarDate'].apply(lambda x: int(re.findall(r'\d+', x)[0]))
-    
-    # Convert milliseconds to datetime
-    df['Date'] = pd.to_datetime(df['BarDate'], unit='ms', utc=True)
+    # Parse the '/Date(...)/' strings in one vectorized pass.
+    # For example: '/Date(1732075200000)/' -> 2024-11-20 04:00:00+00:00
+    df['Date'] = parse_dotnet_dates(df['BarDate'].to_numpy())
     
     # Drop the old 'BarDate' column or rename it
     df.drop(columns=['BarDate'], inplace=True)
@@ -641,13 +886,6 @@ def convert_orders_to_dataframe(data):
     Returns:
         pd.DataFrame: Flattened DataFrame with relevant fields.
     """
-    def convert_date(date_str):
-        """Convert '/Date(timestamp)/' to datetime."""
-        if date_str and date_str.startswith('/Date('):
-            timestamp = int(date_str[6:-2])
-            return pd.to_datetime(timestamp, unit='ms')
-        return None
-
     # Flatten and extract relevant fields
     orders = [
         {
@@ -664,6 +902,7 @@ def convert_orders_to_dataframe(data):
     # Convert date fields to datetime
     for date_field in ['CreatedDateTimeUTC', 'LastChangedDateTimeUTC', 'ExecutedDateTimeUTC']:
         if date_field in df.columns:
-            df[date_field] = df[date_field].apply(convert_date)
+            # Keep the naive UTC timestamps these fields have always been returned as
+            df[date_field] = parse_dotnet_dates(df[date_field].to_numpy()).tz_localize(None)
 
     return df
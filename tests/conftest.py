@@ -0,0 +1,72 @@
+# tests/conftest.py
+
+import pytest
+
+from src.pygcapi.testing import StubApiServer
+from src.pygcapi.transport import Transport
+from src.pygcapi.core_v1 import GCapiClientV1
+from src.pygcapi.core_v2 import GCapiClientV2
+
+
+@pytest.fixture
+def stub_options():
+    """
+    Keyword arguments for the StubApiServer of ``stub_server``; override or parametrize it where needed.
+    """
+    return {}
+
+
+@pytest.fixture
+def client_class():
+    """
+    Client class built by ``make_client`` and ``stub``; parametrize it to run a test against both clients.
+    """
+    return GCapiClientV2
+
+
+@pytest.fixture
+def client_options():
+    """
+    Extra keyword arguments for the client of ``stub``; override or parametrize it where needed.
+    """
+    return {}
+
+
+@pytest.fixture
+def stub_server(stub_options, monkeypatch):
+    """
+    Fixture for a local stub of the Gain Capital API that both clients point at.
+    """
+    with StubApiServer(**stub_options) as server:
+        monkeypatch.setattr(GCapiClientV1, "BASE_URL", server.base_url_v1)
+        monkeypatch.setattr(GCapiClientV2, "BASE_URL_V1", server.base_url_v1)
+        monkeypatch.setattr(GCapiClientV2, "BASE_URL_V2", server.base_url_v2)
+        yield server
+
+
+@pytest.fixture
+def make_client(stub_server, client_class):
+    """
+    Fixture for a factory of ``client_class`` instances against ``stub_server``, each with its own Transport.
+    Clients and their transports are closed on teardown.
+    """
+    opened = []
+
+    def make(**kwargs):
+        transport = Transport()
+        opened.append(transport)
+        client = client_class("user", "pass", "key", transport=transport, **kwargs)
+        opened.append(client)
+        return client
+
+    yield make
+    for resource in reversed(opened):
+        resource.close()
+
+
+@pytest.fixture
+def stub(make_client, stub_server, client_options):
+    """
+    Fixture for a client logged in against a stub server, as a (client, server) pair.
+    """
+    return make_client(**client_options), stub_server
@@ -0,0 +1,83 @@
+# tests/test_aggregation.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.pygcapi.aggregation import BarAggregator, aggregate_ticks
+from src.pygcapi.records import array_from_dataframe, to_dataframe
+
+START = 1_700_000_040
+
+
+def random_ticks(n=20000, seed=0):
+    """
+    Build a tick DataFrame in get_prices format with irregular spacing.
+    """
+    rng = np.random.default_rng(seed)
+    millis = START * 1000 + np.cumsum(rng.integers(0, 2000, n))
+    prices = 1.1 + np.cumsum(rng.normal(0, 1e-5, n))
+    return pd.DataFrame({"Date": pd.DatetimeIndex(millis.astype("datetime64[ms]")).tz_localize("UTC"), "Price": prices})
+
+
+def test_time_bars_match_pandas_and_get_ohlc_columns(stub):
+    """
+    Test that time bars equal pandas resample().ohlc() and have the columns and dtypes of get_ohlc.
+    """
+    ticks = random_ticks()
+    bars = aggregate_ticks(ticks, "MINUTE", 5)
+
+    expected = ticks.set_index("Date")["Price"].resample("5min").ohlc().dropna().reset_index()
+    expected.columns = ["Date", "Open", "High", "Low", "Close"]
+    pd.testing.assert_frame_equal(bars, expected, check_dtype=False)
+    pd.testing.assert_frame_equal(to_dataframe(aggregate_ticks(array_from_dataframe(ticks), "MINUTE", 5)), bars)
+
+    client, server = stub
+    ohlc = client.get_ohlc("401484347", 10, interval="MINUTE", span=1, from_ts=START, to_ts=START + 600)
+    from_ticks = aggregate_ticks(client.get_prices("401484347", 600, START, START + 600), "MINUTE", 1)
+    assert list(from_ticks.columns) == list(ohlc.columns)
+    assert from_ticks.dtypes.to_dict() == ohlc.dtypes.to_dict()
+
+
+def test_tick_count_and_session_aligned_bars():
+    """
+    Test tick-count bars and time bars restarting at a daily session open.
+    """
+    ticks = random_ticks(n=2500)
+    bars = aggregate_ticks(ticks, ticks_per_bar=1000)
+    assert len(bars) == 3
+    assert bars["Date"].tolist() == ticks["Date"].iloc[[0, 1000, 2000]].tolist()
+    assert bars.loc[2, "Close"] == ticks["Price"].iloc[-1]
+    assert bars.loc[0, "High"] == ticks["Price"].iloc[:1000].max()
+
+    # 7 hour bars from a 22:00 open: 22:00, 05:00, 12:00 and a short 19:00-22:00 bar closing each session
+    day = pd.Timestamp("2024-01-02 21:00", tz="UTC")
+    dates = pd.DatetimeIndex([day + pd.Timedelta(hours=h) for h in range(0, 26)]).as_unit("ms")
+    session = aggregate_ticks(pd.DataFrame({"Date": dates, "Price": np.arange(26.0)}), "HOUR", 7, session_open="22:00")
+    assert [ts.hour for ts in session["Date"]] == [19, 22, 5, 12, 19, 22]
+    assert session["Open"].tolist() == [0.0, 1.0, 8.0, 15.0, 22.0, 25.0]
+
+    with pytest.raises(ValueError):
+        BarAggregator("WEEK", 1, session_open="22:00")
+
+
+def test_incremental_updates_only_touch_the_open_bar():
+    """
+    Test that feeding ticks in batches gives the same bars as one pass, and each update returns only touched bars.
+    """
+    ticks = random_ticks()
+    aggregator = BarAggregator("MINUTE", 1)
+    for batch in np.array_split(np.arange(len(ticks)), 50):
+        touched = aggregator.update(ticks.iloc[batch])
+        assert touched["Date"].iloc[0] >= ticks["Date"].iloc[batch[0]].floor("1min")
+
+    pd.testing.assert_frame_equal(aggregator.bars(), aggregate_ticks(ticks, "MINUTE", 1))
+    closed = aggregator.bars(include_open=False, output="records")
+    assert len(closed) == len(aggregator.bars()) - 1
+
+    last = aggregator.bars()["Date"].iloc[-1]
+    touched = aggregator.update(pd.DataFrame({"Date": [ticks["Date"].iloc[-1]], "Price": [9.0]}))
+    assert len(touched) == 1 and touched.loc[0, "Date"] == last and touched.loc[0, "High"] == 9.0
+
+    with pytest.raises(ValueError, match="older"):
+        aggregator.update(ticks.iloc[:1])
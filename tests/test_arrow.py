@@ -0,0 +1,53 @@
+# tests/test_arrow.py
+
+import pandas as pd
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+
+
+START = 1_700_000_040
+
+
+def test_bars_as_record_batch_match_dataframe(stub):
+    """
+    Test that arrow mode returns a RecordBatch with a UTC millisecond Date that converts to the frame-mode DataFrame.
+    """
+    client, server = stub
+    frame = client.get_ohlc("401484347", 1000, interval="MINUTE", span=1, from_ts=START, to_ts=START + 3600)
+    batch = client.get_ohlc("401484347", 1000, interval="MINUTE", span=1, from_ts=START, to_ts=START + 3600, output="arrow")
+
+    assert isinstance(batch, pa.RecordBatch)
+    assert batch.schema.names == ["Date", "Open", "High", "Low", "Close"]
+    assert batch.schema.field("Date").type == pa.timestamp("ms", tz="UTC")
+    pd.testing.assert_frame_equal(batch.to_pandas(), frame, check_dtype=False)
+
+    ticks = client.get_prices("401484347", 50, START, START + 100, output="arrow")
+    assert ticks.schema.names == ["Date", "Price"] and ticks.num_rows == 50
+
+
+def test_bars_as_polars_frame(stub):
+    """
+    Test that polars mode returns a Polars DataFrame with a UTC millisecond Date.
+    """
+    pl = pytest.importorskip("polars")
+    client, server = stub
+    bars = client.get_ohlc("401484347", 100, interval="MINUTE", span=1, from_ts=START, to_ts=START + 3600, output="polars")
+
+    assert isinstance(bars, pl.DataFrame)
+    assert bars.schema["Date"] == pl.Datetime("ms", "UTC")
+    assert bars.height == 61
+
+
+def test_long_series_as_arrow_table_drops_chunk_overlap(stub):
+    """
+    Test that get_long_series in arrow mode concatenates the chunks into one table without duplicate dates.
+    """
+    client, server = stub
+    frame = client.get_long_series("401484347", n_months=1, by_time="1D", n=4000, interval="HOUR", span=1)
+    table = client.get_long_series("401484347", n_months=1, by_time="1D", n=4000, interval="HOUR", span=1, output="arrow")
+
+    assert isinstance(table, pa.Table)
+    assert table.num_rows == len(frame)
+    dates = table["Date"].to_pandas()
+    assert dates.is_unique and dates.is_monotonic_increasing
@@ -0,0 +1,134 @@
+# tests/test_async_client.py
+
+import asyncio
+import threading
+import time
+import pytest
+import pandas as pd
+
+pytest.importorskip("aiohttp")
+
+from src.pygcapi.async_client import AsyncGCapiClient
+from src.pygcapi.testing import FakeStreamingServer
+
+
+@pytest.fixture
+def client_class(stub_server, monkeypatch):
+    """
+    A fixture that points AsyncGCapiClient at the local stub server.
+    """
+    monkeypatch.setattr(AsyncGCapiClient, "BASE_URL_V1", stub_server.base_url_v1)
+    monkeypatch.setattr(AsyncGCapiClient, "BASE_URL_V2", stub_server.base_url_v2)
+    return AsyncGCapiClient
+
+
+def test_login_and_account_info(client_class):
+    """
+    Test that the session is created on entry and account ids are stored.
+    """
+    async def run():
+        async with client_class("user", "pass", "key") as client:
+            assert client.session_id.startswith("stub-session")
+            await client.get_account_info()
+            return client
+
+    client = asyncio.run(run())
+    assert client.trading_account_id == 1
+    assert client.client_account_id == 2
+
+
+def test_login_failure(client_class, stub_server):
+    """
+    Test that a failed login raises an exception.
+    """
+    stub_server.respond("POST", r"/v2/session$", {"ErrorMessage": "Invalid credentials"}, status=401)
+
+    async def run():
+        async with client_class("user", "bad", "key"):
+            pass
+
+    with pytest.raises(Exception) as excinfo:
+        asyncio.run(run())
+    assert "Failed to create session" in str(excinfo.value)
+
+
+def test_gather_ohlc_respects_concurrency_limit(client_class, stub_server):
+    """
+    Test that many get_ohlc calls run concurrently but never exceed max_concurrency.
+    """
+    in_flight = {"now": 0, "peak": 0}
+    lock = threading.Lock()
+
+    def slow_bars(match, query, body):
+        with lock:
+            in_flight["now"] += 1
+            in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+        time.sleep(0.05)
+        with lock:
+            in_flight["now"] -= 1
+        return 200, {"PriceBars": [{"BarDate": "/Date(1732075200000)/", "Open": 1.0, "High": 1.1, "Low": 0.9, "Close": 1.05}]}, {}
+
+    stub_server.route("GET", r"/barhistorybetween$", slow_bars)
+
+    async def run():
+        async with client_class("user", "pass", "key", max_concurrency=4) as client:
+            return await client.get_ohlc_many([str(i) for i in range(20)], 10, "MINUTE", 1, 0, 600)
+
+    results = asyncio.run(run())
+    assert len(results) == 20
+    assert all(isinstance(df, pd.DataFrame) and len(df) == 1 for df in results.values())
+    assert 1 < in_flight["peak"] <= 4
+    assert stub_server.connections <= 4
+
+
+def test_get_prices_and_errors(client_class, stub_server):
+    """
+    Test get_prices conversion and that non-200 responses raise.
+    """
+    stub_server.respond("GET", r"/order/openpositions$", "Server error", status=500)
+
+    async def run():
+        async with client_class("user", "pass", "key") as client:
+            prices = await client.get_prices("123", 5, 1_700_000_000, 1_700_000_100)
+            with pytest.raises(Exception) as excinfo:
+                await client.list_open_positions()
+            return prices, excinfo
+
+    prices, excinfo = asyncio.run(run())
+    assert list(prices.columns[:2]) == ["Date", "Price"]
+    assert len(prices) == 5
+    assert "Failed to retrieve open positions" in str(excinfo.value)
+
+
+def test_trade_order(client_class):
+    """
+    Test that trade_order returns the order details with the OrderId filled in.
+    """
+    async def run():
+        async with client_class("user", "pass", "key") as client:
+            await client.get_account_info()
+            return await client.trade_order(1000, 1.1002, 1.1000, "buy", "401484347", "EUR/USD")
+
+    order = asyncio.run(run())
+    assert order["TradingAccountId"] == 1
+    assert order["OrderId"] is not None
+
+
+def test_subscribe_prices_logs_in_on_connect(client_class):
+    """
+    Test that subscribe_prices on a client without a session logs in asynchronously when the stream connects.
+    """
+    async def run():
+        client = client_class("user", "pass", "key")
+        try:
+            async with FakeStreamingServer(tick_rate=2000, max_ticks=5) as server:
+                async with client.subscribe_prices(["1"], server.host, server.port) as stream:
+                    async for _ in stream:
+                        break
+                return server, client.session_id
+        finally:
+            await client.close()
+
+    server, session_id = asyncio.run(run())
+    assert session_id.startswith("stub-session")
+    assert server.subscriptions[0]["session"] == session_id
@@ -0,0 +1,131 @@
+# tests/test_bar_store.py
+
+import time
+import pytest
+import pandas as pd
+
+from src.pygcapi.bar_store import BarStore, merge_ranges, missing_ranges
+from src.pygcapi.testing import synthetic_bars
+from src.pygcapi.utils import convert_to_dataframe
+
+HOUR = 3600
+START = 1_700_000_000 // HOUR * HOUR
+
+
+class CountingLoader:
+    """
+    A loader with get_ohlc's signature that serves synthetic bars and records each call.
+    """
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, market_id, num_ticks, interval, span, from_ts, to_ts):
+        self.calls.append((from_ts, to_ts))
+        bars = synthetic_bars(from_ts, to_ts, interval, span, num_ticks)
+        return convert_to_dataframe(bars) if bars else pd.DataFrame()
+
+
+@pytest.fixture
+def store(tmp_path):
+    """
+    A fixture providing a BarStore backed by a temporary SQLite file.
+    """
+    bar_store = BarStore(str(tmp_path / "bars.sqlite"))
+    yield bar_store
+    bar_store.close()
+
+
+def test_range_helpers():
+    """
+    Test merging of touching ranges and computation of the gaps between them.
+    """
+    assert merge_ranges([(10, 19), (0, 9), (30, 40)]) == [(0, 19), (30, 40)]
+    assert missing_ranges([(0, 19), (30, 40)], 5, 50) == [(20, 29), (41, 50)]
+    assert missing_ranges([], 5, 10) == [(5, 10)]
+    assert missing_ranges([(0, 100)], 5, 10) == []
+
+
+def test_repeat_load_makes_no_calls(store):
+    """
+    Test that a second request for the same range is served entirely from disk.
+    """
+    loader = CountingLoader()
+    first = store.get_bars("1", "HOUR", 1, START, START + 99 * HOUR, 4000, loader)
+    assert len(first) == 100
+    assert len(loader.calls) == 1
+
+    second = store.get_bars("1", "HOUR", 1, START, START + 99 * HOUR, 4000, loader)
+    assert len(loader.calls) == 1
+    pd.testing.assert_frame_equal(first.reset_index(drop=True), second, check_dtype=False)
+    assert store.hits == 1 and store.misses == 1
+
+
+def test_only_gaps_are_requested(store):
+    """
+    Test that extending a stored range only downloads the missing parts.
+    """
+    loader = CountingLoader()
+    store.get_bars("1", "HOUR", 1, START + 10 * HOUR, START + 19 * HOUR, 4000, loader)
+    loader.calls.clear()
+
+    df = store.get_bars("1", "HOUR", 1, START, START + 29 * HOUR, 4000, loader)
+    assert loader.calls == [(START, START + 10 * HOUR - 1), (START + 19 * HOUR + 1, START + 29 * HOUR)]
+    assert len(df) == 30
+    assert df["Date"].is_monotonic_increasing
+
+
+def test_full_windows_are_split(store):
+    """
+    Test that gaps longer than num_ticks bars are requested in several windows.
+    """
+    loader = CountingLoader()
+    df = store.get_bars("1", "HOUR", 1, START, START + 24 * HOUR - 1, 10, loader)
+    assert len(df) == 24
+    assert len(loader.calls) == 3
+
+
+def test_forming_bar_is_not_persisted(store):
+    """
+    Test that the still-forming last bar is fetched again on every request.
+    """
+    loader = CountingLoader()
+    now = int(time.time())
+    store.get_bars("1", "HOUR", 1, now - 5 * HOUR, now, 4000, loader)
+    assert store.coverage("1", "HOUR", 1)[-1][1] < now // HOUR * HOUR
+
+    loader.calls.clear()
+    store.get_bars("1", "HOUR", 1, now - 5 * HOUR, now, 4000, loader)
+    assert len(loader.calls) == 1
+    assert loader.calls[0][0] == now // HOUR * HOUR
+
+
+def test_forming_session_aligned_bar_is_not_persisted(store, monkeypatch):
+    """
+    Test that a weekly bar stamped at the Sunday session open is not stored while its week runs.
+    """
+    sunday_open = int(pd.Timestamp("2024-01-14 22:00", tz="UTC").timestamp())
+    monkeypatch.setattr(time, "time", lambda: sunday_open + 3 * 86400)
+    df = pd.DataFrame({
+        "Date": pd.to_datetime([sunday_open - 7 * 86400, sunday_open], unit="s", utc=True),
+        "Open": [1.0, 2.0], "High": [1.0, 2.0], "Low": [1.0, 2.0], "Close": [1.0, 2.0],
+    })
+    store.store("1", "WEEK", 1, df, sunday_open - 14 * 86400, sunday_open + 3 * 86400)
+
+    assert store.coverage("1", "WEEK", 1) == [(sunday_open - 14 * 86400, sunday_open - 1)]
+    assert store.load("1", "WEEK", 1, 0, sunday_open + 3 * 86400)["Open"].tolist() == [1.0]
+
+
+def test_eviction_drops_least_recently_used(tmp_path):
+    """
+    Test that the least recently used series is evicted once max_bytes is exceeded.
+    """
+    store = BarStore(str(tmp_path / "bars.sqlite"), max_bytes=100 * 40 + 10)
+    loader = CountingLoader()
+    store.get_bars("old", "HOUR", 1, START, START + 99 * HOUR, 4000, loader)
+    store.get_bars("new", "HOUR", 1, START, START + 99 * HOUR, 4000, loader)
+
+    assert store.coverage("old", "HOUR", 1) == []
+    assert store.coverage("new", "HOUR", 1) != []
+    assert store.size() <= store.max_bytes
+    store.close()
@@ -0,0 +1,137 @@
+# tests/test_concurrency.py
+
+import asyncio
+import threading
+import time
+from email.utils import formatdate
+import pytest
+
+from src.pygcapi.concurrency import AdaptiveConcurrency, AsyncAdaptiveConcurrency, parse_retry_after
+from src.pygcapi.long_series import fetch_long_series
+from src.pygcapi.testing import ThrottlingStubServer
+from src.pygcapi.transport import Transport
+from src.pygcapi.core_v2 import GCapiClientV2
+
+
+def test_parse_retry_after():
+    """
+    Test that Retry-After is read from seconds and HTTP dates.
+    """
+    assert parse_retry_after("2") == 2.0
+    assert parse_retry_after("0.5") == 0.5
+    assert 8 <= parse_retry_after(formatdate(time.time() + 10, usegmt=True)) <= 10
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+
+
+def test_additive_increase_and_multiplicative_decrease():
+    """
+    Test that healthy responses grow the limit slowly and a throttle signal halves it once per round trip.
+    """
+    controller = AdaptiveConcurrency(initial_limit=4, max_limit=8)
+    for _ in range(8):
+        controller.acquire()
+        controller.release(200, 0.01)
+    assert 5 <= controller.limit < 6
+
+    for _ in range(3):
+        controller.acquire()
+    for _ in range(3):
+        controller.release(429, 0.01)
+    assert controller.decreases == 1
+    assert 2.5 <= controller.limit < 3
+    assert controller.stats()["throttled"] == 3
+
+
+def test_latency_spike_counts_as_congestion():
+    """
+    Test that a response far slower than the running average reduces the limit.
+    """
+    controller = AdaptiveConcurrency(initial_limit=8, latency_tolerance=2.0)
+    for _ in range(5):
+        controller.acquire()
+        controller.release(200, 0.01)
+    before = controller.limit
+    controller.acquire()
+    controller.release(200, 0.1)
+    assert controller.limit < before
+    assert controller.slow == 1
+
+
+def test_limit_bounds_threads_and_retry_after_holds_requests():
+    """
+    Test that no more than the limit run at once and that Retry-After delays new requests.
+    """
+    controller = AdaptiveConcurrency(initial_limit=2, max_limit=2)
+    running, peak = [0], [0]
+    lock = threading.Lock()
+
+    def work():
+        controller.acquire()
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.01)
+        with lock:
+            running[0] -= 1
+        controller.release(200, 0.01)
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert peak[0] == 2
+
+    controller.acquire()
+    controller.release(429, 0.01, retry_after=0.1)
+    started = time.monotonic()
+    controller.acquire()
+    assert time.monotonic() - started >= 0.09
+    controller.release(200, 0.01)
+
+
+def test_async_controller_limits_tasks():
+    """
+    Test that the asyncio controller bounds the number of tasks in flight.
+    """
+    controller = AsyncAdaptiveConcurrency(initial_limit=3, max_limit=3)
+    running, peak = [0], [0]
+
+    async def work():
+        await controller.acquire()
+        running[0] += 1
+        peak[0] = max(peak[0], running[0])
+        await asyncio.sleep(0.005)
+        running[0] -= 1
+        controller.release(200, 0.005)
+
+    async def main():
+        await asyncio.gather(*(work() for _ in range(12)))
+
+    asyncio.run(main())
+    assert peak[0] == 3
+    assert controller.requests == 12
+
+
+def test_client_adapts_to_throttling_server(monkeypatch):
+    """
+    Test that a parallel long-series fetch completes against a throttling server with adaptive concurrency.
+    """
+    with ThrottlingStubServer(latency=0.005, capacity=4, retry_after=0.02) as server:
+        monkeypatch.setattr(GCapiClientV2, "BASE_URL_V1", server.base_url_v1)
+        monkeypatch.setattr(GCapiClientV2, "BASE_URL_V2", server.base_url_v2)
+        controller = AdaptiveConcurrency(initial_limit=8, max_limit=16)
+        with Transport(pool_maxsize=16) as transport:
+            client = GCapiClientV2("user", "pass", "key", transport=transport, concurrency=controller)
+
+            start = 1_700_000_000
+            intervals = [(start + i * 3600, start + (i + 1) * 3600 - 1) for i in range(60)]
+            result = fetch_long_series(client, "401484347", interval="MINUTE", span=1, n=60,
+                                       time_intervals=intervals, workers=16)
+            client.close()
+
+    assert result.ok
+    assert len(result.data) == 60 * 60
+    assert server.throttled >= 1
+    assert controller.decreases >= 1
@@ -372,7 +372,7 @@ def test_close_all_trades_no_positions(mock_client, requests_mock):
     )
 
     result = mock_client.close_all_trades(tolerance=0.1)
-    assert result == [], "No open positions should return an empty list."
+    assert len(result) == 0, "No open positions should return an empty summary."
 
 
 def test_close_all_trades_with_positions(mock_client, requests_mock):
@@ -399,7 +399,7 @@ def test_close_all_trades_with_positions(mock_client, requests_mock):
 
     result = mock_client.close_all_trades(tolerance=0.05)
     assert len(result) == 2, "Should have results for each position."
-    assert all("OrderId" in r for r in result), "Each response should contain an OrderId."
+    assert all("OrderId" in r for r in result.responses), "Each response should contain an OrderId."
 
 
 def test_close_all_trades_new_no_positions(mock_client, requests_mock):
@@ -407,7 +407,7 @@ def test_close_all_trades_new_no_positions(mock_client, requests_mock):
     Test close_all_trades_new with an empty list of positions.
     """
     result = mock_client.close_all_trades_new(open_positions=[], tolerance=0.1)
-    assert result == [], "Empty open_positions should return empty list"
+    assert len(result) == 0, "Empty open_positions should return an empty summary"
 
 
 def test_get_trade_history_success(mock_client, requests_mock):
@@ -0,0 +1,81 @@
+# tests/test_decoding.py
+
+import json
+import pytest
+import pandas as pd
+
+from src.pygcapi.decoding import RecordArrayDecoder, decode_records
+from src.pygcapi.testing import synthetic_bars, synthetic_ticks
+from src.pygcapi.utils import convert_to_dataframe
+
+
+def chunked(payload: bytes, size: int):
+    """
+    Split a payload into fixed-size chunks, as iter_content would.
+    """
+    return [payload[i:i + size] for i in range(0, len(payload), size)]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 100_000])
+def test_bars_match_convert_to_dataframe(chunk_size):
+    """
+    Test that streamed bars equal the json()+convert_to_dataframe result for any chunking.
+    """
+    bars = synthetic_bars(1_700_000_000, 1_700_030_000, "MINUTE", 1, 500)
+    payload = json.dumps({"PriceBars": bars, "PartialPriceBar": {"BarDate": "/Date(0)/", "Close": 9.9}}).encode()
+
+    df = decode_records(chunked(payload, chunk_size), "PriceBars", "BarDate")
+    expected = convert_to_dataframe(bars)
+
+    assert list(df.columns) == list(expected.columns)
+    assert len(df) == 500
+    assert (df["Date"] == expected["Date"]).all()
+    pd.testing.assert_frame_equal(df.drop(columns="Date"), expected.drop(columns="Date"))
+
+
+def test_ticks_rename_date_column():
+    """
+    Test that 'TickDate' is turned into a leading UTC 'Date' column.
+    """
+    payload = json.dumps({"PriceTicks": synthetic_ticks(1_700_000_000, 1_700_000_009)}).encode()
+    df = decode_records(chunked(payload, 16), "PriceTicks", "TickDate")
+    assert list(df.columns) == ["Date", "Price"]
+    assert len(df) == 10
+    assert str(df["Date"].dt.tz) == "UTC"
+
+
+@pytest.mark.parametrize("payload", [b'{"PriceBars": []}', b'{"PriceBars": null}', b'{"Other": 1}', b''])
+def test_empty_payloads(payload):
+    """
+    Test that missing, null or empty arrays decode to an empty DataFrame.
+    """
+    assert decode_records(chunked(payload, 3) or [b""], "PriceBars", "BarDate").empty
+
+
+def test_records_with_varying_fields():
+    """
+    Test that a field missing from some records is filled with NaN.
+    """
+    decoder = RecordArrayDecoder("PriceBars", "BarDate")
+    decoder.feed(b'{"PriceBars":[{"BarDate":"/Date(1000)/","Open":1.0},')
+    decoder.feed(b'{"BarDate":"/Date(2000)/","Open":2.0,"Volume":5}]}')
+    df = decoder.to_dataframe()
+    assert df["Open"].tolist() == [1.0, 2.0]
+    assert pd.isna(df["Volume"].iloc[0]) and df["Volume"].iloc[1] == 5
+
+
+def test_integer_columns_keep_their_dtype():
+    """
+    Test that integer columns without nulls stay int64, as convert_to_dataframe keeps them.
+    """
+    bars = [
+        {"BarDate": f"/Date({i * 60000})/", "Open": 1.5, "Close": 2, "Volume": 10 + i}
+        for i in range(5)
+    ]
+    payload = json.dumps({"PriceBars": bars}).encode()
+    df = decode_records(chunked(payload, 32), "PriceBars", "BarDate")
+    expected = convert_to_dataframe(bars)
+
+    assert df["Volume"].dtype == expected["Volume"].dtype == "int64"
+    pd.testing.assert_frame_equal(df.drop(columns="Date"), expected.drop(columns="Date"))
+    assert decode_records([payload], "PriceBars", "BarDate", output="records")["Volume"].dtype == "int64"
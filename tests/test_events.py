@@ -0,0 +1,112 @@
+# tests/test_events.py
+
+import logging
+import pytest
+
+from src.pygcapi.events import Event, EventBus, LoggingListener
+
+
+@pytest.fixture
+def stub(stub):
+    """
+    Fixture for the stub client with two open positions on the server.
+    """
+    client, server = stub
+    server.respond("GET", r"/order/openpositions$", {"OpenPositions": [
+        {"PositionId": 1, "MarketId": 401484347, "OrderId": 11, "Quantity": 1000, "Direction": "buy",
+         "Price": 1.1, "Status": 3, "StatusReason": 1},
+        {"PositionId": 2, "MarketId": 401484348, "OrderId": 12, "Quantity": 500, "Direction": "sell",
+         "Price": 1.3, "Status": 3, "StatusReason": 1},
+    ]})
+    return stub
+
+
+def test_emit_without_listeners_builds_nothing(monkeypatch):
+    """
+    Test that events nobody listens to are neither created nor formatted.
+    """
+    bus = EventBus()
+    created = []
+    monkeypatch.setattr(Event, "__init__", lambda self, name, data: created.append(name))
+    bus.emit("open_position", position={})
+    bus.subscribe(lambda event: None, names=["order_placed"])
+    bus.emit("open_position", position={})
+    assert not bus.wants("open_position") and bus.wants("order_placed")
+    assert created == []
+
+
+def test_listener_errors_do_not_propagate(caplog):
+    """
+    Test that a failing listener is logged while the other listeners still receive the event.
+    """
+    bus = EventBus()
+    received = []
+
+    @bus.subscribe
+    def broken(event):
+        raise RuntimeError("boom")
+
+    bus.subscribe(received.append)
+    with caplog.at_level(logging.ERROR, logger="pygcapi"):
+        bus.emit("no_open_positions")
+    assert [event.name for event in received] == ["no_open_positions"]
+    assert "Event listener" in caplog.text
+
+    bus.unsubscribe(broken)
+    bus.unsubscribe(received.append)
+    assert not bus
+
+
+def test_client_emits_structured_events_instead_of_printing(stub, capsys):
+    """
+    Test that positions and closes are reported as events carrying the raw objects, with nothing printed.
+    """
+    client, server = stub
+    received = []
+    client.events.subscribe(received.append)
+
+    positions = client.list_open_positions()
+    summary = client.close_all_trades(tolerance=0.0)
+
+    assert capsys.readouterr().out == ""
+    names = [event.name for event in received]
+    assert names.count("open_position") == 4
+    assert names.count("position_closed") == len(summary) == 2
+    assert received[0].data["position"]["PositionId"] == positions.iloc[0]["PositionId"]
+    assert received[0].message.startswith("Position ID: 1 - Status: ")
+
+
+def test_active_order_events_read_active_orders(stub):
+    """
+    Test that list_active_orders emits one active_order event per entry of the 'ActiveOrders' payload.
+    """
+    client, server = stub
+    server.respond("POST", r"/order/activeorders$", {"ActiveOrders": [
+        {"TradeOrder": {"OrderId": 42, "MarketId": 10, "Status": 1, "StatusReason": 1}, "TypeId": 1},
+    ]})
+    received = []
+    client.events.subscribe(received.append)
+
+    client.list_active_orders()
+
+    (event,) = [event for event in received if event.name == "active_order"]
+    assert event.data["order"]["TradeOrder"]["OrderId"] == 42
+    assert event.message.startswith("Order ID: 42 - Status: ")
+
+
+def test_logging_listener_formats_lazily(stub, caplog):
+    """
+    Test that the logging adapter writes formatted messages with the event attached.
+    """
+    client, server = stub
+    client.events.subscribe(LoggingListener())
+    with caplog.at_level(logging.INFO, logger="pygcapi"):
+        client.trade_order(1000, 1.1, 1.0, "buy", "401484347", "EUR/USD")
+    record = caplog.records[-1]
+    assert record.event == "order_placed"
+    assert "Order Status:" in record.getMessage()
+
+    caplog.clear()
+    with caplog.at_level(logging.WARNING, logger="pygcapi"):
+        client.list_open_positions()
+    assert caplog.records == []
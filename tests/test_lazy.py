@@ -0,0 +1,43 @@
+# tests/test_lazy.py
+
+import os
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from src.pygcapi.lazy import lazy_import
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+
+
+def test_package_import_does_not_load_pandas():
+    """
+    Test that importing pygcapi and resolving a client leaves pandas, NumPy and asyncio unloaded.
+    """
+    code = (
+        "import sys, pygcapi\n"
+        "client_class = pygcapi.GCapiClientV2\n"
+        "print(client_class.__module__, 'GCapiClientV1' in dir(pygcapi))\n"
+        "print(' '.join(name for name in ('pandas', 'numpy', 'asyncio') if name in sys.modules))\n"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", code], env=dict(os.environ, PYTHONPATH=SRC), capture_output=True, text=True, check=True
+    )
+    resolved, heavy = (proc.stdout.splitlines() + [""])[:2]
+    assert resolved == "pygcapi.core_v2 True"
+    assert heavy == ""
+
+
+def test_lazy_module_loads_once_on_first_use():
+    """
+    Test that a LazyModule imports its module on first attribute access, once, even from several threads.
+    """
+    colorsys = lazy_import("colorsys")
+    assert "not loaded" in repr(colorsys)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: colorsys.rgb_to_hsv(1.0, 0.0, 0.0), range(32)))
+
+    assert results == [(0.0, 1.0, 1.0)] * 32
+    assert colorsys._module is sys.modules["colorsys"]
+    assert "(loaded)" in repr(colorsys)
@@ -0,0 +1,196 @@
+# tests/test_long_series.py
+
+import random
+import threading
+import time
+import pytest
+import pandas as pd
+
+from src.pygcapi.long_series import fetch_long_series, LongSeriesResult, NoDataError
+from src.pygcapi.rate_limit import TokenBucket
+
+
+class FakeOhlcClient:
+    """
+    A stand-in client whose get_ohlc returns one bar per chunk after a random delay.
+    """
+
+    def __init__(self, fail_on=(), delay=0.01):
+        self.fail_on = set(fail_on)
+        self.delay = delay
+        self.calls = 0
+        self.peak = 0
+        self._active = 0
+        self._lock = threading.Lock()
+
+    def get_ohlc(self, market_id, num_ticks, interval, span, from_ts, to_ts):
+        with self._lock:
+            self.calls += 1
+            self._active += 1
+            self.peak = max(self.peak, self._active)
+        try:
+            time.sleep(random.uniform(0, self.delay))
+            if from_ts in self.fail_on:
+                raise Exception(f"No OHLC data found for market ID {market_id}")
+            return pd.DataFrame({"Date": [pd.Timestamp(from_ts, unit="s", tz="UTC")], "Open": [float(from_ts)]})
+        finally:
+            with self._lock:
+                self._active -= 1
+
+
+INTERVALS = [(i * 100, (i + 1) * 100) for i in range(12)]
+
+
+def test_parallel_fetch_preserves_time_order():
+    """
+    Test that chunks fetched concurrently are reassembled in time order.
+    """
+    client = FakeOhlcClient()
+    result = fetch_long_series(client, "123", n=10, workers=4, time_intervals=INTERVALS)
+
+    assert isinstance(result, LongSeriesResult)
+    assert result.ok
+    assert client.calls == 12
+    assert 1 < client.peak <= 4
+    assert result.data["Open"].tolist() == [float(start) for start, _ in INTERVALS]
+    assert [chunk.start for chunk in result.chunks] == [start for start, _ in INTERVALS]
+    assert all(chunk.rows == 1 and chunk.elapsed >= 0 for chunk in result.chunks)
+
+
+def test_failures_are_reported_not_printed(capsys):
+    """
+    Test that failing chunks are recorded in the result instead of printed.
+    """
+    client = FakeOhlcClient(fail_on={300, 700})
+    result = fetch_long_series(client, "123", n=10, workers=3, time_intervals=INTERVALS)
+
+    assert not result.ok
+    assert [chunk.start for chunk in result.failures] == [300, 700]
+    assert "No OHLC data found" in result.failures[0].error
+    assert len(result.data) == 10
+    assert result.summary()["failed"] == 2
+    assert capsys.readouterr().out == ""
+
+
+def test_no_data_returns_empty_frame():
+    """
+    Test that an empty DataFrame is returned when every chunk fails.
+    """
+    client = FakeOhlcClient(fail_on={start for start, _ in INTERVALS})
+    result = fetch_long_series(client, "123", workers=2, time_intervals=INTERVALS)
+    assert result.data.empty
+    assert len(result.failures) == len(INTERVALS)
+
+
+def test_rate_limiter_spaces_calls():
+    """
+    Test that the one-token bucket used for rate_limit spaces calls across threads.
+    """
+    limiter = TokenBucket(rate=50, capacity=1)
+    stamps = []
+
+    def worker():
+        limiter.acquire()
+        stamps.append(time.monotonic())
+
+    threads = [threading.Thread(target=worker) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    stamps.sort()
+    assert stamps[-1] - stamps[0] >= 5 * 0.02 * 0.9
+
+
+def test_default_chunks_fill_n_bars_over_an_explicit_window():
+    """
+    Test that without by_time the chunks are planned from from_ts/to_ts so that each holds n bars.
+    """
+    client = FakeOhlcClient(delay=0)
+    result = fetch_long_series(client, "123", n=100, interval="HOUR", span=1, from_ts=0, to_ts=1000 * 3600)
+
+    assert client.calls == 11
+    assert [(chunk.start, chunk.stop) for chunk in result.chunks][:2] == [(0, 360000 - 1), (360000, 720000 - 1)]
+    assert result.chunks[-1].stop == 1000 * 3600
+
+
+class CappedOhlcClient:
+    """
+    A stand-in client serving hourly bars every ``every`` hours and truncating responses at num_ticks.
+    """
+
+    def __init__(self, every=1, keep="first"):
+        self.every = every
+        self.keep = keep
+        self.calls = []
+
+    def get_ohlc(self, market_id, num_ticks, interval, span, from_ts, to_ts):
+        self.calls.append((from_ts, to_ts))
+        step = 3600 * self.every
+        starts = list(range(-(-from_ts // step) * step, to_ts + 1, step))
+        if not starts:
+            raise NoDataError(f"No OHLC data found for market ID {market_id}")
+        starts = starts[:num_ticks] if self.keep == "first" else starts[-num_ticks:]
+        return pd.DataFrame({"Date": pd.to_datetime(starts, unit="s", utc=True), "Open": [float(s) for s in starts]})
+
+
+@pytest.mark.parametrize("keep", ["first", "last"])
+def test_capped_chunks_are_completed_by_follow_ups(keep):
+    """
+    Test that a chunk returned at maxResults is completed, whichever end the API truncates.
+    """
+    client = CappedOhlcClient(keep=keep)
+    result = fetch_long_series(client, "123", n=100, interval="HOUR", span=1, time_intervals=[(0, 250 * 3600 - 1)])
+
+    assert result.ok
+    assert result.data["Open"].tolist() == [float(i * 3600) for i in range(250)]
+    assert len(client.calls) == 3
+    summary = result.summary()
+    assert (summary["capped"], summary["follow_ups"]) == (2, 2)
+    assert sorted(result.fill_ratios) == [0.5, 1.0, 1.0]
+
+
+def test_adaptive_chunks_grow_over_sparse_data():
+    """
+    Test that adaptive planning lengthens sparse chunks and still returns every bar.
+    """
+    fixed, adaptive = CappedOhlcClient(every=10), CappedOhlcClient(every=10)
+    kwargs = dict(n=100, interval="HOUR", span=1, from_ts=0, to_ts=20000 * 3600 - 1)
+    expected = fetch_long_series(fixed, "123", **kwargs)
+    result = fetch_long_series(adaptive, "123", adaptive=True, **kwargs)
+
+    assert result.ok
+    assert result.data["Open"].tolist() == expected.data["Open"].tolist()
+    assert len(result.data) == 2000
+    assert len(adaptive.calls) < len(fixed.calls) / 4
+    assert result.summary()["fill_mean"] > expected.summary()["fill_mean"]
+
+
+def test_by_time_rejects_an_explicit_window():
+    """
+    Test that by_time, which always chunks the last n_months, refuses arguments it would ignore.
+    """
+    client = FakeOhlcClient(delay=0)
+    for kwargs in ({"from_ts": 0}, {"to_ts": 3600}, {"calendar": object()}, {"adaptive": True}):
+        with pytest.raises(ValueError):
+            fetch_long_series(client, "123", by_time="15min", **kwargs)
+    assert client.calls == 0
+
+
+def test_chunks_without_bars_are_empty_not_failed():
+    """
+    Test that a trailing chunk falling on a weekend, where get_ohlc finds no bars, does not fail the series.
+    """
+    monday = int(pd.Timestamp("2024-01-08", tz="UTC").timestamp())
+    saturday = monday + 5 * 86400
+
+    class WeekdayClient(CappedOhlcClient):
+        def get_ohlc(self, market_id, num_ticks, interval, span, from_ts, to_ts):
+            return super().get_ohlc(market_id, num_ticks, interval, span, from_ts, min(to_ts, saturday - 1))
+
+    result = fetch_long_series(WeekdayClient(), "123", n=24, interval="HOUR", span=1, from_ts=monday, to_ts=saturday + 2 * 86400 - 1)
+
+    assert result.ok
+    assert len(result.data) == 5 * 24
+    assert [chunk.rows for chunk in result.chunks][-2:] == [0, 0]
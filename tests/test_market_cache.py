@@ -0,0 +1,132 @@
+# tests/test_market_cache.py
+
+import os
+import threading
+import time
+import pytest
+
+from src.pygcapi.market_cache import MarketCache
+
+EURUSD = {"MarketId": 401484347, "Name": "EUR/USD"}
+GBPUSD = {"MarketId": 401484348, "Name": "GBP/USD"}
+
+
+def test_lookup_by_name_id_and_alias():
+    """
+    Test that a market is found by name (case-insensitively), MarketId and alias.
+    """
+    cache = MarketCache()
+    cache.put(EURUSD, alias="eurusd")
+    assert cache.get("EUR/USD") == EURUSD
+    assert cache.get("eur/usd") == EURUSD
+    assert cache.get("EURUSD") == EURUSD
+    assert cache.get_by_id(401484347) == EURUSD
+    assert cache.get("GBP/USD") is None
+    assert cache.stats()["hits"] == 4 and cache.stats()["misses"] == 1
+
+
+def test_ttl_expiry():
+    """
+    Test that entries older than the TTL count as misses.
+    """
+    cache = MarketCache(ttl=60)
+    cache.put(EURUSD, stored_at=time.time() - 61)
+    assert cache.get("EUR/USD") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_lru_eviction():
+    """
+    Test that the least recently used market is evicted beyond max_size.
+    """
+    cache = MarketCache(max_size=2)
+    cache.put(EURUSD)
+    cache.put(GBPUSD)
+    cache.get("EUR/USD")
+    cache.put({"MarketId": 1, "Name": "USD/JPY"})
+    assert cache.get("GBP/USD") is None
+    assert cache.get("EUR/USD") == EURUSD
+    assert cache.evictions == 1
+
+
+def test_eviction_keeps_names_moved_to_another_market():
+    """
+    Test that evicting a market only drops the names still pointing at it.
+    """
+    cache = MarketCache(max_size=1)
+    cache.put(EURUSD, alias="major")
+    cache.put(GBPUSD, alias="major")
+    assert cache.evictions == 1
+    assert cache.get("major") == GBPUSD
+    assert cache.get("EUR/USD") is None
+
+
+def test_put_many_beyond_max_size():
+    """
+    Test that loading more markets than max_size keeps names and markets bounded together.
+    """
+    cache = MarketCache(max_size=100)
+    count = cache.put_many({"MarketId": i, "Name": f"Market {i}"} for i in range(5000))
+    assert count == 5000
+    assert cache.stats()["size"] == 100
+    assert cache.evictions == 4900
+    assert len(cache._names) == 100
+    assert cache.get("Market 4999")["MarketId"] == 4999
+    assert cache.get("Market 0") is None
+
+
+def test_snapshot_round_trip(tmp_path):
+    """
+    Test that a snapshot restores markets, aliases and their fetch times.
+    """
+    path = str(tmp_path / "markets.json")
+    cache = MarketCache(snapshot_path=path)
+    cache.put(EURUSD, alias="EURUSD")
+    cache.put(GBPUSD, stored_at=time.time() - 1000)
+    cache.save_snapshot()
+
+    restored = MarketCache(ttl=500, snapshot_path=path)
+    assert restored.get("EURUSD") == EURUSD
+    assert restored.get("GBP/USD") is None
+
+
+def test_concurrent_snapshots(tmp_path):
+    """
+    Test that concurrent saves each use their own temporary file and leave a readable snapshot.
+    """
+    path = str(tmp_path / "markets.json")
+    cache = MarketCache(snapshot_path=path)
+    cache.put_many({"MarketId": i, "Name": f"Market {i}"} for i in range(200))
+    errors = []
+
+    def save():
+        try:
+            for _ in range(20):
+                cache.save_snapshot()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=save) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert os.listdir(tmp_path) == ["markets.json"]
+    assert MarketCache().load_snapshot(path) == 200
+
+
+def test_client_uses_cache_and_warm_up(stub):
+    """
+    Test that repeated get_market_info calls hit /cfd/markets once and warm-up loads the list.
+    """
+    client, server = stub
+    assert client.get_market_info("EUR/USD", key="MarketId") == 401484347
+    assert client.get_market_info("EUR/USD", key="Name") == "EUR/USD"
+    assert server.calls.count(("GET", "/TradingAPI/cfd/markets")) == 1
+
+    server.respond("GET", r"/cfd/markets$", {"Markets": [EURUSD, GBPUSD]})
+    assert client.warm_market_cache() == 2
+    assert client.get_market_info("GBP/USD") == GBPUSD
+    assert server.calls.count(("GET", "/TradingAPI/cfd/markets")) == 2
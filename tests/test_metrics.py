@@ -0,0 +1,94 @@
+# tests/test_metrics.py
+
+import random
+import pytest
+
+from src.pygcapi.metrics import Histogram, Metrics, NULL_CALL
+
+
+@pytest.fixture
+def metrics():
+    """
+    Fixture for the Metrics of the stub client.
+    """
+    return Metrics()
+
+
+@pytest.fixture
+def client_options(metrics):
+    """
+    Fixture giving the stub client Metrics.
+    """
+    return {"metrics": metrics}
+
+
+def test_histogram_quantiles_are_within_precision():
+    """
+    Test that quantiles match the exact ones within the histogram's relative precision over a wide range.
+    """
+    rng = random.Random(7)
+    values = sorted(rng.lognormvariate(-5, 2) for _ in range(20000))
+    histogram = Histogram(scale=1e6, precision_bits=7)
+    for value in values:
+        histogram.record(value)
+
+    assert histogram.count == len(values)
+    assert histogram.min == values[0] and histogram.max == values[-1]
+    for q in (0.5, 0.9, 0.99, 0.999):
+        exact = values[int(q * len(values) + 0.5) - 1]
+        assert histogram.quantile(q) == pytest.approx(exact, rel=0.02, abs=1e-6)
+    assert len(histogram._buckets) < 1500
+
+
+def test_disabled_metrics_record_nothing():
+    """
+    Test that a disabled Metrics hands out the no-op call context.
+    """
+    metrics = Metrics(enabled=False)
+    with metrics.call("get_ohlc") as call:
+        assert call is NULL_CALL
+        assert call.frame(len, [1, 2]) == 2
+    assert metrics.snapshot() == {}
+
+
+def test_prometheus_export():
+    """
+    Test the Prometheus text format of summaries and counters.
+    """
+    metrics = Metrics()
+    metrics.record("get_ohlc", {"latency_seconds": 0.25, "rows": 100})
+    metrics.record("get_ohlc", {"latency_seconds": 0.5, "rows": 300}, error=True)
+    text = metrics.to_prometheus()
+
+    assert "# TYPE pygcapi_latency_seconds summary" in text
+    assert 'pygcapi_latency_seconds{call="get_ohlc",quantile="0.5"} 0.25' in text
+    assert 'pygcapi_latency_seconds_count{call="get_ohlc"} 2' in text
+    assert 'pygcapi_rows_sum{call="get_ohlc"} 400' in text
+    assert 'pygcapi_calls_total{call="get_ohlc"} 2' in text
+    assert 'pygcapi_errors_total{call="get_ohlc"} 1' in text
+    assert text.endswith("\n")
+
+
+def test_client_records_phases_per_call(stub, metrics):
+    """
+    Test that streamed and JSON calls record network, decode and DataFrame phases, bytes and rows.
+    """
+    client, server = stub
+    df = client.get_ohlc("401484347", 500, interval="MINUTE", span=1, from_ts=1_700_000_000, to_ts=1_700_000_000 + 86400)
+    client.list_open_positions()
+    server.respond("GET", r"/cfd/markets$", {"ErrorMessage": "unavailable"}, status=400)
+    with pytest.raises(Exception):
+        client.get_market_info("EUR/USD")
+
+    stats = metrics.snapshot()
+    ohlc = stats["get_ohlc"]
+    assert ohlc["calls"] == 1 and ohlc["errors"] == 0
+    assert ohlc["rows"]["max"] == len(df) == 500
+    assert ohlc["response_bytes"]["max"] > 500 * 50
+    for phase in ("network_seconds", "decode_seconds", "frame_seconds"):
+        assert 0 < ohlc[phase]["max"] <= ohlc["latency_seconds"]["max"]
+
+    positions = stats["list_open_positions"]
+    assert positions["rows"]["max"] == 0
+    assert {"network_seconds", "decode_seconds", "frame_seconds", "response_bytes"} <= set(positions)
+    assert stats["get_market_info"]["errors"] == 1
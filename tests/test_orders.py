@@ -0,0 +1,229 @@
+# tests/test_orders.py
+
+import threading
+import time
+import pytest
+
+import pandas as pd
+import requests
+
+from src.pygcapi.orders import OrderSpec, TransientOrderError, submit_orders, decode_order_response, close_position_specs, close_positions
+from src.pygcapi.core_v1 import GCapiClientV1
+from src.pygcapi.core_v2 import GCapiClientV2, CloseSummary
+
+
+def make_spec(market_id, quantity=1000):
+    return OrderSpec(
+        quantity=quantity,
+        offer_price=1.1,
+        bid_price=1.0,
+        direction="buy",
+        market_id=market_id,
+        market_name=f"Market {market_id}",
+    )
+
+
+def test_decode_order_response():
+    """
+    Test that status codes are decoded through the lookup tables.
+    """
+    decoded = decode_order_response({
+        "Status": 1, "StatusReason": 1, "OrderId": 7,
+        "Orders": [{"OrderId": 8, "Status": 3, "StatusReason": 1}],
+        "Actions": [{"OrderActionTypeId": 1}],
+    })
+    assert decoded["status"] == "Accepted"
+    assert decoded["reason"] == "OK"
+    assert decoded["order_status"] == "Open"
+    assert decoded["order_id"] == 8
+    assert decoded["action"] is not None
+
+
+def test_per_market_order_and_concurrency_limit():
+    """
+    Test that orders of one market are placed in list order while markets run in parallel within the limit.
+    """
+    placed = []
+    in_flight = [0, 0]
+    lock = threading.Lock()
+
+    def place(order_details):
+        with lock:
+            in_flight[0] += 1
+            in_flight[1] = max(in_flight[1], in_flight[0])
+        time.sleep(0.02)
+        with lock:
+            in_flight[0] -= 1
+            placed.append((order_details["MarketId"], order_details["Quantity"]))
+        return {"Status": 1, "StatusReason": 1, "OrderId": len(placed)}
+
+    specs = [make_spec(market, quantity) for quantity in range(1, 4) for market in ("A", "B", "C", "D")]
+    results = submit_orders(lambda spec: {"MarketId": spec.market_id, "Quantity": spec.quantity}, place, specs, max_in_flight=2)
+
+    assert [r.spec for r in results] == specs
+    assert all(r.ok and r.status == "Accepted" and r.elapsed > 0 for r in results)
+    assert in_flight[1] == 2
+    for market in ("A", "B", "C", "D"):
+        assert [q for m, q in placed if m == market] == [1, 2, 3]
+
+
+def test_errors_are_captured_per_order():
+    """
+    Test that a failing order is reported in its result without stopping the batch.
+    """
+    def place(order_details):
+        if order_details["MarketId"] == "bad":
+            raise Exception("Failed to place trade order: rejected")
+        return {"Status": 1, "StatusReason": 1}
+
+    specs = [make_spec("good"), make_spec("bad"), make_spec("good")]
+    results = submit_orders(lambda spec: {"MarketId": spec.market_id}, place, specs, preserve_market_order=False)
+    assert [r.ok for r in results] == [True, False, True]
+    assert "rejected" in results[1].error
+
+
+def test_client_trade_orders(stub):
+    """
+    Test that trade_orders posts every order to the endpoint and returns decoded results.
+    """
+    client, server = stub
+    specs = [make_spec("401484347"), make_spec("401484348"), make_spec("401484347")]
+    results = client.trade_orders(specs, max_in_flight=4)
+
+    assert server.calls.count(("POST", "/TradingAPI/order/newtradeorder")) == 3
+    assert all(r.ok for r in results)
+    assert all(r.order_details["TradingAccountId"] == client.trading_account_id for r in results)
+    assert len({r.order_id for r in results}) == 3
+
+
+def test_close_position_specs():
+    """
+    Test that closing orders reverse the direction and carry the price and tolerance of each position.
+    """
+    positions = pd.DataFrame([
+        {"OrderId": 1, "MarketId": 10, "MarketName": "EUR/USD", "Direction": "buy", "Quantity": 1000, "Price": 1.1},
+        {"OrderId": 2, "MarketId": 11, "MarketName": "GBP/USD", "Direction": "sell", "Quantity": 500, "Price": 1.3},
+    ])
+    specs = close_position_specs(positions, tolerance=5)
+    assert [s.direction for s in specs] == ["sell", "buy"]
+    assert [s.order_id for s in specs] == [1, 2]
+    assert all(s.close for s in specs)
+    assert specs[0].offer_price == specs[0].bid_price == 1.1
+    assert specs[0].tolerance == 5
+    assert type(specs[0].market_id) is int and type(specs[0].quantity) is int
+
+
+def test_close_positions_retries_transient_failures():
+    """
+    Test that transient failures are retried and permanent ones reported in the summary.
+    """
+    attempts = {}
+
+    def place(order_details):
+        order_id = order_details["OrderId"]
+        attempts[order_id] = attempts.get(order_id, 0) + 1
+        if order_id == 1 and attempts[order_id] < 3:
+            raise TransientOrderError("Failed to place trade order: 429", status=429)
+        if order_id == 2:
+            raise Exception("Failed to place trade order: rejected")
+        return {"Status": 1, "StatusReason": 1, "OrderId": order_id}
+
+    positions = [
+        {"OrderId": order_id, "MarketId": 10, "Direction": "buy", "Quantity": 1, "Price": 1.0}
+        for order_id in (1, 2, 3)
+    ]
+    summary = close_positions(lambda spec: {"OrderId": spec.order_id}, place, positions, retries=2, retry_delay=0.001)
+
+    assert len(summary) == 3
+    assert [r.attempts for r in summary] == [3, 1, 1]
+    assert [r.spec.order_id for r in summary.closed] == [1, 3]
+    assert [r.spec.order_id for r in summary.failed] == [2]
+    assert set(summary.latencies()) == {1, 2, 3}
+    assert summary.summary()["retried"] == 1
+
+
+def test_closes_are_not_resent_when_the_server_may_have_filled_them():
+    """
+    Test that a close failing with a 5xx or a read timeout is not sent again, while one that never left is.
+    """
+    failures = {
+        1: TransientOrderError("Failed to place trade order: 500", status=500),
+        2: requests.ReadTimeout("read timed out"),
+        3: requests.ConnectTimeout("connect timed out"),
+    }
+    attempts = {}
+
+    def place(order_details):
+        order_id = order_details["OrderId"]
+        attempts[order_id] = attempts.get(order_id, 0) + 1
+        if attempts[order_id] == 1:
+            raise failures[order_id]
+        return {"Status": 1, "StatusReason": 1, "OrderId": order_id}
+
+    positions = [
+        {"OrderId": order_id, "MarketId": 10, "Direction": "buy", "Quantity": 1, "Price": 1.0}
+        for order_id in (1, 2, 3)
+    ]
+    summary = close_positions(lambda spec: {"OrderId": spec.order_id}, place, positions, retries=2, retry_delay=0.001)
+
+    assert attempts == {1: 1, 2: 1, 3: 2}
+    assert [r.spec.order_id for r in summary.failed] == [1, 2]
+
+    def never_sent(order_details):
+        raise requests.ConnectTimeout("connect timed out")
+
+    # Close-outs are not retried unless asked to
+    assert close_positions(lambda spec: {"OrderId": spec.order_id}, never_sent, positions[:1]).results[0].attempts == 1
+
+
+def test_client_close_all_trades(stub):
+    """
+    Test that close_all_trades closes every open position through the order endpoint.
+    """
+    client, server = stub
+    server.respond("GET", r"/order/openpositions$", {"OpenPositions": [
+        {"OrderId": 1, "MarketId": 10, "MarketName": "EUR/USD", "Direction": "buy", "Quantity": 1000, "Price": 1.1},
+        {"OrderId": 2, "MarketId": 11, "MarketName": "GBP/USD", "Direction": "sell", "Quantity": 500, "Price": 1.3},
+    ]})
+    summary = client.close_all_trades(tolerance=5)
+
+    assert summary.ok and len(summary) == 2
+    assert server.calls.count(("POST", "/TradingAPI/order/newtradeorder")) == 2
+    assert [r.order_details["Close"] for r in summary] == [{"OrderId": 1}, {"OrderId": 2}]
+    assert summary.results[0].order_details["OfferPrice"] == pytest.approx(1.1005)
+
+
+@pytest.mark.parametrize("client_class", [GCapiClientV1, GCapiClientV2])
+def test_client_close_all_trades_counts_failures(stub):
+    """
+    Test that close_all_trades returns a CloseSummary counting closed and failed positions without resending failures.
+    """
+    client, server = stub
+    server.respond("GET", r"/order/openpositions$", {"OpenPositions": [
+        {"OrderId": order_id, "MarketId": 10 + order_id, "MarketName": f"Market {order_id}", "Direction": "buy",
+         "Quantity": 1000, "Price": 1.1}
+        for order_id in (1, 2, 3)
+    ]})
+
+    def order(match, query, body):
+        order_id = body["Close"]["OrderId"]
+        if order_id == 2:
+            return 400, {"ErrorMessage": "market closed"}, {}
+        if order_id == 3:
+            return 500, {"ErrorMessage": "internal error"}, {}
+        return 200, {"Status": 1, "StatusReason": 1, "OrderId": 100 + order_id}, {}
+
+    server.route("POST", r"/order/newtradeorder$", order)
+    failed = []
+    client.events.subscribe(failed.append, ["close_failed"])
+    summary = client.close_all_trades(tolerance=5)
+
+    assert isinstance(summary, CloseSummary)
+    assert not summary.ok
+    counts = summary.summary()
+    assert (counts["positions"], counts["closed"], counts["failed"], counts["retried"]) == (3, 1, 2, 0)
+    assert [r.spec.order_id for r in summary.closed] == [1]
+    assert [r.spec.order_id for r in summary.failed] == [2, 3]
+    assert "market closed" in summary.failed[0].error
+    assert server.calls.count(("POST", "/TradingAPI/order/newtradeorder")) == 3
+    assert len(failed) == 2
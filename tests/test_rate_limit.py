@@ -0,0 +1,114 @@
+# tests/test_rate_limit.py
+
+import multiprocessing
+import os
+import threading
+import time
+import pytest
+
+from src.pygcapi.rate_limit import TokenBucket, FileTokenBucket, RateLimiter, classify_endpoint
+
+
+def _drain_bucket(path, count, barrier, queue):
+    bucket = FileTokenBucket(path, rate=20, capacity=1)
+    barrier.wait()
+    for _ in range(count):
+        bucket.acquire()
+        queue.put(time.time())
+
+
+def test_classify_endpoint():
+    """
+    Test that URLs map to the market data, orders and account classes.
+    """
+    assert classify_endpoint("https://x/TradingAPI/market/1/barhistorybetween") == "market_data"
+    assert classify_endpoint("https://x/TradingAPI/cfd/markets") == "market_data"
+    assert classify_endpoint("https://x/v2/UserAccount/ClientAndTradingAccount") == "account"
+
+
+@pytest.mark.parametrize("endpoint", ["newtradeorder", "updatetradeorder", "newstoplimitorder", "updatestoplimitorder", "cancel"])
+def test_classify_order_changes(endpoint):
+    """
+    Test that endpoints placing, changing or cancelling orders are in the orders class.
+    """
+    assert classify_endpoint(f"https://x/TradingAPI/order/{endpoint}") == "orders"
+    assert classify_endpoint(f"https://x/v2/order/{endpoint}/") == "orders"
+
+
+@pytest.mark.parametrize("endpoint", ["openpositions", "activeorders", "tradehistory"])
+def test_classify_order_reads_as_account(endpoint):
+    """
+    Test that read-only order queries are in the account class, not the orders class.
+    """
+    assert classify_endpoint(f"https://x/v2/order/{endpoint}?TradingAccountId=1&maxResults=100") == "account"
+
+
+def test_bucket_allows_burst_then_refills():
+    """
+    Test that a bucket serves its burst immediately and then paces callers at its rate.
+    """
+    bucket = TokenBucket(rate=100, capacity=5)
+    waits = [bucket.acquire() for _ in range(5)]
+    assert waits == [0.0] * 5
+
+    started = time.monotonic()
+    for _ in range(5):
+        bucket.acquire()
+    assert time.monotonic() - started >= 5 * 0.01 * 0.9
+
+
+def test_limiter_is_shared_across_threads_and_reports_waits():
+    """
+    Test that threads share one budget per class and that waits show up in the metrics.
+    """
+    limiter = RateLimiter({"orders": (50.0, 2.0)})
+    threads = [threading.Thread(target=limiter.acquire, args=("orders",)) for _ in range(8)]
+    started = time.monotonic()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert time.monotonic() - started >= 6 * 0.02 * 0.9
+    stats = limiter.stats()
+    assert stats["orders"]["acquired"] == 8
+    assert stats["orders"]["waited"] == 6
+    assert stats["orders"]["max_wait"] >= 0.1
+    assert stats["market_data"]["acquired"] == 0
+
+
+@pytest.mark.skipif(os.name != "posix", reason="the file backend needs fcntl")
+def test_file_bucket_is_shared_across_processes(tmp_path):
+    """
+    Test that processes using the same bucket file draw from one budget.
+    """
+    path = str(tmp_path / "orders.bucket")
+    context = multiprocessing.get_context("spawn")
+    barrier, queue = context.Barrier(2), context.Queue()
+    workers = [context.Process(target=_drain_bucket, args=(path, 4, barrier, queue)) for _ in range(2)]
+    for w in workers:
+        w.start()
+    stamps = sorted(queue.get(timeout=30) for _ in range(8))
+    for w in workers:
+        w.join()
+
+    # With a burst of 1 the two processes together get at most one token per 1/20 s
+    gaps = [b - a for a, b in zip(stamps, stamps[1:])]
+    assert min(gaps) >= 0.05 * 0.8
+
+
+def test_client_requests_go_through_limiter(make_client):
+    """
+    Test that a client's login and API calls are counted in the right endpoint classes.
+    """
+    limiter = RateLimiter()
+    client = make_client(rate_limiter=limiter)
+    client.get_account_info()
+    client.get_market_info("EUR/USD")
+    client.list_open_positions()
+    client.trade_order(1000, 1.1002, 1.1000, "buy", "401484347", "EUR/USD")
+
+    stats = limiter.stats()
+    assert stats["account"]["acquired"] == 3
+    assert stats["market_data"]["acquired"] == 1
+    assert stats["orders"]["acquired"] == 1
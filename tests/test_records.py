@@ -0,0 +1,74 @@
+# tests/test_records.py
+
+from dataclasses import astuple
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.pygcapi.records import Trade, to_dataframe, array_from_dataframe
+
+START = 1_700_000_040
+
+
+def test_bars_as_structured_array_match_dataframe(stub):
+    """
+    Test that records mode returns a structured array that converts to the same DataFrame as frame mode.
+    """
+    client, server = stub
+    frame = client.get_ohlc("401484347", 1000, interval="MINUTE", span=1, from_ts=START, to_ts=START + 3600)
+    bars = client.get_ohlc("401484347", 1000, interval="MINUTE", span=1, from_ts=START, to_ts=START + 3600, output="records")
+
+    assert isinstance(bars, np.ndarray)
+    assert bars.dtype.names == ("Date", "Open", "High", "Low", "Close")
+    assert bars["Date"][-1] == np.datetime64((START + 3600) * 1000, "ms")
+    pd.testing.assert_frame_equal(to_dataframe(bars), frame)
+    np.testing.assert_array_equal(array_from_dataframe(frame), bars)
+
+    ticks = client.get_prices("401484347", 50, START, START + 100, output="records")
+    assert ticks.dtype.names == ("Date", "Price") and len(ticks) == 50
+
+
+def test_positions_orders_and_trades_as_records(stub):
+    """
+    Test that positions, active orders and trades come back as slotted records.
+    """
+    client, server = stub
+    server.respond("GET", r"/order/openpositions$", {"OpenPositions": [
+        {"OrderId": 11, "MarketId": 401484347, "MarketName": "EUR/USD", "Direction": "buy", "Quantity": 1000, "Price": 1.1},
+    ]})
+    server.respond("POST", r"/order/activeorders$", {"ActiveOrders": [
+        {"TypeId": 2, "StopLimitOrder": None, "TradeOrder": {
+            "OrderId": 21, "MarketId": 401484347, "Direction": "sell", "Quantity": 500, "Price": 1.2,
+            "CreatedDateTimeUTC": "/Date(1700000000000)/", "LastChangedDateTimeUTC": "/Date(1700000060000)/"}},
+    ]})
+    server.respond("GET", r"/order/tradehistory$", {"TradeHistory": [
+        {"OrderId": 31, "MarketId": 401484347, "Direction": "buy", "Quantity": 100, "Price": 1.05, "RealisedPnl": 2.5},
+    ]})
+
+    positions = client.list_open_positions(output="records")
+    assert type(positions[0]).__name__ == "Position"
+    assert astuple(positions[0]) == (11, 401484347, "EUR/USD", "buy", 1000, 1.1, None, None, None, None, None, None)
+    assert not hasattr(positions[0], "__dict__")
+
+    orders = client.list_active_orders(output="records")
+    assert type(orders[0]).__name__ == "ActiveOrder"
+    assert (orders[0].order_id, orders[0].outer_type_id) == (21, 2)
+    df = to_dataframe(orders)
+    assert df.loc[0, "CreatedDateTimeUTC"] == pd.Timestamp("2023-11-14 22:13:20")
+
+    trades = client.get_trade_history(output="records")
+    assert type(trades[0]).__name__ == "Trade" and trades[0].realised_pnl == 2.5
+    assert to_dataframe(trades).loc[0, "OrderId"] == 31
+    assert list(to_dataframe([], Trade).columns) == list(Trade.API_KEYS)
+
+
+def test_unknown_output_mode_is_rejected(stub):
+    """
+    Test that an unknown output mode raises before any request is sent.
+    """
+    client, server = stub
+    requests_before = server.requests
+    with pytest.raises(ValueError, match="output must be one of"):
+        client.list_open_positions(output="polars")
+    assert server.requests == requests_before
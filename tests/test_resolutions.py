@@ -0,0 +1,90 @@
+# tests/test_resolutions.py
+
+import pandas as pd
+import pytest
+
+from src.pygcapi.resolutions import MultiResolutionBars
+from src.pygcapi.testing import synthetic_bars
+from src.pygcapi.trading_calendar import FX_CALENDAR
+
+START = 1_700_000_040
+STOP = START + 6 * 3600 + 1234
+
+
+def test_plan_derives_intraday_multiples_of_the_finest_resolution():
+    """
+    Test that only intraday resolutions that are multiples of the finest one are derived.
+    """
+    base, derived, direct = MultiResolutionBars.plan([("minute", 5), ("MINUTE", 1), ("HOUR", 1), ("MINUTE", 7), ("DAY", 1)])
+    assert base == ("MINUTE", 1)
+    assert derived == [("MINUTE", 5), ("MINUTE", 1), ("HOUR", 1)]
+    assert direct == [("MINUTE", 7), ("DAY", 1)]
+
+
+def test_coarse_bars_derived_from_one_download_match_api_alignment(stub):
+    """
+    Test that 1, 5, 15 and 60 minute bars come from a single base download and line up with the API's bars.
+    """
+    client, server = stub
+    service = MultiResolutionBars(client, max_bars=200)
+    resolutions = [("MINUTE", 1), ("MINUTE", 5), ("MINUTE", 15), ("HOUR", 1)]
+    requests_before = server.requests
+    bars = service.get_bars("401484347", resolutions, START, STOP)
+
+    assert service.downloads == 1
+    base = bars[("MINUTE", 1)]
+    for interval, span in resolutions[1:]:
+        api = client.get_ohlc("401484347", 4000, interval=interval, span=span, from_ts=START, to_ts=STOP)
+        derived = bars[(interval, span)]
+        assert derived["Date"].tolist() == api["Date"].tolist()
+        bar = derived.iloc[0]
+        length = pd.Timedelta(minutes=span * (60 if interval == "HOUR" else 1))
+        inside = base[(base["Date"] >= bar["Date"]) & (base["Date"] < bar["Date"] + length)]
+        assert (bar["Open"], bar["Close"]) == (inside["Open"].iloc[0], inside["Close"].iloc[-1])
+        assert (bar["High"], bar["Low"]) == (inside["High"].max(), inside["Low"].min())
+    # 3 chunks of at most 200 base bars, then the 3 get_ohlc calls of the comparison
+    assert server.requests - requests_before == 3 + 3
+
+
+def test_repeat_requests_are_served_from_the_cache(stub):
+    """
+    Test that repeated and narrower resolution requests over a cached range do not hit the API.
+    """
+    client, server = stub
+    service = MultiResolutionBars(client)
+    first = service.get_bars("401484347", [("MINUTE", 1), ("MINUTE", 15)], START, STOP, output="records")
+    requests_before = server.requests
+
+    again = service.get_bars("401484347", [("MINUTE", 15)], START, STOP, output="records")
+    assert again[("MINUTE", 15)] is first[("MINUTE", 15)]
+    assert server.requests == requests_before
+    assert (service.hits, service.misses, service.downloads) == (1, 2, 1)
+
+
+def test_downloads_skip_closed_periods_with_a_calendar(stub):
+    """
+    Test that a calendar packs the download chunks with trading time, so a weekend costs no requests.
+    """
+    client, server = stub
+
+    def open_bars(match, query, body):
+        bars = synthetic_bars(int(query["fromTimeStampUTC"]), int(query["toTimeStampUTC"]), query["interval"],
+                              int(query["span"]), max_results=10 ** 6)
+        bars = [bar for bar in bars if FX_CALENDAR.is_open(int(bar["BarDate"][6:-5]))]
+        return 200, {"PriceBars": bars[:int(query["maxResults"])]}, {}
+
+    server.route("GET", r"/market/[^/]+/barhistorybetween$", open_bars)
+    friday = int(pd.Timestamp("2024-01-12 12:00", tz="UTC").timestamp())
+    monday = int(pd.Timestamp("2024-01-15 12:00", tz="UTC").timestamp())
+    resolutions = [("MINUTE", 1), ("MINUTE", 15)]
+
+    requests_before = server.requests
+    continuous = MultiResolutionBars(client, max_bars=1000).get_bars("401484347", resolutions, friday, monday)
+    continuous_requests = server.requests - requests_before
+    requests_before = server.requests
+    packed = MultiResolutionBars(client, max_bars=1000, calendar=FX_CALENDAR).get_bars("401484347", resolutions, friday, monday)
+
+    assert server.requests - requests_before < continuous_requests
+    for res in resolutions:
+        pd.testing.assert_frame_equal(packed[res], continuous[res])
+    assert len(packed[("MINUTE", 1)]) == 10 * 60 + 15 * 60 + 1
@@ -0,0 +1,129 @@
+# tests/test_retry.py
+
+import time
+import pytest
+
+from src.pygcapi.retry import RetryPolicy, CircuitBreaker, CircuitOpenError, RetryManager
+
+FAST = {
+    "market_data": RetryPolicy(max_attempts=3, base_delay=0.001),
+    "account": RetryPolicy(max_attempts=3, base_delay=0.001),
+    "orders": RetryPolicy(max_attempts=3, base_delay=0.001),
+}
+
+
+@pytest.fixture
+def retry():
+    """
+    Fixture for a fast RetryManager.
+    """
+    return RetryManager(FAST, failure_threshold=3, reset_timeout=0.2)
+
+
+@pytest.fixture
+def client_options(retry):
+    """
+    Fixture giving the stub client the fast RetryManager.
+    """
+    return {"retry": retry}
+
+
+def failing(statuses, payload):
+    """
+    Build a route handler answering with the given statuses first and 200 afterwards.
+    """
+    remaining = list(statuses)
+
+    def handler(match, query, body):
+        if remaining:
+            return remaining.pop(0), {"ErrorMessage": "unavailable"}, {}
+        return 200, payload, {}
+    return handler
+
+
+def test_policy_delay_is_bounded_exponential_with_jitter():
+    """
+    Test that delays double per attempt up to max_delay and that jitter stays below the bound.
+    """
+    policy = RetryPolicy(base_delay=0.1, max_delay=0.3, jitter=False)
+    assert [policy.delay(a) for a in (1, 2, 3, 4)] == [0.1, 0.2, 0.3, 0.3]
+    jittered = RetryPolicy(base_delay=0.1, max_delay=0.3)
+    assert all(0 <= jittered.delay(3) <= 0.3 for _ in range(50))
+
+
+def test_circuit_breaker_opens_and_recovers():
+    """
+    Test that the breaker opens after consecutive failures, fails fast, and closes after a successful trial.
+    """
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+    breaker.allow()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.allow()
+
+    time.sleep(0.06)
+    breaker.allow()
+    assert breaker.state == "half_open"
+    with pytest.raises(CircuitOpenError):
+        breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.opened == 1 and breaker.rejected == 2
+
+
+def test_idempotent_request_is_retried(stub, retry):
+    """
+    Test that transient 5xx answers to a GET are retried and counted.
+    """
+    client, server = stub
+    server.route("GET", r"/order/openpositions$", failing([503, 502], {"OpenPositions": []}))
+    assert client.list_open_positions().empty
+    assert server.calls.count(("GET", "/TradingAPI/order/openpositions")) == 3
+    assert retry.stats()["account"]["retries"] == 2
+
+
+def test_orders_are_not_blindly_retried(stub):
+    """
+    Test that an order answered with 500 is sent once, while a 429 rejection is retried.
+    """
+    client, server = stub
+    payload = {"Status": 1, "StatusReason": 1, "OrderId": 1}
+    server.route("POST", r"/order/newtradeorder$", failing([500], payload))
+    with pytest.raises(Exception, match="Failed to place trade order"):
+        client._place_order({"MarketId": 1})
+    assert server.calls.count(("POST", "/TradingAPI/order/newtradeorder")) == 1
+
+    server.route("POST", r"/order/newtradeorder$", failing([429], payload))
+    assert client._place_order({"MarketId": 1})["OrderId"] == 1
+    assert server.calls.count(("POST", "/TradingAPI/order/newtradeorder")) == 3
+
+
+def test_breaker_fails_fast_when_api_is_down(stub, retry):
+    """
+    Test that once the API is unreachable the breaker opens and later calls fail without connecting.
+    """
+    client, server = stub
+    server.stop()
+    client.transport.reset()
+    with pytest.raises(Exception):
+        client.list_open_positions()
+
+    started = time.monotonic()
+    with pytest.raises(CircuitOpenError):
+        client.list_open_positions()
+    assert time.monotonic() - started < 0.05
+    stats = retry.stats()["account"]
+    assert stats["breaker"] == "open" and stats["rejected"] == 1
+
+
+def test_get_long_series_reports_failed_chunks(stub):
+    """
+    Test that get_long_series raises on failed chunks instead of returning a series with holes.
+    """
+    client, server = stub
+    server.respond("GET", r"/market/[^/]+/barhistorybetween$", {"ErrorMessage": "bad request"}, status=400)
+    with pytest.raises(Exception, match="Failed to retrieve 2 of 2 chunks"):
+        client.get_long_series("401484347", n_months=1, by_time="15min", n=1500)
+    assert client.get_long_series("401484347", n_months=1, by_time="15min", n=1500, allow_gaps=True).empty
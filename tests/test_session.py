@@ -0,0 +1,146 @@
+# tests/test_session.py
+
+import threading
+import time
+import pytest
+
+from src.pygcapi.session import SessionManager
+from src.pygcapi.transport import Transport
+
+
+@pytest.fixture
+def stub_options():
+    """
+    Fixture making the stub server reject requests without a valid session.
+    """
+    return {"require_session": True}
+
+
+@pytest.fixture
+def manager(stub_server):
+    """
+    Fixture for a SessionManager logging in against the stub server.
+    """
+    transport = Transport()
+
+    def login():
+        return transport.post(f"{stub_server.base_url_v2}/session", json={}).json()["session"]
+
+    manager = SessionManager(login, transport)
+    yield manager
+    manager.close()
+    transport.close()
+
+
+def test_relogin_once_for_concurrent_callers(stub_server, manager):
+    """
+    Test that concurrent callers hitting an expired session share one re-login and are all replayed.
+    """
+    url = f"{stub_server.base_url_v1}/order/openpositions"
+    assert manager.get(url).status_code == 200
+    stub_server.expire_sessions()
+
+    barrier = threading.Barrier(8)
+    statuses = []
+
+    def call():
+        barrier.wait()
+        statuses.append(manager.get(url).status_code)
+
+    threads = [threading.Thread(target=call) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert statuses == [200] * 8
+    assert stub_server.logins == 2
+    assert manager.logins == 2
+    assert manager.replays == manager.auth_failures == 8
+
+
+def test_concurrent_first_calls_share_one_login():
+    """
+    Test that concurrent callers without a session wait for a single login instead of each logging in.
+    """
+    logins = []
+
+    def login():
+        time.sleep(0.05)
+        logins.append(1)
+        return f"token-{len(logins)}"
+
+    manager = SessionManager(login, Transport())
+    barrier = threading.Barrier(8)
+    tokens = []
+
+    def call():
+        barrier.wait()
+        tokens.append(manager.ensure())
+
+    threads = [threading.Thread(target=call) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert tokens == ["token-1"] * 8
+    assert manager.logins == len(logins) == 1
+
+
+def test_non_idempotent_request_is_not_replayed(stub_server, manager):
+    """
+    Test that a failed POST is returned as is after the re-login, unless marked idempotent.
+    """
+    url = f"{stub_server.base_url_v1}/order/newtradeorder"
+    manager.ensure()
+    stub_server.expire_sessions()
+
+    assert manager.post(url, json={}).status_code == 401
+    assert manager.logins == 2
+    assert stub_server.calls.count(("POST", "/TradingAPI/order/newtradeorder")) == 1
+
+    stub_server.expire_sessions()
+    assert manager.post(f"{stub_server.base_url_v1}/order/activeorders", json={}, idempotent=True).status_code == 200
+
+
+def test_background_refresh(stub_server):
+    """
+    Test that the session is refreshed in the background before it expires.
+    """
+    transport = Transport()
+    manager = SessionManager(
+        lambda: transport.post(f"{stub_server.base_url_v2}/session", json={}).json()["session"],
+        transport,
+        max_age=0.3,
+        refresh_margin=0.2,
+    )
+    first = manager.refresh()
+    time.sleep(0.35)
+    manager.close()
+    transport.close()
+    assert manager.logins >= 2
+    assert manager.token != first
+    assert manager.age < 0.35
+
+
+def test_refresh_margin_must_be_below_max_age():
+    """
+    Test that a refresh margin not smaller than the session lifetime is rejected.
+    """
+    with pytest.raises(ValueError):
+        SessionManager(lambda: "token", Transport(), max_age=10, refresh_margin=10)
+
+
+def test_client_relogs_transparently(stub):
+    """
+    Test that a client keeps working after its session expires and updates its session_id.
+    """
+    client, server = stub
+    first = client.session_id
+
+    server.expire_sessions()
+    assert client.get_account_info(key="TradingAccountId") == 1
+    assert client.session_id != first
+    assert client.headers["Session"] == client.session_id
+    assert server.logins == 2
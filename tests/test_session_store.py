@@ -0,0 +1,120 @@
+# tests/test_session_store.py
+
+import os
+import stat
+import threading
+import time
+import pytest
+
+from src.pygcapi.session_store import SessionStore
+
+
+@pytest.fixture
+def stub_options():
+    """
+    Fixture making the stub server reject requests without a valid session.
+    """
+    return {"require_session": True}
+
+
+def test_round_trip_and_permissions(tmp_path):
+    """
+    Test that sessions are stored per user in private files and expire after max_age.
+    """
+    store = SessionStore(str(tmp_path / "sessions"))
+    store.save("user", "key", "token-1", trading_account_id=1, client_account_id=2)
+
+    entry = store.load("user", "key")
+    assert entry["token"] == "token-1"
+    assert entry["trading_account_id"] == 1 and entry["client_account_id"] == 2
+    assert store.load("user", "other-key") is None
+
+    (path,) = [p for p in (tmp_path / "sessions").iterdir()]
+    assert "user" not in path.name
+    if os.name == "posix":
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+
+    store.save("user", "key", "token-2", issued_at=time.time() - 100)
+    assert SessionStore(str(tmp_path / "sessions"), max_age=50).load("user", "key") is None
+    store.discard("user", "key")
+    assert store.load("user", "key") is None
+
+
+def test_concurrent_saves_do_not_collide(tmp_path):
+    """
+    Test that threads saving the same session at once each write through their own temporary file.
+    """
+    store = SessionStore(str(tmp_path / "sessions"))
+    errors = []
+
+    def save(i):
+        try:
+            for j in range(50):
+                store.save("user", "key", f"token-{i}-{j}")
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=save, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert store.load("user", "key")["token"].endswith("-49")
+    assert len(list((tmp_path / "sessions").iterdir())) == 1
+
+
+def test_second_client_reuses_stored_session(stub_server, make_client, tmp_path):
+    """
+    Test that a new client reuses the stored token and account IDs without logging in.
+    """
+    store = SessionStore(str(tmp_path))
+    first = make_client(session_store=store)
+    first.get_account_info()
+    assert stub_server.logins == 1
+
+    second = make_client(session_store=store)
+    assert stub_server.logins == 1
+    assert second.session_id == first.session_id
+    assert second.trading_account_id == 1 and second.client_account_id == 2
+    assert second.list_open_positions().empty
+
+
+def test_stale_stored_session_falls_back_to_login(stub_server, make_client, tmp_path):
+    """
+    Test that an invalid stored token is replaced by one fresh login, which is stored again.
+    """
+    store = SessionStore(str(tmp_path))
+    store.save("user", "key", "expired-token")
+
+    client = make_client(session_store=store)
+    assert stub_server.logins == 0
+    assert client.get_account_info(key="TradingAccountId") == 1
+    assert stub_server.logins == 1
+    assert store.load("user", "key")["token"] == client.session_id != "expired-token"
+
+
+def test_order_on_stale_stored_session_is_placed(stub_server, make_client, tmp_path):
+    """
+    Test that a restored token is checked before the first order, so an expired one does not fail the order.
+    """
+    store = SessionStore(str(tmp_path))
+    store.save("user", "key", "expired-token")
+
+    client = make_client(session_store=store)
+    response = client.trade_order(1000, 1.1, 1.0, "buy", "401484347", "EUR/USD")
+
+    assert response["OrderId"] is not None
+    assert stub_server.logins == 1
+    assert stub_server.calls.count(("POST", "/TradingAPI/order/newtradeorder")) == 1
+
+
+def test_lazy_login(stub_server, make_client):
+    """
+    Test that a lazily constructed client only logs in on its first request.
+    """
+    client = make_client(lazy_login=True)
+    assert stub_server.logins == 0 and client.session_id is None
+    client.list_open_positions()
+    assert stub_server.logins == 1 and client.session_id is not None
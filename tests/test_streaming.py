@@ -0,0 +1,222 @@
+# tests/test_streaming.py
+
+import asyncio
+import threading
+import pytest
+
+from src.pygcapi.streaming import PriceStream, PriceTick
+from src.pygcapi.testing import FakeStreamingServer
+
+
+def run(coro):
+    return asyncio.run(asyncio.wait_for(coro, timeout=10))
+
+
+def test_async_iterator_and_callbacks():
+    """
+    Test that ticks reach both registered callbacks and the async iterator.
+    """
+    async def scenario():
+        async with FakeStreamingServer(tick_rate=2000, max_ticks=50) as server:
+            stream = PriceStream(server.host, server.port, ["1", "2"], session="abc", username="user")
+            seen = []
+            stream.on_tick(seen.append)
+            received = []
+            async with stream:
+                async for tick in stream:
+                    received.append(tick)
+                    if len(received) == 20:
+                        break
+            return server, seen, received
+
+    server, seen, received = run(scenario())
+    assert len(received) == 20
+    assert all(isinstance(tick, PriceTick) for tick in received)
+    assert {tick.market_id for tick in received} == {"1", "2"}
+    assert len(seen) >= 20
+    assert server.subscriptions[0]["markets"] == ["1", "2"]
+    assert server.subscriptions[0]["session"] == "abc"
+    assert received[0].timestamp > 0 and received[0].latency < 5
+
+
+def test_reconnects_after_drop():
+    """
+    Test that the stream reconnects with backoff when the server drops the connection.
+    """
+    async def scenario():
+        async with FakeStreamingServer(tick_rate=500) as server:
+            async with PriceStream(server.host, server.port, ["1"], reconnect_delay=0.01) as stream:
+                while stream.ticks < 5:
+                    await asyncio.sleep(0.01)
+                server.drop_connections()
+                before = stream.ticks
+                while stream.reconnects < 1 or stream.ticks <= before + 5:
+                    await asyncio.sleep(0.01)
+                return server.connections, stream.reconnects
+
+    connections, reconnects = run(scenario())
+    assert connections >= 2
+    assert reconnects >= 1
+
+
+def test_heartbeat_timeout_triggers_reconnect():
+    """
+    Test that a silent connection is treated as dead after heartbeat_timeout.
+    """
+    async def scenario():
+        async with FakeStreamingServer(tick_rate=100) as server:
+            server.silent = True
+            async with PriceStream(server.host, server.port, ["1"], heartbeat_timeout=0.1, reconnect_delay=0.01) as stream:
+                while server.connections < 2:
+                    await asyncio.sleep(0.01)
+                return stream.reconnects
+
+    assert run(scenario()) >= 1
+
+
+def test_drop_oldest_backpressure():
+    """
+    Test that a full buffer drops the oldest ticks when overflow='drop_oldest'.
+    """
+    async def scenario():
+        async with FakeStreamingServer(tick_rate=5000, max_ticks=500) as server:
+            async with PriceStream(server.host, server.port, ["1"], max_queue=10, overflow="drop_oldest") as stream:
+                while stream.ticks < 500:
+                    await asyncio.sleep(0.01)
+                return stream.dropped, stream._queue.qsize()
+
+    dropped, buffered = run(scenario())
+    assert buffered == 10
+    assert dropped == 490
+
+
+def test_block_backpressure_pauses_reading():
+    """
+    Test that with overflow='block' the reader stops once the buffer is full.
+    """
+    async def scenario():
+        async with FakeStreamingServer(tick_rate=5000, max_ticks=500) as server:
+            async with PriceStream(server.host, server.port, ["1"], max_queue=10, overflow="block") as stream:
+                await asyncio.sleep(0.2)
+                return stream.ticks, stream.dropped
+
+    ticks, dropped = run(scenario())
+    assert dropped == 0
+    assert ticks == 11  # ten buffered plus the one waiting to be queued
+
+
+def test_callbacks_without_iterator_do_not_fill_the_queue():
+    """
+    Test that callback-only consumers keep receiving ticks past max_queue with overflow='block'.
+    """
+    async def scenario():
+        async with FakeStreamingServer(tick_rate=5000, max_ticks=100) as server:
+            stream = PriceStream(server.host, server.port, ["1"], max_queue=10, overflow="block")
+            seen = []
+            stream.on_tick(seen.append)
+            async with stream:
+                while len(seen) < 100:
+                    await asyncio.sleep(0.01)
+                return len(seen), stream._queue.qsize()
+
+    seen, buffered = run(scenario())
+    assert seen == 100
+    assert buffered == 0
+
+
+def test_failing_callback_is_logged_and_stream_continues(caplog):
+    """
+    Test that a callback raising an exception is logged and neither stops other callbacks nor the iterator.
+    """
+    async def scenario():
+        async with FakeStreamingServer(tick_rate=2000, max_ticks=50) as server:
+            stream = PriceStream(server.host, server.port, ["1"])
+
+            @stream.on_tick
+            def broken(tick):
+                raise RuntimeError("callback bug")
+
+            seen = []
+            stream.on_tick(seen.append)
+            received = []
+            async with stream:
+                async for tick in stream:
+                    received.append(tick)
+                    if len(received) == 10:
+                        break
+            return stream, seen, received
+
+    stream, seen, received = run(scenario())
+    assert len(received) == 10
+    assert len(seen) >= 10
+    assert stream.callback_errors >= 10
+    assert stream.error is None
+    assert "Price stream callback" in caplog.text
+
+
+def test_reader_error_ends_iteration():
+    """
+    Test that an error stopping the reader task is raised from ``async for`` instead of hanging it.
+    """
+    async def scenario():
+        async with FakeStreamingServer(tick_rate=2000, max_ticks=50) as server:
+            stream = PriceStream(server.host, server.port, ["1"])
+
+            def broken(message):
+                raise RuntimeError("reader bug")
+
+            stream._to_tick = broken
+            async with stream:
+                with pytest.raises(RuntimeError, match="reader bug"):
+                    async for _ in stream:
+                        pass
+            return stream
+
+    stream = run(scenario())
+    assert isinstance(stream.error, RuntimeError)
+
+
+def test_giving_up_ends_iteration():
+    """
+    Test that running out of reconnect attempts raises ConnectionError from ``async for``.
+    """
+    async def scenario():
+        async with FakeStreamingServer() as server:
+            port = server.port
+        stream = PriceStream("127.0.0.1", port, ["1"], max_reconnects=0, reconnect_delay=0.01)
+        async with stream:
+            with pytest.raises(ConnectionError, match="gave up"):
+                async for _ in stream:
+                    pass
+
+    run(scenario())
+
+
+def test_blocking_session_provider_runs_off_the_loop():
+    """
+    Test that a blocking session callable is resolved in a worker thread on connect.
+    """
+    threads = []
+
+    def login():
+        threads.append(threading.get_ident())
+        return "fresh-token"
+
+    async def scenario():
+        async with FakeStreamingServer(tick_rate=2000, max_ticks=5) as server:
+            async with PriceStream(server.host, server.port, ["1"], session=login) as stream:
+                async for _ in stream:
+                    break
+            return server
+
+    server = run(scenario())
+    assert server.subscriptions[0]["session"] == "fresh-token"
+    assert threads and threads[0] != threading.get_ident()
+
+
+def test_invalid_overflow_policy():
+    """
+    Test that an unknown overflow policy is rejected.
+    """
+    with pytest.raises(ValueError):
+        PriceStream("127.0.0.1", 1, ["1"], overflow="ignore")
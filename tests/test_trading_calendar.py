@@ -0,0 +1,97 @@
+# tests/test_trading_calendar.py
+
+import pandas as pd
+
+from src.pygcapi.trading_calendar import FX_CALENDAR, ALWAYS_OPEN, WeeklyCalendar, MarketCalendars
+from src.pygcapi.utils import plan_intervals
+from src.pygcapi.long_series import fetch_long_series
+
+MONDAY = int(pd.Timestamp("2024-01-08", tz="UTC").timestamp())
+DAY = 86400
+
+
+def ts(text):
+    """
+    Unix timestamp of a UTC date string.
+    """
+    return int(pd.Timestamp(text, tz="UTC").timestamp())
+
+
+def test_fx_calendar_skips_weekends_and_holidays():
+    """
+    Test that the FX calendar is open from Sunday 21:00 to Friday 22:00 UTC, minus extra closed periods.
+    """
+    periods = FX_CALENDAR.open_intervals(MONDAY, MONDAY + 14 * DAY - 1)
+    assert periods == [
+        (MONDAY, ts("2024-01-12 22:00")),
+        (ts("2024-01-14 21:00"), ts("2024-01-19 22:00")),
+        (ts("2024-01-21 21:00"), MONDAY + 14 * DAY),
+    ]
+    assert not FX_CALENDAR.is_open(ts("2024-01-13 12:00")) and FX_CALENDAR.is_open(ts("2024-01-14 21:30"))
+
+    holiday = WeeklyCalendar.fx(closed=[(ts("2024-01-10"), ts("2024-01-11"))])
+    assert holiday.open_intervals(MONDAY, ts("2024-01-12")) == [(MONDAY, ts("2024-01-10")), (ts("2024-01-11"), ts("2024-01-12") + 1)]
+
+
+def test_calendar_plan_packs_trading_time_without_exceeding_max_results():
+    """
+    Test that planning over trading time needs fewer requests and never puts more than max_results bars in one.
+    """
+    start, stop = MONDAY, MONDAY + 365 * DAY
+    continuous = plan_intervals(start, stop, "MINUTE", 1, 4000)
+    planned = plan_intervals(start, stop, "MINUTE", 1, 4000, calendar=FX_CALENDAR)
+    assert len(planned) < 0.8 * len(continuous)
+
+    bar_starts = [
+        minute
+        for open_at, close_at in FX_CALENDAR.open_intervals(start, stop)
+        for minute in range(open_at // 60 * 60, close_at, 60)
+    ]
+    counts = pd.Series(pd.cut(bar_starts, pd.IntervalIndex.from_tuples(planned, closed="both"))).value_counts()
+    assert counts.max() <= 4000 and counts.sum() == len(bar_starts)
+
+    assert plan_intervals(ts("2024-01-13"), ts("2024-01-14"), "MINUTE", 1, 4000, calendar=FX_CALENDAR) == []
+    assert plan_intervals(start, stop, "HOUR", 1, 4000, calendar=ALWAYS_OPEN) == plan_intervals(start, stop, "HOUR", 1, 4000)
+
+
+def test_long_series_reports_requests_saved_per_market():
+    """
+    Test that fetch_long_series uses the market's calendar and reports the requests it saved.
+    """
+    class Client:
+        def __init__(self):
+            self.calls = []
+
+        def get_ohlc(self, market_id, num_ticks, interval, span, from_ts, to_ts):
+            self.calls.append((from_ts, to_ts))
+            return pd.DataFrame({"Date": [pd.Timestamp(from_ts, unit="s", tz="UTC")], "Open": [1.0]})
+
+    calendars = MarketCalendars(calendars={"401484347": FX_CALENDAR})
+    fx, other = Client(), Client()
+    result = fetch_long_series(fx, "401484347", n=1000, interval="MINUTE", span=5, from_ts=MONDAY, to_ts=MONDAY + 60 * DAY, calendar=calendars)
+    unregistered = fetch_long_series(other, "123", n=1000, interval="MINUTE", span=5, from_ts=MONDAY, to_ts=MONDAY + 60 * DAY, calendar=calendars)
+
+    assert result.requests_saved > 0 and result.summary()["requests_saved"] == result.requests_saved
+    assert len(fx.calls) + result.requests_saved == len(other.calls)
+    assert unregistered.requests_saved == 0
+    assert all(not (ts("2024-01-13") <= start < ts("2024-01-14 20:00")) for start, _ in fx.calls)
+
+
+def test_adaptive_long_series_reports_requests_saved():
+    """
+    Test that adaptive chunking with a calendar reports the requests it saved over the continuous plan.
+    """
+    class Client:
+        def __init__(self):
+            self.calls = []
+
+        def get_ohlc(self, market_id, num_ticks, interval, span, from_ts, to_ts):
+            self.calls.append((from_ts, to_ts))
+            return pd.DataFrame({"Date": [pd.Timestamp(from_ts, unit="s", tz="UTC")], "Open": [1.0]})
+
+    client = Client()
+    result = fetch_long_series(client, "1", n=1000, interval="MINUTE", span=5, from_ts=MONDAY, to_ts=MONDAY + 60 * DAY,
+                               calendar=FX_CALENDAR, adaptive=True)
+    continuous = len(plan_intervals(MONDAY, MONDAY + 60 * DAY, "MINUTE", 5, max_results=1000))
+
+    assert result.requests_saved == continuous - len(client.calls) > 0
@@ -0,0 +1,55 @@
+# tests/test_transport.py
+
+import pytest
+import pandas as pd
+
+from src.pygcapi.transport import Transport
+from src.pygcapi.core_v1 import GCapiClientV1
+from src.pygcapi.core_v2 import GCapiClientV2
+
+
+def test_transport_reuses_connections(stub_server):
+    """
+    Test that consecutive requests through one Transport share a single TCP connection.
+    """
+    with Transport(pool_maxsize=2) as transport:
+        for _ in range(5):
+            response = transport.get(f"{stub_server.base_url_v1}/cfd/markets", params={"marketName": "EUR/USD"})
+            assert response.status_code == 200
+
+    assert stub_server.requests == 5
+    assert stub_server.connections == 1, "Keep-alive should reuse the same connection."
+
+
+def test_transport_without_keep_alive(stub_server):
+    """
+    Test that disabling keep-alive opens a new connection per request.
+    """
+    with Transport(keep_alive=False) as transport:
+        for _ in range(3):
+            transport.get(f"{stub_server.base_url_v1}/cfd/markets")
+
+    assert stub_server.connections == 3
+
+
+def test_clients_share_injected_transport(stub_server, monkeypatch):
+    """
+    Test that both clients send every call through an injected Transport.
+    """
+    monkeypatch.setattr(GCapiClientV1, "BASE_URL", stub_server.base_url_v1)
+    monkeypatch.setattr(GCapiClientV2, "BASE_URL_V1", stub_server.base_url_v1)
+    monkeypatch.setattr(GCapiClientV2, "BASE_URL_V2", stub_server.base_url_v2)
+
+    transport = Transport()
+    client_v1 = GCapiClientV1("user", "pass", "key", transport=transport)
+    client_v2 = GCapiClientV2("user", "pass", "key", transport=transport)
+    assert client_v1.transport is client_v2.transport
+
+    for client in (client_v1, client_v2):
+        df = client.get_ohlc("401484347", 10, "MINUTE", 1, 1_700_000_000, 1_700_000_600)
+        assert isinstance(df, pd.DataFrame)
+        assert len(df) == 10
+
+    assert stub_server.requests == 4
+    assert stub_server.connections == 1
+    transport.close()
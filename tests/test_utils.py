@@ -13,7 +13,11 @@ from src.pygcapi.utils import (
     get_order_status_reason_description,
     get_order_action_type_description,
     extract_every_nth,
-    convert_to_dataframe
+    plan_intervals,
+    shift_months,
+    convert_to_dataframe,
+    convert_orders_to_dataframe,
+    parse_dotnet_dates
 )
 
 @pytest.mark.parametrize("status_code, expected", [
@@ -122,6 +126,33 @@ def test_extract_every_nth_custom_args():
         assert start_utc <= end_utc
 
 
+def test_plan_intervals_fills_each_request():
+    """
+    Test that plan_intervals lays out contiguous, non-overlapping chunks of exactly max_results bars.
+    """
+    start = int(datetime(2021, 1, 1).timestamp())
+    stop = int(datetime(2024, 1, 1).timestamp())
+    intervals = plan_intervals(start, stop, interval="MINUTE", span=1, max_results=4000)
+
+    assert intervals[0][0] == start and intervals[-1][1] == stop
+    assert all(b_start == a_stop + 1 for (_, a_stop), (b_start, _) in zip(intervals, intervals[1:]))
+    assert all(stop_utc - start_utc + 1 == 4000 * 60 for start_utc, stop_utc in intervals[:-1])
+    assert len(intervals) == -(-(stop - start + 1) // (4000 * 60))
+    assert plan_intervals(stop, start) == []
+    with pytest.raises(ValueError):
+        plan_intervals(start, stop, max_results=0)
+
+
+def test_shift_months_clamps_the_day():
+    """
+    Test that shift_months moves by calendar months like pd.DateOffset.
+    """
+    ts = int(pd.Timestamp("2024-03-31 12:30", tz="UTC").timestamp())
+    assert shift_months(ts, -1) == int(pd.Timestamp("2024-02-29 12:30", tz="UTC").timestamp())
+    assert shift_months(ts, -13) == int(pd.Timestamp("2023-02-28 12:30", tz="UTC").timestamp())
+    assert shift_months(ts, 10) == int(pd.Timestamp("2025-01-31 12:30", tz="UTC").timestamp())
+
+
 def test_convert_to_dataframe():
     """
     Test the convert_to_dataframe function to ensure that it properly parses
@@ -153,3 +184,48 @@ def test_convert_to_dataframe():
     # Check that numeric columns remained numeric
     for col in ['Open', 'Close', 'Volume']:
         assert pd.api.types.is_numeric_dtype(df[col]), f"{col} column should be numeric."
+
+
+def test_parse_dotnet_dates_offsets_and_invalid_values():
+    """
+    Test that parse_dotnet_dates reads the UTC milliseconds, ignores the offset suffix,
+    supports negative values and turns missing or malformed entries into NaT.
+    """
+    parsed = parse_dotnet_dates([
+        "/Date(1732075200000)/",
+        "/Date(1732075200000+0100)/",
+        "/Date(1732075200000-0500)/",
+        "/Date(-86400000)/",
+        None,
+        "not a date",
+    ])
+    expected = pd.Timestamp("2024-11-20 04:00:00", tz="UTC")
+    assert list(parsed[:3]) == [expected] * 3
+    assert parsed[3] == pd.Timestamp("1969-12-31", tz="UTC")
+    assert parsed[4:].isna().all()
+
+
+def test_parse_dotnet_dates_matches_regex_parser():
+    """
+    Test that the vectorized parser agrees with a per-row regex on varied widths.
+    """
+    millis = [0, 7, 1_000, 946_684_800_000, 1_732_075_260_123]
+    values = [f"/Date({m})/" for m in millis]
+    parsed = parse_dotnet_dates(values)
+    expected = pd.to_datetime([int(re.findall(r'\d+', v)[0]) for v in values], unit="ms", utc=True)
+    assert (parsed == expected).all()
+
+
+def test_convert_orders_to_dataframe_dates():
+    """
+    Test that order date fields are parsed into naive UTC timestamps.
+    """
+    data = {
+        "ActiveOrders": [
+            {"TradeOrder": {"OrderId": 1, "CreatedDateTimeUTC": "/Date(1732075200000)/", "ExecutedDateTimeUTC": None}, "TypeId": 2},
+        ]
+    }
+    df = convert_orders_to_dataframe(data)
+    assert df["CreatedDateTimeUTC"].iloc[0] == pd.Timestamp("2024-11-20 04:00:00")
+    assert pd.isna(df["ExecutedDateTimeUTC"].iloc[0])
+    assert df["OuterTypeId"].iloc[0] == 2